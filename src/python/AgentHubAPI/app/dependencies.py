@@ -23,10 +23,9 @@ def get_config(action: str = None) -> Configuration:
     global __config
 
     start = time.time()
+    __config = __config or Configuration()
     if action is not None and action=='refresh':
-        __config = Configuration()
-    else:
-        __config = __config or Configuration()
+        __config.refresh()
     end = time.time()
     print(f'Time to load config: {end-start}')
     return __config
@@ -2,13 +2,19 @@
 Provides dependencies for API calls.
 """
 import logging
+import os
 import time
 from typing import Annotated
 from fastapi import Depends, HTTPException
 from fastapi.security import APIKeyHeader
 from foundationallm.integration.config import Configuration
+from foundationallm.integration.config.environment_variables import (
+    FOUNDATIONALLM_ANALYZER_PROCESS_COUNT
+)
+from foundationallm.integration.mspresidio import AnalyzerPool
 
 __config: Configuration = None
+__analyzer_pool: AnalyzerPool = None
 API_NAME = 'GatekeeperIntegrationAPI'
 
 def get_config(action: str = None) -> Configuration:
@@ -23,14 +29,39 @@ def get_config(action: str = None) -> Configuration:
     global __config
 
     start = time.time()
+    __config = __config or Configuration()
     if action is not None and action=='refresh':
-        __config = Configuration()
-    else:
-        __config = __config or Configuration()
+        __config.refresh()
     end = time.time()
     print(f'Time to load config: {end-start}')
     return __config
 
+def get_analyzer_pool(action: str = None) -> AnalyzerPool:
+    """
+    Obtains the pool of worker processes used for batch PII analysis.
+
+    Parameters
+    ----------
+    action : str
+        Set to 'shutdown' to stop the worker processes of the pool.
+
+    Returns
+    -------
+    AnalyzerPool
+        Returns the analyzer process pool.
+    """
+    global __analyzer_pool
+
+    if action is not None and action=='shutdown':
+        if __analyzer_pool is not None:
+            __analyzer_pool.shutdown()
+        __analyzer_pool = None
+    elif __analyzer_pool is None:
+        process_count = os.environ.get(FOUNDATIONALLM_ANALYZER_PROCESS_COUNT)
+        __analyzer_pool = AnalyzerPool(
+            max_workers=int(process_count) if process_count else None)
+    return __analyzer_pool
+
 def validate_api_key_header(x_api_key: str = Depends(APIKeyHeader(name='X-API-Key'))):
     """
     Validates that the X-API-Key value in the request header matches the key expected for this API.
@@ -2,15 +2,31 @@
 Main entry-point for the FoundationaLLM DataSourceHubAPI.
 Runs web server exposing the API.
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.dependencies import API_NAME, get_config
+from foundationallm.integration.mspresidio import EngineRegistry
+from app.dependencies import API_NAME, get_analyzer_pool, get_config
 from app.routers import (
     analyze,
     manage,
     status
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Loads the shared Presidio engines and starts the batch analyzer processes
+    before the API starts serving requests so the first request does not pay
+    for the NLP model load.
+    """
+    EngineRegistry.warm_up()
+    get_analyzer_pool()
+    yield
+    get_analyzer_pool('shutdown')
+    EngineRegistry.clear()
+
 app = FastAPI(
+    lifespan=lifespan,
     title=f'FoundationaLLM {API_NAME}',
     summary='API for extending the FoundationaLLM GatekeeperAPI',
     description=f"""The FoundationaLLM {API_NAME} is a service used to extend the
@@ -2,11 +2,21 @@
 The API endpoint for analyzing textual content to identify
 PII (personally identifiable information) entities.
 """
+import json
+import logging
+from typing import AsyncIterator
 from fastapi import APIRouter, Depends
-from foundationallm.integration.models import AnalyzeRequest, AnalyzeResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from foundationallm.integration.models import (
+    AnalyzeBatchRequest,
+    AnalyzeBatchResponse,
+    AnalyzeRequest,
+    AnalyzeResponse
+)
 from foundationallm.integration.mspresidio import Analyzer
 #from foundationallm.telemetry import Telemetry
-from app.dependencies import validate_api_key_header, handle_exception
+from app.dependencies import get_analyzer_pool, validate_api_key_header, handle_exception
 
 #logger = Telemetry.get_logger(__name__)
 #tracer = Telemetry.get_tracer(__name__)
@@ -37,7 +47,51 @@ async def analyze(request: AnalyzeRequest) -> AnalyzeResponse:
     #with tracer.start_as_current_span('analyze') as span:
     try:
         analyzer = Analyzer(request)
-        return analyzer.analyze()
+        return await run_in_threadpool(analyzer.analyze)
     except Exception as e:
         #Telemetry.record_exception(span, e)
         handle_exception(e)
+
+@router.post('/batch')
+async def analyze_batch(request: AnalyzeBatchRequest) -> AnalyzeBatchResponse:
+    """
+    Analyze many documents to identify PII with the option to
+    anonymize. The documents are analyzed in parallel by the
+    analyzer worker processes.
+
+    Returns
+    -------
+    AnalyzeBatchResponse
+        Returns one AnalyzeResponse per document, in the same order
+        as the contents of the request.
+    """
+    try:
+        results = await get_analyzer_pool().analyze_batch(request)
+        return AnalyzeBatchResponse(results=results)
+    except Exception as e:
+        handle_exception(e)
+
+@router.post('/batch/stream')
+async def analyze_batch_stream(request: AnalyzeBatchRequest) -> StreamingResponse:
+    """
+    Analyze many documents to identify PII with the option to
+    anonymize, streaming the results as newline-delimited JSON.
+
+    Returns
+    -------
+    StreamingResponse
+        Streams one AnalyzeResponse JSON object per line, in the same
+        order as the contents of the request.
+
+        The response status is sent before the documents are analyzed, so
+        if the analysis fails the stream ends with an {"error": "..."} line.
+    """
+    async def generate() -> AsyncIterator[str]:
+        try:
+            async for response in get_analyzer_pool().analyze_stream(request):
+                yield response.model_dump_json() + '\n'
+        except Exception as e:
+            logging.error(e, stack_info=True, exc_info=True)
+            yield json.dumps({'error': str(e) or type(e).__name__}) + '\n'
+
+    return StreamingResponse(generate(), media_type='application/x-ndjson')
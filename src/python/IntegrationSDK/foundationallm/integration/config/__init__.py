@@ -1,4 +1,8 @@
 """
 This package contains the configuration classes for the Gatekeeper Integration
 """
+from .configuration_provider_base import ConfigurationProviderBase
+from .app_configuration_provider import AppConfigurationProvider
+from .file_configuration_provider import FileConfigurationProvider
+from .memory_configuration_provider import MemoryConfigurationProvider
 from .configuration import Configuration
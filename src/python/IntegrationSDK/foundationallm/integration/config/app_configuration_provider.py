@@ -0,0 +1,73 @@
+"""
+Contains the implementation of the configuration provider that loads settings
+from Azure App Configuration and Azure Key Vault.
+"""
+from typing import Dict, List, Optional
+from azure.identity import DefaultAzureCredential
+from azure.appconfiguration.provider import (
+    AzureAppConfigurationKeyVaultOptions,
+    SettingSelector,
+    WatchKey,
+    load
+)
+from .configuration_provider_base import ConfigurationProviderBase
+
+class AppConfigurationProvider(ConfigurationProviderBase):
+    """
+    Loads configuration settings from Azure App Configuration, resolving
+    Key Vault references.
+    """
+    def __init__(self, endpoint: str, key_filters: List[str], sentinel_key: str = None):
+        """
+        Initializes the provider.
+
+        Parameters
+        ----------
+        - endpoint : str
+            The Azure App Configuration endpoint.
+        - key_filters : List[str]
+            The key filters selecting the settings to load.
+        - sentinel_key : str
+            The key whose change triggers a reload of all settings on refresh.
+            When not set, every refresh reloads all settings.
+        """
+        self.endpoint = endpoint
+        self.key_filters = key_filters
+        self.sentinel_key = sentinel_key
+        self.credential = DefaultAzureCredential(exclude_environment_credential=True)
+        self.__app_config = None
+        self.__refreshed = False
+
+    def load(self) -> Dict[str, str]:
+        """
+        Loads the selected settings from Azure App Configuration.
+        """
+        selectors = [SettingSelector(key_filter=key_filter) for key_filter in self.key_filters]
+        refresh_on = [WatchKey(self.sentinel_key)] if self.sentinel_key else None
+        self.__app_config = load(endpoint=self.endpoint, credential=self.credential,
+                                 selects=selectors, refresh_on=refresh_on,
+                                 refresh_interval=1,
+                                 on_refresh_success=self.__on_refresh_success,
+                                 key_vault_options=
+                                    AzureAppConfigurationKeyVaultOptions(credential=self.credential))
+        return dict(self.__app_config.items())
+
+    def __on_refresh_success(self):
+        """
+        Records that the provider reloaded the settings because the sentinel key changed.
+        """
+        self.__refreshed = True
+
+    def refresh(self) -> Optional[Dict[str, str]]:
+        """
+        Reloads the settings when the sentinel key changed,
+        or unconditionally when no sentinel key is configured.
+        """
+        if self.sentinel_key is None or self.__app_config is None:
+            return self.load()
+
+        self.__refreshed = False
+        self.__app_config.refresh()
+        if not self.__refreshed:
+            return None
+        return dict(self.__app_config.items())
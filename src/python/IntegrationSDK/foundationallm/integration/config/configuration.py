@@ -2,44 +2,162 @@
 Contains the implementation of the Configuration class that is responsible for resolving
 configuration settings from Azure App Configuration.
 """
+import logging
 import os
-from azure.identity import DefaultAzureCredential
-from azure.appconfiguration.provider import (
-    AzureAppConfigurationKeyVaultOptions,
-    SettingSelector,
-    load
+import threading
+from types import MappingProxyType
+from typing import Mapping
+from .configuration_provider_base import ConfigurationProviderBase
+from .app_configuration_provider import AppConfigurationProvider
+from .file_configuration_provider import FileConfigurationProvider
+from .memory_configuration_provider import MemoryConfigurationProvider
+from .environment_variables import (
+    FOUNDATIONALLM_APP_CONFIGURATION_URI,
+    FOUNDATIONALLM_CONFIGURATION_FILE,
+    FOUNDATIONALLM_CONFIGURATION_PROVIDER,
+    FOUNDATIONALLM_CONFIGURATION_REFRESH_SECONDS,
+    FOUNDATIONALLM_CONFIGURATION_SENTINEL_KEY
 )
 
-# Configuration only has one method by design.
-# pylint: disable=too-few-public-methods
 class Configuration:
     """
     Configuration class that is responsible for resolving configuration settings
     from Azure App Configuration.
+
+    The settings are loaded once per process into an immutable snapshot that all
+    Configuration instances share. Reads do not lock; a background thread
+    periodically refreshes the snapshot and swaps it in atomically.
     """
+    KEY_FILTERS = [
+        'FoundationaLLM:APIs:GatekeeperIntegrationAPI:*',
+        'FoundationaLLM:APIEndpoints:GatekeeperIntegrationAPI:*'
+    ]
+    DEFAULT_REFRESH_SECONDS = 300
+
+    __provider: ConfigurationProviderBase = None
+    __snapshot: Mapping[str, str] = MappingProxyType({})
+    __lock = threading.Lock()
+    __stop_event: threading.Event = None
+    __refresh_thread: threading.Thread = None
+
+    def __init__(self):
+        """
+        Loads the shared configuration snapshot if it is not already loaded.
+        """
+        Configuration.__ensure_loaded()
+
+    @staticmethod
+    def __create_provider() -> ConfigurationProviderBase:
+        """
+        Creates the configuration provider selected by the environment variables:
+            - appconfiguration (default): Azure App Configuration at FOUNDATIONALLM_APP_CONFIGURATION_URI.
+            - file: the JSON, YAML or .env file at FOUNDATIONALLM_CONFIGURATION_FILE,
+              overridden by the environment variables.
+            - memory: the environment variables, using '__' in place of ':' in the key names.
+            - local: the file provider when FOUNDATIONALLM_CONFIGURATION_FILE is set,
+              and the memory provider otherwise.
+        The Python SDK selects its providers with the same rules.
+        """
+        provider_name = os.environ.get(FOUNDATIONALLM_CONFIGURATION_PROVIDER, 'appconfiguration')
+        match provider_name.lower():
+            case 'file':
+                return FileConfigurationProvider(
+                    file_path=os.environ.get(FOUNDATIONALLM_CONFIGURATION_FILE))
+            case 'memory':
+                return MemoryConfigurationProvider()
+            case 'local':
+                file_path = os.environ.get(FOUNDATIONALLM_CONFIGURATION_FILE)
+                return FileConfigurationProvider(file_path=file_path) if file_path \
+                    else MemoryConfigurationProvider()
+            case 'appconfiguration':
+                return AppConfigurationProvider(
+                    endpoint=os.environ[FOUNDATIONALLM_APP_CONFIGURATION_URI],
+                    key_filters=Configuration.KEY_FILTERS,
+                    sentinel_key=os.environ.get(FOUNDATIONALLM_CONFIGURATION_SENTINEL_KEY))
+            case _:
+                raise ValueError(f'The configuration provider {provider_name} is not supported.')
+
+    @classmethod
+    def __ensure_loaded(cls):
+        """
+        Creates the provider, loads the initial snapshot and starts the background refresh.
+        """
+        if cls.__provider is not None:
+            return
+
+        with cls.__lock:
+            if cls.__provider is not None:
+                return
+
+            provider = cls.__create_provider()
+            cls.__snapshot = MappingProxyType(provider.load())
+            cls.__provider = provider
+
+            refresh_seconds = float(os.environ.get(
+                FOUNDATIONALLM_CONFIGURATION_REFRESH_SECONDS, cls.DEFAULT_REFRESH_SECONDS))
+            if refresh_seconds > 0:
+                cls.__stop_event = threading.Event()
+                cls.__refresh_thread = threading.Thread(
+                    target=cls.__refresh_loop,
+                    args=(provider, cls.__stop_event, refresh_seconds),
+                    name='ConfigurationRefresh',
+                    daemon=True)
+                cls.__refresh_thread.start()
+
+    @classmethod
+    def __refresh_loop(cls, provider: ConfigurationProviderBase,
+                       stop_event: threading.Event, refresh_seconds: float):
+        """
+        Periodically refreshes the snapshot until the stop event is set.
+        """
+        while not stop_event.wait(refresh_seconds):
+            try:
+                with cls.__lock:
+                    if stop_event.is_set():
+                        break
+                    settings = provider.refresh()
+                    if settings is not None:
+                        cls.__snapshot = MappingProxyType(settings)
+            except Exception as e:
+                logging.warning('Failed to refresh the configuration settings: %s', e)
+
     def get_value(self, key: str) -> str:
         """
-        Retrieves the setting value from Azure App Configuration.
+        Retrieves the setting value from the cached configuration snapshot.
         If the value is not found the method raises an exception.
 
         Parameters
         ----------
         - key : str
             The key name of the configuration setting to retrieve.
-        
+
         Returns
         -------
         The configuration value
 
         Raises an exception if the configuration value is not found.
         """
-        app_config_uri = os.environ['FOUNDATIONALLM_APP_CONFIGURATION_URI']
-        credential = DefaultAzureCredential(
-            exclude_environment_credential=True)
-        # Connect to Azure App Configuration with key filter
-        selectors = [SettingSelector(
-            key_filter="FoundationaLLM:APIs:GatekeeperIntegrationAPI:*")]
-        app_config = load(endpoint=app_config_uri, credential=credential, selects=selectors,
-                            key_vault_options=
-                            AzureAppConfigurationKeyVaultOptions(credential=credential))
-        return app_config[key]
+        return Configuration.__snapshot[key]
+
+    def refresh(self):
+        """
+        Reloads all the configuration settings from the provider and
+        swaps in the new snapshot.
+        """
+        Configuration.__ensure_loaded()
+        with Configuration.__lock:
+            Configuration.__snapshot = MappingProxyType(Configuration.__provider.load())
+
+    @classmethod
+    def reset(cls):
+        """
+        Stops the background refresh and discards the cached snapshot.
+        The next Configuration instance reloads the settings from a new provider.
+        """
+        with cls.__lock:
+            if cls.__stop_event is not None:
+                cls.__stop_event.set()
+            cls.__provider = None
+            cls.__stop_event = None
+            cls.__refresh_thread = None
+            cls.__snapshot = MappingProxyType({})
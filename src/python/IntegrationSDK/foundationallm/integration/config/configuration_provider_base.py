@@ -0,0 +1,33 @@
+"""
+Contains the base class for the providers that supply the configuration
+settings cached by the Configuration class.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+class ConfigurationProviderBase(ABC):
+    """
+    Base class for the providers that load configuration settings.
+    """
+    FEATURE_FLAGS_KEY = 'FeatureManagementFeatureFlags'
+
+    @abstractmethod
+    def load(self) -> Dict[str, str]:
+        """
+        Loads all the configuration settings made available by the provider.
+
+        Returns
+        -------
+        A dictionary of configuration keys and values.
+        """
+        raise NotImplementedError()
+
+    def refresh(self) -> Optional[Dict[str, str]]:
+        """
+        Reloads the configuration settings if they have changed since the last load.
+
+        Returns
+        -------
+        A dictionary of configuration keys and values, or None if the settings did not change.
+        """
+        return self.load()
@@ -12,3 +12,40 @@ The build version of the container. This is also used for the app version used
 to validate the minimum version of the app required to use certain configuration entries.
 """
 FOUNDATIONALLM_VERSION = "FOUNDATIONALLM_VERSION"
+
+"""
+The number of worker processes used by the Gatekeeper Integration API for batch PII analysis.
+Each worker loads its own spaCy model, which takes up to about 1 GB of memory.
+Defaults to the number of CPUs available to the process, up to 2.
+"""
+FOUNDATIONALLM_ANALYZER_PROCESS_COUNT = "FOUNDATIONALLM_ANALYZER_PROCESS_COUNT"
+
+"""
+The Azure App Configuration endpoint from which configuration settings are loaded.
+"""
+FOUNDATIONALLM_APP_CONFIGURATION_URI = "FOUNDATIONALLM_APP_CONFIGURATION_URI"
+
+"""
+The provider from which configuration settings are loaded: appconfiguration (default),
+file (a JSON, YAML or .env file, overridden by the environment variables) or memory
+(environment variables). local selects file when FOUNDATIONALLM_CONFIGURATION_FILE is set
+and memory otherwise. The Python SDK and the Integration SDK accept the same providers.
+"""
+FOUNDATIONALLM_CONFIGURATION_PROVIDER = "FOUNDATIONALLM_CONFIGURATION_PROVIDER"
+
+"""
+The path of the configuration file used by the file configuration provider.
+"""
+FOUNDATIONALLM_CONFIGURATION_FILE = "FOUNDATIONALLM_CONFIGURATION_FILE"
+
+"""
+The number of seconds between background refreshes of the cached configuration settings.
+Set to 0 to disable background refreshes.
+"""
+FOUNDATIONALLM_CONFIGURATION_REFRESH_SECONDS = "FOUNDATIONALLM_CONFIGURATION_REFRESH_SECONDS"
+
+"""
+The configuration key whose change triggers a reload of all the cached configuration settings.
+When not set, every background refresh reloads all the settings.
+"""
+FOUNDATIONALLM_CONFIGURATION_SENTINEL_KEY = "FOUNDATIONALLM_CONFIGURATION_SENTINEL_KEY"
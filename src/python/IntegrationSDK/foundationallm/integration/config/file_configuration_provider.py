@@ -0,0 +1,109 @@
+"""
+Contains the implementation of the configuration provider that loads settings
+from a local JSON, YAML or .env file.
+"""
+import json
+import os
+from typing import Any, Dict
+from .configuration_provider_base import ConfigurationProviderBase
+from .memory_configuration_provider import MemoryConfigurationProvider
+
+class FileConfigurationProvider(ConfigurationProviderBase):
+    """
+    Loads configuration settings from a local file, allowing the APIs to run without
+    access to Azure App Configuration.
+
+    The format is selected by the file extension:
+        - .json, .yaml and .yml files may contain flat keys (FoundationaLLM:APIs:Name:Key)
+          or nested objects, which are flattened using the ':' separator.
+          A top-level FeatureManagementFeatureFlags object maps feature flag names to
+          their definitions, such as { "enabled": true }.
+        - Any other file is read as a .env file of KEY=VALUE lines, where '__' may be
+          used in place of ':' in the key name (FoundationaLLM__APIs__Name__Key).
+
+    The environment variables whose name contains '__' override the file settings.
+    """
+    def __init__(self, file_path: str):
+        """
+        Initializes the provider.
+
+        Parameters
+        ----------
+        - file_path : str
+            The path of the file containing the configuration settings.
+        """
+        if not file_path:
+            raise ValueError('The file_path parameter is required for FileConfigurationProvider.')
+        self.file_path = file_path
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Loads the settings from the file and the environment variables.
+        """
+        extension = os.path.splitext(self.file_path)[1].lower()
+        with open(self.file_path, 'r', encoding='utf-8') as file:
+            match extension:
+                case '.json':
+                    settings = self.__from_object(json.load(file))
+                case '.yaml' | '.yml':
+                    try:
+                        import yaml
+                    except ImportError as e:
+                        raise ImportError(
+                            'The pyyaml package is required to load YAML configuration files.'
+                        ) from e
+                    settings = self.__from_object(yaml.safe_load(file) or {})
+                case _:
+                    settings = self.__from_env_file(file.read())
+
+        settings.update(MemoryConfigurationProvider.get_environment_settings())
+        return settings
+
+    def __from_object(self, obj: dict) -> Dict[str, Any]:
+        """
+        Converts a JSON or YAML document into configuration settings.
+        """
+        obj = dict(obj)
+        feature_flags = obj.pop(self.FEATURE_FLAGS_KEY, None)
+        settings = self.__flatten(obj)
+        if feature_flags:
+            settings[self.FEATURE_FLAGS_KEY] = {
+                name: json.dumps(flag) if isinstance(flag, dict) else flag
+                for name, flag in feature_flags.items()
+            }
+        return settings
+
+    def __flatten(self, obj: dict, prefix: str = '') -> Dict[str, Any]:
+        """
+        Flattens nested dictionaries into ':' separated keys.
+        """
+        settings = {}
+        for key, value in obj.items():
+            full_key = f'{prefix}{key}'
+            if isinstance(value, dict):
+                settings.update(self.__flatten(value, f'{full_key}:'))
+            elif isinstance(value, (list, bool)):
+                settings[full_key] = json.dumps(value)
+            else:
+                settings[full_key] = str(value) if value is not None else None
+        return settings
+
+    @staticmethod
+    def __from_env_file(content: str) -> Dict[str, str]:
+        """
+        Parses KEY=VALUE lines, ignoring blank lines and comments.
+        """
+        settings = {}
+        for line in content.splitlines():
+            line = line.strip()
+            if not line or line.startswith('#') or '=' not in line:
+                continue
+            key, value = line.split('=', 1)
+            key = key.strip()
+            if key.startswith('export '):
+                key = key[len('export '):].strip()
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
+                value = value[1:-1]
+            settings[key.replace('__', ':')] = value
+        return settings
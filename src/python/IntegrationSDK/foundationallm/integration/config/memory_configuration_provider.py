@@ -0,0 +1,57 @@
+"""
+Contains the implementation of the configuration provider that serves settings
+held in memory.
+"""
+import os
+from typing import Any, Dict, Mapping
+from .configuration_provider_base import ConfigurationProviderBase
+
+class MemoryConfigurationProvider(ConfigurationProviderBase):
+    """
+    Serves configuration settings from an in-memory dictionary, for tests,
+    benchmarks and soak runs that must not depend on external services.
+    """
+    def __init__(self, settings: Mapping[str, Any] = None):
+        """
+        Initializes the provider.
+
+        Parameters
+        ----------
+        - settings : Mapping[str, Any]
+            The configuration keys and values. When None, the settings are read from
+            the environment variables whose name contains '__', using ':' in place
+            of '__' in the key name (FoundationaLLM__APIs__Name__Key).
+        """
+        if settings is None:
+            settings = MemoryConfigurationProvider.get_environment_settings()
+        self.settings = dict(settings)
+
+    @staticmethod
+    def get_environment_settings() -> Dict[str, str]:
+        """
+        Returns the settings defined by the environment variables whose name contains '__',
+        using ':' in place of '__' in the key name.
+        """
+        return {
+            name.replace('__', ':'): value
+            for name, value in os.environ.items() if '__' in name
+        }
+
+    def set_value(self, key: str, value: Any):
+        """
+        Adds or replaces a setting. The change is visible to Configuration after its next refresh.
+
+        Parameters
+        ----------
+        - key : str
+            The configuration key.
+        - value : Any
+            The configuration value.
+        """
+        self.settings[key] = value
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Returns a copy of the settings.
+        """
+        return dict(self.settings)
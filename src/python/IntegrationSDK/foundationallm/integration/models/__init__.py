@@ -5,3 +5,5 @@ from .pii_result import PIIResult
 from .pii_result_anonymized import PIIResultAnonymized
 from .analyze_request import AnalyzeRequest
 from .analyze_response import AnalyzeResponse
+from .analyze_batch_request import AnalyzeBatchRequest
+from .analyze_batch_response import AnalyzeBatchResponse
@@ -0,0 +1,15 @@
+"""
+The AnalyzeBatchRequest class encapsulates the information
+required for the analyzer to analyze many text documents for PII.
+"""
+from typing import List, Optional
+from pydantic import BaseModel
+
+class AnalyzeBatchRequest(BaseModel):
+    """
+    Request object to analyze many text documents for PII in a single call.
+    Set anonymize to True to replace PII with a placeholder.
+    """
+    contents: List[str]
+    anonymize: bool = False
+    language: Optional[str] = "en"
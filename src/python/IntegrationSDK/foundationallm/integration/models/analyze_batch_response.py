@@ -0,0 +1,14 @@
+"""
+The AnalyzeBatchResponse encapsulates the responses from the analyzer
+for each of the documents in a batch request.
+"""
+from typing import List
+from pydantic import BaseModel
+from .analyze_response import AnalyzeResponse
+
+class AnalyzeBatchResponse(BaseModel):
+    """
+    Response object containing one AnalyzeResponse per document,
+    in the same order as the contents of the initial request.
+    """
+    results: List[AnalyzeResponse] = []
@@ -2,4 +2,6 @@
 This module contains the Analyzer class which is used
 to analyze and/or anonymize PII data from textual content.
 """
+from .engine_registry import EngineRegistry
 from .analyzer import Analyzer
+from .analyzer_pool import AnalyzerPool
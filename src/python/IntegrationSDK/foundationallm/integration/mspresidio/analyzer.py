@@ -3,16 +3,14 @@ The Analyzer is responsible for analyzing textual content and returning
 the PII entities found in the text, optionally anonymizing the text.
 """
 from typing import List
-from presidio_analyzer import AnalyzerEngine, RecognizerResult
-from presidio_anonymizer import AnonymizerEngine
+from presidio_analyzer import BatchAnalyzerEngine, RecognizerResult
 from presidio_anonymizer.entities.engine.result import EngineResult
 from foundationallm.integration.models import (
-        AnalyzeRequest, AnalyzeResponse,
+        AnalyzeBatchRequest, AnalyzeRequest, AnalyzeResponse,
         PIIResult, PIIResultAnonymized
     )
+from .engine_registry import EngineRegistry
 
-# Analyzer only has one method by design.
-# pylint: disable=too-few-public-methods
 class Analyzer:
     """
     The Analyzer is responsible for analyzing textual content and returning
@@ -20,14 +18,14 @@ class Analyzer:
     """
     def __init__(self, request: AnalyzeRequest):
         """
-        Initializes the analyzer and anonymizer engines and sets the request
+        Obtains the shared analyzer and anonymizer engines and sets the request
 
         Parameters:
-            request (AnalyzeRequest): The request to analyze        
+            request (AnalyzeRequest): The request to analyze
         """
         self.request = request
-        self.analyzer = AnalyzerEngine()
-        self.anonymizer = AnonymizerEngine()
+        self.analyzer = EngineRegistry.get_analyzer(request.language or 'en')
+        self.anonymizer = EngineRegistry.get_anonymizer()
 
     def analyze(self) -> AnalyzeResponse:
         """
@@ -35,9 +33,37 @@ class Analyzer:
         If the request specifies anonymization, the text is anonymized
         """
         analyze_results = self.__analyze()
-        if self.request.anonymize:
+        return Analyzer.__build_response(
+            self.request.content, analyze_results, self.request.anonymize)
+
+    @staticmethod
+    def analyze_batch(request: AnalyzeBatchRequest, batch_size: int = 32) -> List[AnalyzeResponse]:
+        """
+        Analyzes each document of a batch request using the Presidio batch analyzer
+        and returns one AnalyzeResponse per document, in the order of the request contents.
+
+        Parameters:
+            request (AnalyzeBatchRequest): The batch request to analyze
+            batch_size (int): The number of documents processed by the NLP engine at once
+        """
+        language = request.language or 'en'
+        batch_analyzer = BatchAnalyzerEngine(
+            analyzer_engine=EngineRegistry.get_analyzer(language))
+        analyze_results = batch_analyzer.analyze_iterator(
+            texts=request.contents, language=language, batch_size=batch_size)
+        return [Analyzer.__build_response(content, results, request.anonymize)
+                for content, results in zip(request.contents, analyze_results)]
+
+    @staticmethod
+    def __build_response(content: str, analyze_results: List[RecognizerResult],
+                         anonymize: bool) -> AnalyzeResponse:
+        """
+        Builds the response for the content from the analyzer results,
+        anonymizing the content when requested.
+        """
+        if anonymize:
             # anonymize the text results based on the analyzer results
-            anonymized_results = self.__anonymize(analyze_results)
+            anonymized_results = Analyzer.__anonymize(content, analyze_results)
             results = [PIIResultAnonymized(entity_type=p.entity_type, start_index=p.start,
                                            end_index=p.end, anonymized_text=p.text,
                                            operator=p.operator)
@@ -47,7 +73,7 @@ class Analyzer:
         # pii_result response
         results = [PIIResult(entity_type=p.entity_type, start_index=p.start,
                         end_index=p.end) for p in analyze_results]
-        return AnalyzeResponse(content=self.request.content, results=results)
+        return AnalyzeResponse(content=content, results=results)
 
     def __analyze(self) -> List[RecognizerResult]:
         """
@@ -56,9 +82,10 @@ class Analyzer:
         """
         return self.analyzer.analyze(text=self.request.content, language=self.request.language)
 
-    def __anonymize(self, results: List[RecognizerResult]) -> EngineResult:
+    @staticmethod
+    def __anonymize(content: str, results: List[RecognizerResult]) -> EngineResult:
         """
         Uses the Presidio Anonymizer to anonymize the content based on the PII entities found
         in the text
         """
-        return self.anonymizer.anonymize(text=self.request.content, analyzer_results=results)
+        return EngineRegistry.get_anonymizer().anonymize(text=content, analyzer_results=results)
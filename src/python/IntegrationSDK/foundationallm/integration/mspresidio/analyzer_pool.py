@@ -0,0 +1,138 @@
+"""
+The AnalyzerPool fans Analyzer work out to a pool of worker processes
+so that large batches of documents are analyzed on several cores.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator, List
+from foundationallm.integration.models import AnalyzeBatchRequest, AnalyzeResponse
+from .analyzer import Analyzer
+from .engine_registry import EngineRegistry
+
+class AnalyzerPool:
+    """
+    Runs Analyzer work on a pool of worker processes, each holding its own
+    warmed up EngineRegistry, and returns the results in request order.
+
+    Each worker process loads its own Presidio analyzer and spaCy model, which takes
+    several hundred megabytes to about 1 GB of memory with the default en_core_web_lg model,
+    so the default number of workers is capped by MAX_DEFAULT_WORKERS.
+
+    When a worker process dies, for instance when it runs out of memory, the pool is broken
+    and the requests it was running fail. The pool is then replaced by a new one, so the
+    next requests are analyzed.
+    """
+    # The maximum number of worker processes when the number is not set explicitly.
+    MAX_DEFAULT_WORKERS = 2
+
+    def __init__(self, max_workers: int = None, languages: List[str] = None):
+        """
+        Initializes the process pool.
+
+        Parameters:
+            max_workers (int): The number of worker processes. Defaults to the number of CPUs
+                available to the process, up to MAX_DEFAULT_WORKERS.
+            languages (List[str]): The languages warmed up in each worker process.
+        """
+        self.max_workers = max_workers or min(self.get_available_cpu_count(), self.MAX_DEFAULT_WORKERS)
+        self.languages = tuple(languages or ['en'])
+        self.__lock = threading.Lock()
+        self.executor = self.__create_executor()
+
+    def __create_executor(self) -> ProcessPoolExecutor:
+        """
+        Creates the process pool, whose workers warm up the analyzer of each language.
+        """
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=EngineRegistry.warm_up,
+            initargs=(self.languages,)
+        )
+
+    def __replace_broken_executor(self, executor: ProcessPoolExecutor):
+        """
+        Replaces the process pool if it is still the broken one. The requests that fail
+        together on the same broken pool only replace it once.
+        """
+        with self.__lock:
+            if self.executor is not executor:
+                return
+            logging.error('A worker process of the analyzer pool died, the pool is being replaced.')
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = self.__create_executor()
+
+    @staticmethod
+    def get_available_cpu_count() -> int:
+        """
+        Returns the number of CPUs the process may run on, which is lower than
+        the number of CPUs of the host when the process is pinned to some of them.
+        """
+        if hasattr(os, 'sched_getaffinity'):
+            return len(os.sched_getaffinity(0)) or 1
+        return os.cpu_count() or 1
+
+    def __submit(self, executor: ProcessPoolExecutor, request: AnalyzeBatchRequest) -> List[Future]:
+        """
+        Splits the request contents into one contiguous chunk per worker process
+        and submits each chunk to the pool.
+        """
+        if len(request.contents) == 0:
+            return []
+        chunk_count = max(1, min(self.max_workers, len(request.contents)))
+        chunk_size = -(-len(request.contents) // chunk_count)
+        return [
+            executor.submit(
+                Analyzer.analyze_batch,
+                request.model_copy(update={'contents': request.contents[i:i + chunk_size]}))
+            for i in range(0, len(request.contents), chunk_size)
+        ]
+
+    async def analyze_batch(self, request: AnalyzeBatchRequest) -> List[AnalyzeResponse]:
+        """
+        Analyzes all the documents of the request and returns the responses in request order.
+
+        Parameters:
+            request (AnalyzeBatchRequest): The batch request to analyze
+        """
+        executor = self.executor
+        try:
+            chunks = await asyncio.gather(
+                *[asyncio.wrap_future(future) for future in self.__submit(executor, request)])
+        except BrokenProcessPool:
+            self.__replace_broken_executor(executor)
+            raise
+        return [response for chunk in chunks for response in chunk]
+
+    async def analyze_stream(self, request: AnalyzeBatchRequest) -> AsyncIterator[AnalyzeResponse]:
+        """
+        Analyzes all the documents of the request and yields the responses in request order
+        as soon as the chunk containing them has been processed.
+
+        Parameters:
+            request (AnalyzeBatchRequest): The batch request to analyze
+        """
+        executor = self.executor
+        futures = []
+        try:
+            futures = [asyncio.wrap_future(future) for future in self.__submit(executor, request)]
+            for future in futures:
+                for response in await future:
+                    yield response
+        except BrokenProcessPool:
+            self.__replace_broken_executor(executor)
+            raise
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self):
+        """
+        Shuts down the worker processes, cancelling any pending work.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,100 @@
+"""
+The EngineRegistry holds the Presidio analyzer and anonymizer engines
+shared by every Analyzer created in the current process.
+"""
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+from presidio_analyzer import AnalyzerEngine
+from presidio_anonymizer import AnonymizerEngine
+
+class EngineRegistry:
+    """
+    Process-wide registry of Presidio engines.
+
+    Creating an AnalyzerEngine loads the NLP model and every recognizer,
+    so engines are created once per language and recognizer set and then
+    reused for the lifetime of the worker process.
+    """
+    __analyzers: Dict[Tuple[str, Optional[Tuple[str, ...]]], AnalyzerEngine] = {}
+    __anonymizer: AnonymizerEngine = None
+    __lock = threading.Lock()
+
+    @staticmethod
+    def __get_key(language: str, recognizers: Iterable[str] = None) \
+            -> Tuple[str, Optional[Tuple[str, ...]]]:
+        """
+        Builds the registry key for a language and an optional set of recognizer names.
+        """
+        return (language, tuple(sorted(set(recognizers))) if recognizers else None)
+
+    @staticmethod
+    def __create_analyzer(language: str, recognizers: Tuple[str, ...] = None) -> AnalyzerEngine:
+        """
+        Creates an analyzer engine for the language, restricted to the
+        named recognizers when a recognizer set is provided.
+        """
+        analyzer = AnalyzerEngine(supported_languages=[language])
+        if recognizers is not None:
+            for recognizer in analyzer.registry.get_recognizers(
+                    language=language, all_fields=True):
+                if recognizer.name not in recognizers:
+                    analyzer.registry.remove_recognizer(recognizer.name)
+        return analyzer
+
+    @classmethod
+    def get_analyzer(cls, language: str = 'en',
+                     recognizers: Iterable[str] = None) -> AnalyzerEngine:
+        """
+        Returns the shared analyzer engine for the language and recognizer set,
+        creating it on first use.
+
+        Parameters
+        ----------
+        language : str
+            The language the analyzer engine supports.
+        recognizers : Iterable[str]
+            The names of the recognizers to load. All recognizers are loaded when None.
+        """
+        key = cls.__get_key(language, recognizers)
+        analyzer = cls.__analyzers.get(key)
+        if analyzer is None:
+            with cls.__lock:
+                analyzer = cls.__analyzers.get(key)
+                if analyzer is None:
+                    analyzer = cls.__create_analyzer(*key)
+                    cls.__analyzers[key] = analyzer
+        return analyzer
+
+    @classmethod
+    def get_anonymizer(cls) -> AnonymizerEngine:
+        """
+        Returns the shared anonymizer engine, creating it on first use.
+        """
+        if cls.__anonymizer is None:
+            with cls.__lock:
+                if cls.__anonymizer is None:
+                    cls.__anonymizer = AnonymizerEngine()
+        return cls.__anonymizer
+
+    @classmethod
+    def warm_up(cls, languages: Iterable[str] = ('en',)):
+        """
+        Creates the engines for the specified languages ahead of the first request.
+
+        Parameters
+        ----------
+        languages : Iterable[str]
+            The languages for which analyzer engines are created.
+        """
+        for language in languages:
+            cls.get_analyzer(language).analyze(text='warm up', language=language)
+        cls.get_anonymizer()
+
+    @classmethod
+    def clear(cls):
+        """
+        Releases all engines held by the registry.
+        """
+        with cls.__lock:
+            cls.__analyzers.clear()
+            cls.__anonymizer = None
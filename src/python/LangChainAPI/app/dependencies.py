@@ -2,12 +2,30 @@
 Provides dependencies for API calls.
 """
 import logging
+import os
 import time
 from fastapi import Depends, HTTPException
 from fastapi.security import APIKeyHeader
 from foundationallm.config import Configuration
+from foundationallm.config.environment_variables import (
+    FOUNDATIONALLM_COMPLETION_JOB_CONCURRENCY,
+    FOUNDATIONALLM_COMPLETION_JOB_DEFAULT_CONCURRENCY,
+    FOUNDATIONALLM_COMPLETION_JOB_QUEUE_DEPTH
+)
+from foundationallm.operations import (
+    JobScheduler,
+    OperationEventBroker,
+    OperationsManager,
+    OperationStateBuffer,
+    OperationStateCache
+)
 
 __config: Configuration = None
+__operations_manager: OperationsManager = None
+__operation_state_buffer: OperationStateBuffer = None
+__operation_state_cache: OperationStateCache = None
+__operation_event_broker: OperationEventBroker = None
+__job_scheduler: JobScheduler = None
 API_NAME = 'LangChainAPI'
 
 def get_config(action: str = None) -> Configuration:
@@ -22,14 +40,128 @@ def get_config(action: str = None) -> Configuration:
     global __config
 
     start = time.time()
+    __config = __config or Configuration()
     if action is not None and action=='refresh':
-        __config = Configuration()
-    else:
-        __config = __config or Configuration()
+        __config.refresh()
     end = time.time()
     print(f'Time to load config: {end-start}')
     return __config
 
+async def get_operations_manager(action: str = None) -> OperationsManager:
+    """
+    Obtains the operations manager shared by all requests for calls to the State API.
+
+    Parameters
+    ----------
+    action : str
+        Set to 'close' to release the pooled State API connections.
+
+    Returns
+    -------
+    OperationsManager
+        Returns the shared operations manager.
+    """
+    global __operations_manager
+
+    if action is not None and action=='close':
+        if __operations_manager is not None:
+            await __operations_manager.close()
+        __operations_manager = None
+    elif __operations_manager is None:
+        __operations_manager = OperationsManager(get_config())
+    return __operations_manager
+
+async def get_operation_state_buffer(action: str = None) -> OperationStateBuffer:
+    """
+    Obtains the write-behind buffer used to send operation status and result writes
+    to the State API.
+
+    Parameters
+    ----------
+    action : str
+        Set to 'close' to flush the pending writes and stop the buffer. Raises
+        OperationStateWriteError if some writes could not be sent to the State API.
+
+    Returns
+    -------
+    OperationStateBuffer
+        Returns the shared operation state buffer.
+    """
+    global __operation_state_buffer
+
+    if action is not None and action=='close':
+        try:
+            if __operation_state_buffer is not None:
+                await __operation_state_buffer.close()
+        finally:
+            __operation_state_buffer = None
+    elif __operation_state_buffer is None:
+        __operation_state_buffer = OperationStateBuffer(
+            await get_operations_manager(),
+            cache=get_operation_state_cache(),
+            event_broker=get_operation_event_broker())
+    return __operation_state_buffer
+
+def get_operation_state_cache() -> OperationStateCache:
+    """
+    Obtains the in-process cache of the statuses and results of operations.
+
+    Returns
+    -------
+    OperationStateCache
+        Returns the shared operation state cache.
+    """
+    global __operation_state_cache
+
+    __operation_state_cache = __operation_state_cache or OperationStateCache()
+    return __operation_state_cache
+
+def get_operation_event_broker() -> OperationEventBroker:
+    """
+    Obtains the broker that streams the events of the operations run by this node.
+
+    Returns
+    -------
+    OperationEventBroker
+        Returns the shared operation event broker.
+    """
+    global __operation_event_broker
+
+    __operation_event_broker = __operation_event_broker or OperationEventBroker()
+    return __operation_event_broker
+
+async def get_job_scheduler(action: str = None) -> JobScheduler:
+    """
+    Obtains the scheduler that runs the completion jobs in the background.
+
+    Parameters
+    ----------
+    action : str
+        Set to 'close' to wait for the queued jobs to finish and stop the scheduler.
+
+    Returns
+    -------
+    JobScheduler
+        Returns the shared job scheduler.
+    """
+    global __job_scheduler
+
+    if action is not None and action=='close':
+        if __job_scheduler is not None:
+            await __job_scheduler.close()
+        __job_scheduler = None
+    elif __job_scheduler is None:
+        concurrency = {}
+        for item in os.environ.get(FOUNDATIONALLM_COMPLETION_JOB_CONCURRENCY, '').split(','):
+            if '=' in item:
+                agent_type, count = item.split('=', 1)
+                concurrency[agent_type.strip()] = int(count)
+        __job_scheduler = JobScheduler(
+            concurrency=concurrency,
+            default_concurrency=int(os.environ.get(FOUNDATIONALLM_COMPLETION_JOB_DEFAULT_CONCURRENCY, 4)),
+            max_queue_depth=int(os.environ.get(FOUNDATIONALLM_COMPLETION_JOB_QUEUE_DEPTH, 256)))
+    return __job_scheduler
+
 async def validate_api_key_header(x_api_key: str = Depends(APIKeyHeader(name='X-API-Key'))) -> bool:
     """
     Validates that the X-API-Key value in the request header matches the key expected for this API.
@@ -2,13 +2,23 @@
 Main entry-point for the FoundationaLLM LangChainAPI.
 Runs web server exposing the API.
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.dependencies import API_NAME, get_config
+from app.dependencies import (
+    API_NAME,
+    get_config,
+    get_job_scheduler,
+    get_operation_state_buffer,
+    get_operations_manager
+)
 from app.routers import (
     manage,
     completions,
     status
 )
+from foundationallm.langchain.language_models import LanguageModelClientRegistry
+from foundationallm.services import HttpSessionPool
+from foundationallm.services.gateway_text_embedding import TextEmbeddingCache
 from foundationallm.telemetry import Telemetry
 
 # Open a connection to the app configuration
@@ -16,7 +26,31 @@ config = get_config()
 # Start collecting telemetry
 Telemetry.configure_monitoring(config, f'FoundationaLLM:APIEndpoints:{API_NAME}:Essentials:AppInsightsConnectionString')
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Creates the State API client and the completion job scheduler shared by all requests.
+    On shutdown, lets the queued jobs finish, marks the operations of the jobs that had to be
+    cancelled as failed, flushes the pending operation state writes and reports those that
+    could not be sent, releases the pooled connections, including those of the language model
+    clients and of the HTTP session pool, and writes the cached query embeddings to disk.
+    """
+    await get_operations_manager()
+    await get_operation_state_buffer()
+    await get_job_scheduler()
+    yield
+    await get_job_scheduler('close')
+    try:
+        # Raises if some operation state writes could not be sent to the State API.
+        await get_operation_state_buffer('close')
+    finally:
+        await get_operations_manager('close')
+        await LanguageModelClientRegistry.aclose()
+        await HttpSessionPool.aclose()
+        TextEmbeddingCache.get_default().close()
+
 app = FastAPI(
+    lifespan=lifespan,
     title=f'FoundationaLLM {API_NAME}',
     summary='API for interacting with large language models using the LangChain orchestrator.',
     description=f"""The FoundationaLLM {API_NAME} is a wrapper around LangChain functionality
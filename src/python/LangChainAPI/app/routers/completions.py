@@ -3,10 +3,9 @@ The API endpoint for returning the completion from the LLM for the specified use
 """
 import asyncio
 import json
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 from fastapi import (
     APIRouter,
-    BackgroundTasks,
     Body,
     Depends,
     Header,
@@ -15,6 +14,8 @@ from fastapi import (
     Response,
     status
 )
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from foundationallm.config import Configuration, UserIdentity
 from foundationallm.models.operations import (
     LongRunningOperation,
@@ -26,10 +27,23 @@ from foundationallm.models.orchestration import (
     CompletionResponse
 )
 from foundationallm.models.agents import KnowledgeManagementCompletionRequest
-from foundationallm.operations import OperationsManager
 from foundationallm.langchain.orchestration import OrchestrationManager
+from foundationallm.operations import (
+    JobPriority,
+    JobQueueFullError,
+    JobSchedulerClosedError,
+    OperationStateCache
+)
 from foundationallm.telemetry import Telemetry
-from app.dependencies import handle_exception, validate_api_key_header
+from app.dependencies import (
+    get_job_scheduler,
+    get_operation_event_broker,
+    get_operation_state_buffer,
+    get_operation_state_cache,
+    get_operations_manager,
+    handle_exception,
+    validate_api_key_header
+)
 
 # Initialize telemetry logging
 logger = Telemetry.get_logger(__name__)
@@ -64,18 +78,21 @@ async def resolve_completion_request(request_body: dict = Body(...)) -> Completi
     status_code = status.HTTP_202_ACCEPTED,
     responses = {
         202: {'description': 'Completion request accepted.'},
+        429: {'description': 'The completion job queue is full. Retry after the number of seconds in the Retry-After header.'},
+        503: {'description': 'The API is shutting down and does not accept completion requests.'}
     }
 )
 async def submit_completion_request(
     raw_request: Request,
     response: Response,
-    background_tasks: BackgroundTasks,
     instance_id: str,
     completion_request: CompletionRequestBase = Depends(resolve_completion_request),
-    x_user_identity: Optional[str] = Header(None)
+    x_user_identity: Optional[str] = Header(None),
+    x_priority: Optional[str] = Header(None)
 ) -> LongRunningOperation:
     """
     Initiates the creation of a completion response in the background.
+    The X-Priority header (high, normal or low) selects the priority lane of the job.
 
     Returns
     -------
@@ -94,27 +111,89 @@ async def submit_completion_request(
             location = f'{raw_request.base_url}instances/{instance_id}/async-completions/{operation_id}/status'
             response.headers['location'] = location
 
-            # Create an operations manager to create the operation.
-            operations_manager = OperationsManager(raw_request.app.extra['config'])
+            # Reject the request before creating the operation if the job queue is full.
+            job_scheduler = await get_job_scheduler()
+            job_scheduler.check_capacity()
+            priority = JobPriority.__members__.get((x_priority or '').upper(), JobPriority.NORMAL)
+
+            # Use the shared operations manager for calls to the State API.
+            operations_manager = await get_operations_manager()
             # Submit the completion request operation to the state API.
             operation = await operations_manager.create_operation(operation_id, instance_id)
-
-            # Start a background task to perform the completion request.
-            background_tasks.add_task(
-                create_completion_response,
-                operation_id,
-                instance_id,
-                completion_request,
-                raw_request.app.extra['config'],
-                x_user_identity
-            )
+            # This node runs the operation, so it serves the operation state from its cache.
+            get_operation_state_cache().set_operation(
+                operation_id, instance_id, operation, operation.get('status'), authoritative=True)
+            # Open the event stream so clients can subscribe before the operation starts.
+            event_broker = get_operation_event_broker()
+            event_broker.open(operation_id, instance_id)
+            event_broker.publish(operation_id, instance_id, 'status', operation)
+
+            # Queue a background job to perform the completion request.
+            configuration = raw_request.app.extra['config']
+            try:
+                job_scheduler.submit(
+                    completion_request.agent.type,
+                    lambda: create_completion_response(
+                        operation_id,
+                        instance_id,
+                        completion_request,
+                        configuration,
+                        x_user_identity
+                    ),
+                    priority=priority,
+                    on_cancel=lambda: fail_operation(
+                        operation_id, instance_id, 'The operation was cancelled on shutdown.')
+                )
+            except Exception as e:
+                # The queue filled up, or the API started shutting down, after the operation was created.
+                await fail_operation(operation_id, instance_id, f'The completion request could not be queued: {e}')
+                raise
 
             # Return the long running operation object.
             return operation
 
+        except JobQueueFullError as e:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=str(e),
+                headers={'Retry-After': str(e.retry_after_seconds)}
+            ) from e
+        except JobSchedulerClosedError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={'Retry-After': '30'}
+            ) from e
         except Exception as e:
             handle_exception(e)
 
+async def fail_operation(operation_id: str, instance_id: str, status_message: str):
+    """
+    Marks an operation that will never run as failed, so its cached status
+    does not stay pending and its event stream is closed.
+    """
+    try:
+        state_buffer = await get_operation_state_buffer()
+        state_buffer.update_operation(
+            operation_id=operation_id,
+            instance_id=instance_id,
+            status=OperationStatus.FAILED,
+            status_message=status_message
+        )
+    except Exception as e:
+        logger.error(f'The status of operation {operation_id} could not be set to failed: {e}')
+        get_operation_state_cache().set_operation(
+            operation_id,
+            instance_id,
+            LongRunningOperation(
+                operation_id=operation_id,
+                status=OperationStatus.FAILED,
+                status_message=status_message),
+            OperationStatus.FAILED,
+            authoritative=True)
+    finally:
+        get_operation_event_broker().close(operation_id, instance_id)
+
 async def create_completion_response(
     operation_id: str,
     instance_id: str,
@@ -126,16 +205,16 @@ async def create_completion_response(
     Generates the completion response for the specified completion request.
     """
     with tracer.start_as_current_span(f'create_completion_response') as span:
-        # Create an operations manager to update the operation status.
-        operations_manager = OperationsManager(configuration)
+        # Queue the operation state writes in the shared write-behind buffer.
+        state_buffer = await get_operation_state_buffer()
 
         try:
             span.set_attribute('operation_id', operation_id)
             span.set_attribute('instance_id', instance_id)
             span.set_attribute('user_identity', x_user_identity)
 
-            # Change the operation status to 'InProgress' using an async task.
-            await operations_manager.update_operation(
+            # Change the operation status to 'InProgress'.
+            state_buffer.update_operation(
                 operation_id,
                 instance_id,
                 status = OperationStatus.INPROGRESS,
@@ -154,42 +233,78 @@ async def create_completion_response(
                 configuration = configuration
             )
             # Await the completion response from the orchestration manager.
-            completion = await orchestration_manager.ainvoke(completion_request)
+            # The completion is only streamed when a client subscribed to the operation events,
+            # and its tokens are then published to the event stream as they are generated.
+            event_broker = get_operation_event_broker()
+            async def publish_token(token: str):
+                event_broker.publish(operation_id, instance_id, 'token', {'value': token})
+
+            completion = await orchestration_manager.ainvoke(
+                completion_request,
+                on_token=publish_token if event_broker.has_subscribers(operation_id, instance_id) else None)
 
             # Send the completion response to the State API and mark the operation as completed.
-            await asyncio.gather(
-                operations_manager.set_operation_result(
-                    operation_id=operation_id,
-                    instance_id=instance_id,
-                    completion_response=completion),
-                operations_manager.update_operation(
-                    operation_id=operation_id,
-                    instance_id=instance_id,
-                    status=OperationStatus.COMPLETED,
-                    status_message=f'Operation {operation_id} completed successfully.'
-                )
+            state_buffer.set_operation_result(
+                operation_id=operation_id,
+                instance_id=instance_id,
+                completion_response=completion)
+            state_buffer.update_operation(
+                operation_id=operation_id,
+                instance_id=instance_id,
+                status=OperationStatus.COMPLETED,
+                status_message=f'Operation {operation_id} completed successfully.'
             )
         except Exception as e:
             # Send the completion response to the State API and mark the operation as failed.
-            print(f'Operation {operation_id} failed with error: {e}')
+            logger.error(f'Operation {operation_id} failed with error: {e}')
             completion = CompletionResponse(
                 operation_id = operation_id,
                 user_prompt=completion_request.user_prompt,
                 completion=f'Operation failed with error: {e}'
             )
-            await asyncio.gather(
-                operations_manager.set_operation_result(
-                    operation_id=operation_id,
-                    instance_id=instance_id,
-                    completion_response=completion),
-                operations_manager.update_operation(
-                    operation_id=operation_id,
-                    instance_id=instance_id,
-                    status = OperationStatus.FAILED,
-                    status_message = f'Operation failed with error: {e}'
-                )
+            state_buffer.set_operation_result(
+                operation_id=operation_id,
+                instance_id=instance_id,
+                completion_response=completion)
+            state_buffer.update_operation(
+                operation_id=operation_id,
+                instance_id=instance_id,
+                status = OperationStatus.FAILED,
+                status_message = f'Operation failed with error: {e}'
             )
 
+async def read_operation(operation_id: str, instance_id: str):
+    """
+    Reads the status of an operation from the cache, falling back to the State API.
+    """
+    operation_state_cache = get_operation_state_cache()
+    operation = operation_state_cache.get_operation(operation_id, instance_id)
+    if operation is not None:
+        return operation
+
+    operations_manager = await get_operations_manager()
+    operation = await operations_manager.get_operation(operation_id, instance_id)
+    if operation is not None:
+        operation_state_cache.set_operation(
+            operation_id, instance_id, operation, operation.get('status'))
+    return operation
+
+async def read_operation_result(operation_id: str, instance_id: str):
+    """
+    Reads the result of an operation from the cache, falling back to the State API.
+    Results never change once they are set, so a cached result is always current.
+    """
+    operation_state_cache = get_operation_state_cache()
+    completion_response = operation_state_cache.get_result(operation_id, instance_id)
+    if completion_response is not None:
+        return completion_response
+
+    operations_manager = await get_operations_manager()
+    completion_response = await operations_manager.get_operation_result(operation_id, instance_id)
+    if completion_response is not None:
+        operation_state_cache.set_result(operation_id, instance_id, completion_response)
+    return completion_response
+
 @router.get(
     '/async-completions/{operation_id}/status',
     summary = 'Retrieve the status of the completion request operation with the specified operation ID.',
@@ -204,17 +319,11 @@ async def get_operation_status(
     operation_id: str
 ) -> LongRunningOperation:
     with tracer.start_as_current_span(f'get_operation_status') as span:
-        # Create an operations manager to get the operation status.
-        operations_manager = OperationsManager(raw_request.app.extra['config'])
-
         try:
             span.set_attribute('operation_id', operation_id)
             span.set_attribute('instance_id', instance_id)
 
-            operation = await operations_manager.get_operation(
-                operation_id,
-                instance_id
-            )
+            operation = await read_operation(operation_id, instance_id)
 
             if operation is None:
                 raise HTTPException(status_code=404)
@@ -237,17 +346,11 @@ async def get_operation_result(
     operation_id: str
 ) -> CompletionResponse:
     with tracer.start_as_current_span(f'get_operation_result') as span:
-        # Create an operations manager to get the operation result.
-        operations_manager = OperationsManager(raw_request.app.extra['config'])
-
         try:
             span.set_attribute('operation_id', operation_id)
             span.set_attribute('instance_id', instance_id)
 
-            completion_response = await operations_manager.get_operation_result(
-                operation_id,
-                instance_id
-            )
+            completion_response = await read_operation_result(operation_id, instance_id)
 
             if completion_response is None:
                 raise HTTPException(status_code=404)
@@ -256,6 +359,83 @@ async def get_operation_result(
         except Exception as e:
             handle_exception(e)
 
+def format_event(event: str, data) -> str:
+    """
+    Formats an event for a text/event-stream response.
+    """
+    if isinstance(data, BaseModel):
+        data = data.model_dump(mode='json')
+    return f'event: {event}\ndata: {json.dumps(data, default=str)}\n\n'
+
+async def poll_operation_events(
+    operation_id: str,
+    instance_id: str,
+    poll_interval_seconds: float = 1) -> AsyncIterator[str]:
+    """
+    Yields the status changes and the result of an operation that is not run by this node.
+    """
+    last_status = None
+    while True:
+        operation = await read_operation(operation_id, instance_id)
+        if operation is None:
+            yield format_event('error', {'status_code': 404, 'detail': 'Not Found'})
+            return
+
+        operation_status = operation.status if isinstance(operation, BaseModel) else operation.get('status')
+        if operation_status != last_status:
+            last_status = operation_status
+            yield format_event('status', operation)
+
+        if OperationStateCache.is_final(operation_status):
+            completion_response = await read_operation_result(operation_id, instance_id)
+            if completion_response is not None:
+                yield format_event('result', completion_response)
+            return
+
+        await asyncio.sleep(poll_interval_seconds)
+
+@router.get(
+    '/async-completions/{operation_id}/stream',
+    summary = 'Stream the status changes, completion tokens and result of the operation with the specified operation ID.',
+    response_class = StreamingResponse,
+    responses = {
+        200: {
+            'description': 'Server-sent events with status, token and result event types.',
+            'content': {'text/event-stream': {}}
+        }
+    }
+)
+async def stream_operation(
+    raw_request: Request,
+    instance_id: str,
+    operation_id: str
+) -> StreamingResponse:
+    """
+    Streams the events of an operation as server-sent events. When the operation runs on this
+    node, its events are streamed as they are published, including the completion tokens if
+    the client subscribed before the completion started. Otherwise, the status changes and
+    the result are read from the State API.
+    """
+    with tracer.start_as_current_span(f'stream_operation') as span:
+        span.set_attribute('operation_id', operation_id)
+        span.set_attribute('instance_id', instance_id)
+
+        event_broker = get_operation_event_broker()
+
+        async def generate_events():
+            if event_broker.has_stream(operation_id, instance_id):
+                async for event, data in event_broker.subscribe(operation_id, instance_id):
+                    yield format_event(event, data)
+            else:
+                async for event in poll_operation_events(operation_id, instance_id):
+                    yield event
+
+        return StreamingResponse(
+            generate_events(),
+            media_type='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
 @router.get(
     '/async-completions/{operation_id}/logs',
     summary = 'Retrieve the log of operational steps for the specified operation ID.',
@@ -270,8 +450,8 @@ async def get_operation_log(
     operation_id: str
 ) -> List[LongRunningOperationLogEntry]:
     with tracer.start_as_current_span(f'get_operation_log') as span:
-        # Create an operations manager to get the operation log.
-        operations_manager = OperationsManager(raw_request.app.extra['config'])
+        # Use the shared operations manager for calls to the State API.
+        operations_manager = await get_operations_manager()
 
         try:
             span.set_attribute('operation_id', operation_id)
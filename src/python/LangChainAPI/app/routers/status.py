@@ -4,7 +4,9 @@ Status API endpoint that acts as a health check for the API.
 import os
 from fastapi import APIRouter
 from foundationallm.config.environment_variables import HOSTNAME, FOUNDATIONALLM_VERSION
-from app.dependencies import API_NAME
+from foundationallm.services import HttpSessionPool
+from foundationallm.services.gateway_text_embedding import GatewayTextEmbeddingService, TextEmbeddingCache
+from app.dependencies import API_NAME, get_job_scheduler
 
 router = APIRouter(
     prefix='',
@@ -23,13 +25,17 @@ async def get_status():
     Returns
     -------
     str
-        A JSON object containing the name, version, and status of the {API_NAME}.
+        A JSON object containing the name, version, status, completion job, HTTP connection, embedding operation and embedding cache metrics of the {API_NAME}.
     """    
     status_message = {
         "name": API_NAME,
         "instance_name": os.environ[HOSTNAME],
         "version": os.environ[FOUNDATIONALLM_VERSION],
-        "status": "ready"
+        "status": "ready",
+        "jobs": (await get_job_scheduler()).get_metrics(),
+        "http_sessions": HttpSessionPool.get_metrics(),
+        "embedding_operations": GatewayTextEmbeddingService.get_metrics(),
+        "embedding_cache": TextEmbeddingCache.get_default().get_metrics()
     }
     return status_message
 
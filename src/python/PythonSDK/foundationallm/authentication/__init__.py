@@ -0,0 +1,4 @@
+"""
+Authentication module for FoundationaLLM package.
+"""
+from .azure_credential_cache import AsyncCachedTokenCredential, AzureCredentialCache
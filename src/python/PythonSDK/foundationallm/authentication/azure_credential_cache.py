@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from azure.core.credentials import AccessToken
+from azure.identity import DefaultAzureCredential
+
+class AzureCredentialCache:
+    """
+    Process-wide cache of the Azure credential and of the access tokens it issues.
+
+    Creating a DefaultAzureCredential walks the whole credential chain, so a single
+    credential is shared by every SDK component. Most components exclude the environment
+    credential; the components that have always accepted a service principal configured
+    through environment variables share a second credential that includes it.
+    Access tokens are cached by credential and scope.
+    A token that is close to expiring is refreshed in the background while the cached
+    token is still served, so callers only wait for a token when none is usable.
+    """
+    # Tokens are refreshed in the background once they expire within this many seconds.
+    REFRESH_MARGIN_SECONDS = 300
+    # Tokens that expire within this many seconds are not served and are refreshed inline.
+    EXPIRY_MARGIN_SECONDS = 30
+
+    __credentials: Dict[bool, DefaultAzureCredential] = {}
+    __async_credentials: Dict[bool, 'AsyncCachedTokenCredential'] = {}
+    __tokens: Dict[Tuple[str, bool], AccessToken] = {}
+    __token_providers: Dict[str, Callable[[], str]] = {}
+    __refreshing: Dict[Tuple[str, bool], threading.Thread] = {}
+    __lock = threading.Lock()
+    __scope_locks: Dict[Tuple[str, bool], threading.Lock] = {}
+
+    @classmethod
+    def get_credential(cls, exclude_environment_credential: bool = True) -> DefaultAzureCredential:
+        """
+        Returns the shared credential, creating it on first use.
+
+        Parameters
+        ----------
+        exclude_environment_credential : bool
+            False to return the credential that also authenticates with the service principal
+            configured by the AZURE_CLIENT_ID, AZURE_TENANT_ID and AZURE_CLIENT_SECRET environment variables.
+
+        Returns
+        -------
+        DefaultAzureCredential
+            The credential shared by every SDK component.
+        """
+        credential = cls.__credentials.get(exclude_environment_credential)
+        if credential is None:
+            with cls.__lock:
+                credential = cls.__credentials.get(exclude_environment_credential)
+                if credential is None:
+                    credential = cls.__credentials[exclude_environment_credential] = DefaultAzureCredential(
+                        exclude_environment_credential=exclude_environment_credential)
+        return credential
+
+    @classmethod
+    def __get_scope_lock(cls, key: Tuple[str, bool]) -> threading.Lock:
+        """
+        Returns the lock that serializes the token requests for a scope.
+        """
+        scope_lock = cls.__scope_locks.get(key)
+        if scope_lock is None:
+            with cls.__lock:
+                scope_lock = cls.__scope_locks.setdefault(key, threading.Lock())
+        return scope_lock
+
+    @classmethod
+    def __refresh_token(cls, key: Tuple[str, bool]) -> AccessToken:
+        """
+        Requests a new token for the scope and caches it.
+        """
+        scope, exclude_environment_credential = key
+        token = cls.get_credential(exclude_environment_credential).get_token(scope)
+        cls.__tokens[key] = token
+        return token
+
+    @classmethod
+    def __refresh_in_background(cls, key: Tuple[str, bool]):
+        """
+        Starts a background refresh of the token for the scope, unless one is already running.
+        """
+        def refresh():
+            try:
+                with cls.__get_scope_lock(key):
+                    token = cls.__tokens.get(key)
+                    if token is None or token.expires_on - time.time() <= cls.REFRESH_MARGIN_SECONDS:
+                        cls.__refresh_token(key)
+            except Exception as e:
+                logging.warning(f'Failed to refresh the access token for {key[0]}: {e}')
+            finally:
+                cls.__refreshing.pop(key, None)
+
+        with cls.__lock:
+            if key in cls.__refreshing:
+                return
+            thread = threading.Thread(target=refresh, name='AccessTokenRefresh', daemon=True)
+            cls.__refreshing[key] = thread
+        thread.start()
+
+    @classmethod
+    def get_access_token(
+        cls,
+        scope: str,
+        wait: bool = True,
+        exclude_environment_credential: bool = True) -> Optional[AccessToken]:
+        """
+        Returns a cached access token for the scope, requesting a new one when needed.
+
+        Parameters
+        ----------
+        scope : str
+            The scope of the token, such as 'https://cognitiveservices.azure.com/.default'.
+        wait : bool
+            False to return None instead of waiting when no cached token is usable.
+        exclude_environment_credential : bool
+            False to request the token with the credential that includes the environment credential.
+
+        Returns
+        -------
+        AccessToken
+            The access token and its expiration time.
+        """
+        key = (scope, exclude_environment_credential)
+        token = cls.__tokens.get(key)
+        if token is not None:
+            remaining = token.expires_on - time.time()
+            if remaining > cls.REFRESH_MARGIN_SECONDS:
+                return token
+            if remaining > cls.EXPIRY_MARGIN_SECONDS:
+                cls.__refresh_in_background(key)
+                return token
+        if not wait:
+            return None
+
+        with cls.__get_scope_lock(key):
+            # Another thread may have refreshed the token while this one was waiting.
+            token = cls.__tokens.get(key)
+            if token is None or token.expires_on - time.time() <= cls.EXPIRY_MARGIN_SECONDS:
+                token = cls.__refresh_token(key)
+            return token
+
+    @classmethod
+    def get_token(cls, scope: str) -> str:
+        """
+        Returns a cached access token for the scope, requesting a new one when needed.
+
+        Parameters
+        ----------
+        scope : str
+            The scope of the token, such as 'https://cognitiveservices.azure.com/.default'.
+
+        Returns
+        -------
+        str
+            The bearer token.
+        """
+        return cls.get_access_token(scope).token
+
+    @classmethod
+    def get_async_credential(cls, exclude_environment_credential: bool = True) -> 'AsyncCachedTokenCredential':
+        """
+        Returns an async credential, for the Azure SDK async clients, that serves the cached tokens.
+
+        Parameters
+        ----------
+        exclude_environment_credential : bool
+            False to serve the tokens of the credential that includes the environment credential.
+
+        Returns
+        -------
+        AsyncCachedTokenCredential
+            The async credential shared by every SDK component.
+        """
+        credential = cls.__async_credentials.get(exclude_environment_credential)
+        if credential is None:
+            with cls.__lock:
+                credential = cls.__async_credentials.setdefault(
+                    exclude_environment_credential, AsyncCachedTokenCredential(exclude_environment_credential))
+        return credential
+
+    @classmethod
+    def get_bearer_token_provider(cls, scope: str) -> Callable[[], str]:
+        """
+        Returns a callable that provides cached bearer tokens for the scope,
+        suitable for the azure_ad_token_provider parameter of the OpenAI clients.
+
+        Parameters
+        ----------
+        scope : str
+            The scope of the tokens.
+
+        Returns
+        -------
+        Callable[[], str]
+            The token provider shared by all the callers using the same scope.
+        """
+        token_provider = cls.__token_providers.get(scope)
+        if token_provider is None:
+            with cls.__lock:
+                token_provider = cls.__token_providers.setdefault(
+                    scope, lambda: cls.get_token(scope))
+        return token_provider
+
+    @classmethod
+    def clear(cls):
+        """
+        Discards the cached credential and tokens.
+        """
+        with cls.__lock:
+            cls.__credentials.clear()
+            cls.__tokens.clear()
+            cls.__token_providers.clear()
+
+class AsyncCachedTokenCredential:
+    """
+    Async token credential that serves the access tokens of the AzureCredentialCache.
+
+    Cached tokens are returned without blocking the event loop. When a token must be
+    requested, the request runs on a worker thread.
+    """
+    def __init__(self, exclude_environment_credential: bool = True):
+        """
+        Initializes the credential.
+
+        Parameters
+        ----------
+        exclude_environment_credential : bool
+            False to serve the tokens of the credential that includes the environment credential.
+        """
+        self.exclude_environment_credential = exclude_environment_credential
+
+    async def get_token(self, *scopes: str, **kwargs) -> AccessToken:
+        """
+        Returns an access token for the first scope.
+
+        Parameters
+        ----------
+        scopes : str
+            The scopes of the token. Only the first scope is used.
+
+        Returns
+        -------
+        AccessToken
+            The access token and its expiration time.
+        """
+        token = AzureCredentialCache.get_access_token(
+            scopes[0], wait=False, exclude_environment_credential=self.exclude_environment_credential)
+        if token is None:
+            token = await asyncio.to_thread(
+                AzureCredentialCache.get_access_token,
+                scopes[0],
+                exclude_environment_credential=self.exclude_environment_credential)
+        return token
+
+    async def close(self):
+        """
+        The tokens are owned by the AzureCredentialCache, so there is nothing to close.
+        """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
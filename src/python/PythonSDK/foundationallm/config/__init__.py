@@ -1,6 +1,10 @@
 """ 
 Configuration classes for FoundationaLLM Python SDK
 """
+from .configuration_provider_base import ConfigurationProviderBase
+from .app_configuration_provider import AppConfigurationProvider
+from .file_configuration_provider import FileConfigurationProvider
+from .memory_configuration_provider import MemoryConfigurationProvider
 from .configuration import Configuration
 from .user_identity import UserIdentity
 from .context import Context
@@ -0,0 +1,64 @@
+"""
+Contains the implementation of the configuration provider that loads settings
+from Azure App Configuration.
+"""
+import logging
+from typing import Any, Dict, List
+from tenacity import retry, wait_random_exponential, stop_after_attempt
+from azure.appconfiguration.provider import (
+    AzureAppConfigurationKeyVaultOptions,
+    SettingSelector,
+    load
+)
+from foundationallm.authentication import AzureCredentialCache
+from .configuration_provider_base import ConfigurationProviderBase
+
+class AppConfigurationProvider(ConfigurationProviderBase):
+    """
+    Loads configuration settings from Azure App Configuration, resolving Key Vault references.
+    """
+    def __init__(self, endpoint: str):
+        """
+        Initializes the provider.
+
+        Parameters
+        ----------
+        endpoint : str
+            The Azure App Configuration endpoint.
+        """
+        self.endpoint = endpoint
+        self.__credential = AzureCredentialCache.get_credential()
+
+    @staticmethod
+    def __retry_before_sleep(retry_state):
+        # Log the outcome of each retry attempt.
+        message = f"""Retrying {retry_state.fn}:
+                        attempt {retry_state.attempt_number}
+                        ended with: {retry_state.outcome}"""
+        if retry_state.outcome.failed:
+            ex = retry_state.outcome.exception()
+            message += f"; Exception: {ex.__class__.__name__}: {ex}"
+        if retry_state.attempt_number < 1:
+            logging.info(message)
+        else:
+            logging.warning(message)
+
+    # Retry with jitter on transient errors. Initially up to 2^x * 1 seconds between each retry
+    # until the range reaches 5 seconds. Stop after five retry attempts.
+    @retry(
+        wait=wait_random_exponential(multiplier=1, max=5),
+        stop=stop_after_attempt(5),
+        before_sleep=__retry_before_sleep,
+        reraise=True
+    )
+    def load(self, key_prefixes: List[str] = None) -> Dict[str, Any]:
+        """
+        Loads the settings matching the key prefixes from Azure App Configuration.
+        """
+        selects = [SettingSelector(key_filter=p) for p in key_prefixes] if key_prefixes else None
+        kwargs = { 'selects': selects } if selects else {}
+        app_config = load(endpoint=self.endpoint, credential=self.__credential,
+                          key_vault_options=
+                            AzureAppConfigurationKeyVaultOptions(credential=self.__credential),
+                          **kwargs)
+        return dict(app_config.items())
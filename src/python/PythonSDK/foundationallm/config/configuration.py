@@ -1,32 +1,91 @@
 import os
 import logging
 import json
-from tenacity import retry, wait_random_exponential, stop_after_attempt, RetryError
-from azure.appconfiguration.provider import (
-    AzureAppConfigurationKeyVaultOptions,
-    load
+import threading
+from types import MappingProxyType
+from typing import List, Mapping
+from foundationallm.config.configuration_provider_base import ConfigurationProviderBase
+from foundationallm.config.app_configuration_provider import AppConfigurationProvider
+from foundationallm.config.file_configuration_provider import FileConfigurationProvider
+from foundationallm.config.memory_configuration_provider import MemoryConfigurationProvider
+from foundationallm.config.environment_variables import (
+    FOUNDATIONALLM_APP_CONFIGURATION_URI,
+    FOUNDATIONALLM_CONFIGURATION_FILE,
+    FOUNDATIONALLM_CONFIGURATION_PROVIDER,
+    FOUNDATIONALLM_CONFIGURATION_REFRESH_SECONDS
 )
-from azure.identity import DefaultAzureCredential
 
 class Configuration():
-    def __init__(self):
-        """Init"""
-        try:
-            app_config_uri = os.environ['FOUNDATIONALLM_APP_CONFIGURATION_URI']
-        except Exception as e:
-            raise e
-
-        credential = DefaultAzureCredential(
-            exclude_environment_credential=True)
+    """
+    Resolves configuration settings from Azure App Configuration, or from the
+    offline provider selected by FOUNDATIONALLM_CONFIGURATION_PROVIDER.
+
+    The settings are held in a frozen, dictionary-backed snapshot so lookups never
+    leave the process. A background thread reloads the settings every
+    FOUNDATIONALLM_CONFIGURATION_REFRESH_SECONDS (0 disables periodic refreshes)
+    and atomically swaps in the new snapshot, so a refresh never blocks a reader.
+    """
+    def __init__(self, key_prefixes: List[str] = None,
+                 provider: ConfigurationProviderBase = None):
+        """
+        Loads the initial configuration snapshot and starts the background refresher.
 
-        # Connect to Azure App Configuration.
-        self.__config = load(endpoint=app_config_uri, credential=credential,
-                             key_vault_options=
-                                AzureAppConfigurationKeyVaultOptions(credential=credential))
+        Parameters
+        ----------
+        key_prefixes : List[str]
+            Key filters restricting the settings loaded from Azure App Configuration,
+            such as 'FoundationaLLM:APIEndpoints:*'. All the settings are loaded when None.
+        provider : ConfigurationProviderBase
+            The provider from which the settings are loaded. When None, the provider
+            is selected by the FOUNDATIONALLM_CONFIGURATION_PROVIDER environment variable.
+        """
+        self.__provider = provider or Configuration.__create_provider()
+        self.__key_prefixes = list(key_prefixes) if key_prefixes else None
+
+        # Load the initial snapshot from the provider.
+        self.__snapshot: Mapping[str, str] = MappingProxyType(
+            self.__provider.load(self.__key_prefixes))
+
+        self.__refresh_requested = threading.Event()
+        self.__refresh_seconds = float(os.environ.get(FOUNDATIONALLM_CONFIGURATION_REFRESH_SECONDS, 0))
+        self.__refresh_thread = threading.Thread(
+            target=self.__refresh_loop,
+            name='ConfigurationRefresh',
+            daemon=True)
+        self.__refresh_thread.start()
+
+    @staticmethod
+    def __create_provider() -> ConfigurationProviderBase:
+        """
+        Creates the configuration provider selected by the environment variables:
+            - appconfiguration (default): Azure App Configuration at FOUNDATIONALLM_APP_CONFIGURATION_URI.
+            - file: the JSON, YAML or .env file at FOUNDATIONALLM_CONFIGURATION_FILE,
+              overridden by the environment variables.
+            - memory: the environment variables, using '__' in place of ':' in the key names.
+            - local: the file provider when FOUNDATIONALLM_CONFIGURATION_FILE is set,
+              and the memory provider otherwise.
+        The Integration SDK selects its providers with the same rules.
+        """
+        provider_name = os.environ.get(FOUNDATIONALLM_CONFIGURATION_PROVIDER, 'appconfiguration')
+        match provider_name.lower():
+            case 'appconfiguration':
+                return AppConfigurationProvider(
+                    endpoint=os.environ[FOUNDATIONALLM_APP_CONFIGURATION_URI])
+            case 'file':
+                return FileConfigurationProvider(
+                    file_path=os.environ.get(FOUNDATIONALLM_CONFIGURATION_FILE))
+            case 'memory':
+                return MemoryConfigurationProvider()
+            case 'local':
+                file_path = os.environ.get(FOUNDATIONALLM_CONFIGURATION_FILE)
+                return FileConfigurationProvider(file_path=file_path) if file_path \
+                    else MemoryConfigurationProvider()
+            case _:
+                raise ValueError(f'The configuration provider {provider_name} is not supported.')
 
     def get_value(self, key: str) -> str:
         """
-        Retrieves the value from Azure App Configuration.
+        Retrieves the value from the configuration snapshot.
         Otherwise, retrieves the value from the environment variable.
         If the value is not found the method raises an exception.
 
@@ -34,7 +93,7 @@ class Configuration():
         ----------
         - key : str
             The key name of the configuration setting to retrieve.
-        
+
         Returns
         -------
         The configuration value
@@ -47,10 +106,10 @@ class Configuration():
         value = None
 
         # will have future usage with Azure App Configuration
-        # if foundationallm-configuration-allow-environment-variables exists and is True, 
+        # if foundationallm-configuration-allow-environment-variables exists and is True,
         #   then the environment variables will be checked first, then KV
-        # if foundationallm-configuration-allow-environment-variables does not exist 
-        #   OR foundationallm-configuration-allow-environment-variables is False, 
+        # if foundationallm-configuration-allow-environment-variables does not exist
+        #   OR foundationallm-configuration-allow-environment-variables is False,
         #   then check App config and then KV
         allow_env_vars = False
         if "foundationallm-configuration-allow-environment-variables" in os.environ:
@@ -62,10 +121,7 @@ class Configuration():
             value = os.environ.get(key)
 
         if value is None:
-            try:
-                value = self.__get_config_with_retry(name=key)
-            except Exception as e:
-                pass
+            value = self.__snapshot.get(key)
 
         if value is not None:
             return value
@@ -74,7 +130,7 @@ class Configuration():
 
     def get_feature_flag(self, key: str) -> bool:
         """
-        Retrieves the feature flag from Azure App Configuration.
+        Retrieves the feature flag from the configuration snapshot.
         If the value is not found, returns false.
         Otherwise, retrieves the enabled value of the feature flag.
 
@@ -82,21 +138,22 @@ class Configuration():
         ----------
         - key : str
             The key name of the feature flag to retrieve.
-        
+
         Returns
         -------
         The enabled value of the feature flag
-        
+
         """
         if key is None:
             raise KeyError('The key parameter is required for Configuration.get_feature_flag().')
 
         value = False
 
-        if "FeatureManagementFeatureFlags" in self.__config.keys():
-            if key in self.__config["FeatureManagementFeatureFlags"].keys():
+        snapshot = self.__snapshot
+        if "FeatureManagementFeatureFlags" in snapshot.keys():
+            if key in snapshot["FeatureManagementFeatureFlags"].keys():
                 try:
-                    feature_flag_setting = self.__config["FeatureManagementFeatureFlags"][key]
+                    feature_flag_setting = snapshot["FeatureManagementFeatureFlags"][key]
                     obj = json.loads(feature_flag_setting)
                     value = obj["enabled"]
                 except Exception as e:
@@ -104,29 +161,35 @@ class Configuration():
 
         return value
 
-    def __retry_before_sleep(self, retry_state):
-        # Log the outcome of each retry attempt.
-        message = f"""Retrying {retry_state.fn}:
-                        attempt {retry_state.attempt_number}
-                        ended with: {retry_state.outcome}"""
-        if retry_state.outcome.failed:
-            ex = retry_state.outcome.exception()
-            message += f"; Exception: {ex.__class__.__name__}: {ex}"
-        if retry_state.attempt_number < 1:
-            logging.info(message)
+    def refresh(self, wait: bool = False):
+        """
+        Reloads the settings and swaps in the new snapshot.
+
+        Parameters
+        ----------
+        wait : bool
+            When False, the reload is handed to the background refresher and the call returns
+            immediately. When True, the settings are reloaded before the call returns.
+        """
+        if wait:
+            self.__refresh()
         else:
-            logging.warning(message)
-
-    # Retry with jitter on transient errors. Initially up to 2^x * 1 seconds between each retry
-    # until the range reaches 30 seconds, then randomly up to 60 seconds afterwards.
-    # Stop after five retry attempts.
-    @retry(
-        wait=wait_random_exponential(multiplier=1, max=5),
-        stop=stop_after_attempt(5),
-        before_sleep=__retry_before_sleep
-    )
-    def __get_config_with_retry(self, name):
-        try:
-            return self.__config[name]
-        except RetryError:
-            pass
+            self.__refresh_requested.set()
+
+    def __refresh(self):
+        """
+        Reloads the settings for the key prefixes and atomically swaps the snapshot.
+        """
+        self.__snapshot = MappingProxyType(self.__provider.load(self.__key_prefixes))
+
+    def __refresh_loop(self):
+        """
+        Refreshes the snapshot when a refresh is requested or the refresh interval elapses.
+        """
+        while True:
+            self.__refresh_requested.wait(self.__refresh_seconds or None)
+            self.__refresh_requested.clear()
+            try:
+                self.__refresh()
+            except Exception as e:
+                logging.warning(f'Failed to refresh the configuration snapshot: {e}')
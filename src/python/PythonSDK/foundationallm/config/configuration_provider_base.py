@@ -0,0 +1,79 @@
+"""
+Contains the base class for the providers that supply the settings
+held in the Configuration snapshot.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Mapping
+
+class ConfigurationProviderBase(ABC):
+    """
+    Base class for the providers that load configuration settings.
+    """
+    FEATURE_FLAGS_KEY = 'FeatureManagementFeatureFlags'
+
+    @abstractmethod
+    def load(self, key_prefixes: List[str] = None) -> Dict[str, Any]:
+        """
+        Loads the configuration settings made available by the provider.
+
+        Parameters
+        ----------
+        key_prefixes : List[str]
+            Key filters such as 'FoundationaLLM:APIEndpoints:*' restricting the settings
+            that are loaded. All the settings are loaded when None.
+
+        Returns
+        -------
+        A dictionary of configuration keys and values.
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def matches(key: str, key_prefixes: Iterable[str] = None) -> bool:
+        """
+        Determines whether a key is selected by the key filters, using the Azure App
+        Configuration convention where a trailing '*' matches any key starting with the filter.
+
+        Parameters
+        ----------
+        key : str
+            The configuration key.
+        key_prefixes : Iterable[str]
+            The key filters. Every key matches when None.
+
+        Returns
+        -------
+        True if the key matches at least one of the filters, otherwise False.
+        """
+        if not key_prefixes:
+            return True
+        for key_prefix in key_prefixes:
+            if key_prefix.endswith('*'):
+                if key.startswith(key_prefix[:-1]):
+                    return True
+            elif key == key_prefix:
+                return True
+        return False
+
+    @classmethod
+    def select(cls, settings: Mapping[str, Any], key_prefixes: Iterable[str] = None) \
+            -> Dict[str, Any]:
+        """
+        Returns the settings whose keys match the key filters.
+        The feature flags are always selected.
+
+        Parameters
+        ----------
+        settings : Mapping[str, Any]
+            The configuration keys and values.
+        key_prefixes : Iterable[str]
+            The key filters. Every setting is selected when None.
+
+        Returns
+        -------
+        A dictionary of the selected configuration keys and values.
+        """
+        return {
+            key: value for key, value in settings.items()
+            if key == cls.FEATURE_FLAGS_KEY or cls.matches(key, key_prefixes)
+        }
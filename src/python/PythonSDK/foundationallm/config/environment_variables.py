@@ -12,3 +12,62 @@ The build version of the container. This is also used for the app version used
 to validate the minimum version of the app required to use certain configuration entries.
 """
 FOUNDATIONALLM_VERSION = "FOUNDATIONALLM_VERSION"
+
+"""
+The Azure App Configuration endpoint from which configuration settings are loaded.
+"""
+FOUNDATIONALLM_APP_CONFIGURATION_URI = "FOUNDATIONALLM_APP_CONFIGURATION_URI"
+
+"""
+The number of seconds between background refreshes of the configuration snapshot.
+Set to 0 (the default) to refresh only when explicitly requested.
+"""
+FOUNDATIONALLM_CONFIGURATION_REFRESH_SECONDS = "FOUNDATIONALLM_CONFIGURATION_REFRESH_SECONDS"
+
+"""
+The provider from which configuration settings are loaded: appconfiguration (default),
+file (a JSON, YAML or .env file, overridden by the environment variables) or memory
+(environment variables). local selects file when FOUNDATIONALLM_CONFIGURATION_FILE is set
+and memory otherwise. The Python SDK and the Integration SDK accept the same providers.
+"""
+FOUNDATIONALLM_CONFIGURATION_PROVIDER = "FOUNDATIONALLM_CONFIGURATION_PROVIDER"
+
+"""
+The path of the configuration file used by the file configuration provider.
+"""
+FOUNDATIONALLM_CONFIGURATION_FILE = "FOUNDATIONALLM_CONFIGURATION_FILE"
+
+"""
+The number of completion jobs of each agent type that may run at the same time,
+as a comma-separated list of agent-type=count pairs (knowledge-management=8,audio-classification=2).
+"""
+FOUNDATIONALLM_COMPLETION_JOB_CONCURRENCY = "FOUNDATIONALLM_COMPLETION_JOB_CONCURRENCY"
+
+"""
+The number of concurrent completion jobs of the agent types not listed in
+FOUNDATIONALLM_COMPLETION_JOB_CONCURRENCY.
+"""
+FOUNDATIONALLM_COMPLETION_JOB_DEFAULT_CONCURRENCY = "FOUNDATIONALLM_COMPLETION_JOB_DEFAULT_CONCURRENCY"
+
+"""
+The maximum number of completion jobs waiting to run before new requests are rejected.
+"""
+FOUNDATIONALLM_COMPLETION_JOB_QUEUE_DEPTH = "FOUNDATIONALLM_COMPLETION_JOB_QUEUE_DEPTH"
+
+"""
+The maximum number of query embeddings kept in memory by the Gateway text embedding cache.
+0 disables the cache.
+"""
+FOUNDATIONALLM_EMBEDDING_CACHE_SIZE = "FOUNDATIONALLM_EMBEDDING_CACHE_SIZE"
+
+"""
+The directory where the Gateway text embedding cache stores its memory-mapped vector files.
+The on-disk tier of the cache is disabled when not set. The processes sharing the directory
+write to separate files.
+"""
+FOUNDATIONALLM_EMBEDDING_CACHE_PATH = "FOUNDATIONALLM_EMBEDDING_CACHE_PATH"
+
+"""
+The maximum number of query embeddings of each embedding model kept on disk by the Gateway text embedding cache.
+"""
+FOUNDATIONALLM_EMBEDDING_CACHE_DISK_CAPACITY = "FOUNDATIONALLM_EMBEDDING_CACHE_DISK_CAPACITY"
@@ -1,14 +1,18 @@
 from abc import abstractmethod
-from typing import List
-from azure.identity import DefaultAzureCredential, get_bearer_token_provider
+from typing import Awaitable, Callable, List
 
 from langchain_core.language_models import BaseLanguageModel
-from langchain_openai import AzureChatOpenAI, AzureOpenAI, ChatOpenAI, OpenAI
+from langchain_openai import AzureChatOpenAI, ChatOpenAI, OpenAI
 from openai import AzureOpenAI as aoi
 from openai import AsyncAzureOpenAI as async_aoi
+from openai import OpenAI as openai_client
+from openai import AsyncOpenAI as async_openai_client
+from foundationallm.authentication import AzureCredentialCache
 from foundationallm.config import Configuration, UserIdentity
 from foundationallm.langchain.exceptions import LangChainException
+from foundationallm.langchain.language_models import LanguageModelClientRegistry
 from foundationallm.models.orchestration import OperationTypes
+from foundationallm.models.utils import ResourceObjectCache
 from foundationallm.models.authentication import AuthenticationTypes
 from foundationallm.models.language_models import LanguageModelProvider
 from foundationallm.models.orchestration import (
@@ -62,7 +66,10 @@ class LangChainAgentBase():
         raise NotImplementedError()
 
     @abstractmethod
-    async def ainvoke(self, request: CompletionRequestBase) -> CompletionResponse:
+    async def ainvoke(
+        self,
+        request: CompletionRequestBase,
+        on_token: Callable[[str], Awaitable[None]] = None) -> CompletionResponse:
         """
         Gets the completion for the request using an async request.
         
@@ -70,6 +77,8 @@ class LangChainAgentBase():
         ----------
         request : CompletionRequestBase
             The completion request to execute.
+        on_token : Callable[[str], Awaitable[None]]
+            Optional callback awaited with each completion token as it is generated.
 
         Returns
         -------
@@ -100,7 +109,7 @@ class LangChainAgentBase():
             raise LangChainException("Invalid prompt object id.", 400)
         
         try:
-            prompt = MultipartPrompt(**objects.get(prompt_object_id))
+            prompt = ResourceObjectCache.get_or_create(MultipartPrompt, objects.get(prompt_object_id))
         except Exception as e:
             raise LangChainException(f"The prompt object provided in the request.objects dictionary is invalid. {str(e)}", 400)
         
@@ -119,7 +128,7 @@ class LangChainAgentBase():
             raise LangChainException("Invalid AI model object id.", 400)
         
         try:
-            ai_model = AIModelBase(**objects.get(ai_model_object_id))
+            ai_model = ResourceObjectCache.get_or_create(AIModelBase, objects.get(ai_model_object_id))
         except Exception as e:
             raise LangChainException(f"The AI model object provided in the request.objects dictionary is invalid. {str(e)}", 400)
         
@@ -138,7 +147,7 @@ class LangChainAgentBase():
             raise LangChainException("Invalid API endpoint object id.", 400)
         
         try:
-            api_endpoint = APIEndpointConfiguration(**objects.get(api_endpoint_object_id))
+            api_endpoint = ResourceObjectCache.get_or_create(APIEndpointConfiguration, objects.get(api_endpoint_object_id))
         except Exception as e:
             raise LangChainException(f"The API endpoint object provided in the request.objects dictionary is invalid. {str(e)}", 400)
         
@@ -205,11 +214,21 @@ class LangChainAgentBase():
         self.full_prompt = prompt
         return prompt
 
-    def _get_language_model(self, override_operation_type: OperationTypes = None, is_async: bool=False) -> BaseLanguageModel:
+    def _get_language_model(
+        self,
+        override_operation_type: OperationTypes = None,
+        is_async: bool=False,
+        streaming: bool=False) -> BaseLanguageModel:
         """
         Create a language model using the specified endpoint settings.
 
+        The OpenAI clients, and their connection pools, are shared through the
+        LanguageModelClientRegistry. Only the lightweight LangChain wrapper is created
+        for each request, so the model parameters of the request never leak into
+        other requests.
+
         override_operation_type : OperationTypes - internally override the operation type for the API endpoint.
+        streaming : bool - True when the model is streamed, so the token usage is reported with the stream.
 
         Returns
         -------
@@ -231,41 +250,11 @@ class LangChainAgentBase():
             if self.api_endpoint.authentication_type == AuthenticationTypes.AZURE_IDENTITY:
                 try:
                     scope = self.api_endpoint.authentication_parameters.get('scope', 'https://cognitiveservices.azure.com/.default')
-                    # Set up a Azure AD token provider.
-                    # TODO: Determine if there is a more efficient way to get the token provider than making the request for every call.
-                    token_provider = get_bearer_token_provider(
-                        DefaultAzureCredential(exclude_environment_credential=True),
-                        scope
-                    )
-                    
-                    if op_type == OperationTypes.CHAT:
-                        language_model = AzureChatOpenAI(
-                            azure_endpoint=self.api_endpoint.url,
-                            api_version=self.api_endpoint.api_version,
-                            openai_api_type='azure_ad',
-                            azure_ad_token_provider=token_provider,
-                            azure_deployment=self.ai_model.deployment_name
-                        )
-                    elif op_type == OperationTypes.ASSISTANTS_API or op_type == OperationTypes.IMAGE_ANALYSIS:
-                        # Assistants API clients can't have deployment as that is assigned at the assistant level.
-                        if is_async:
-                            # create async client
-                            language_model = async_aoi(
-                                azure_endpoint=self.api_endpoint.url,
-                                api_version=self.api_endpoint.api_version,
-                                openai_api_type='azure_ad',
-                                azure_ad_token_provider=token_provider,
-                            )
-                        else:
-                            language_model = aoi(
-                                azure_endpoint=self.api_endpoint.url,
-                                api_version=self.api_endpoint.api_version,
-                                openai_api_type='azure_ad',
-                                azure_ad_token_provider=token_provider,
-                            )
-                    else:
-                        raise LangChainException(f"Unsupported operation type: {op_type}", 400)
-
+                    # Use the shared Azure AD token provider, which caches the tokens for the scope.
+                    client_credentials = {
+                        'azure_ad_token_provider': AzureCredentialCache.get_bearer_token_provider(scope)
+                    }
+                    credential_fingerprint = scope
                 except Exception as e:
                     raise LangChainException(f"Failed to create Azure OpenAI API connector: {str(e)}", 500)
             else: # Key-based authentication
@@ -276,31 +265,46 @@ class LangChainAgentBase():
 
                 if api_key is None:
                     raise LangChainException("API key is missing from the configuration settings.", 400)
-                        
+                client_credentials = { 'api_key': api_key }
+                credential_fingerprint = LanguageModelClientRegistry.get_credential_fingerprint(api_key)
+
+            client_settings = {
+                'azure_endpoint': self.api_endpoint.url,
+                'api_version': self.api_endpoint.api_version,
+                **client_credentials
+            }
+
+            try:
                 if op_type == OperationTypes.CHAT:
+                    client, async_client = LanguageModelClientRegistry.get_or_create(
+                        self.__get_client_key(op_type, self.ai_model.deployment_name, credential_fingerprint),
+                        lambda: (
+                            aoi(azure_deployment=self.ai_model.deployment_name, **client_settings),
+                            async_aoi(azure_deployment=self.ai_model.deployment_name, **client_settings)
+                        )
+                    )
                     language_model = AzureChatOpenAI(
                         azure_endpoint=self.api_endpoint.url,
-                        api_key=api_key,
                         api_version=self.api_endpoint.api_version,
-                        azure_deployment=self.ai_model.deployment_name
+                        azure_deployment=self.ai_model.deployment_name,
+                        client=client.chat.completions,
+                        async_client=async_client.chat.completions,
+                        **client_credentials
                     )
                 elif op_type == OperationTypes.ASSISTANTS_API or op_type == OperationTypes.IMAGE_ANALYSIS:
                     # Assistants API clients can't have deployment as that is assigned at the assistant level.
-                    if is_async:
-                        # create async client
-                        language_model = async_aoi(
-                            azure_endpoint=self.api_endpoint.url,
-                            api_key=api_key,
-                            api_version=self.api_endpoint.api_version,
-                        )
-                    else:
-                        language_model = aoi(
-                            azure_endpoint=self.api_endpoint.url,
-                            api_key=api_key,
-                            api_version=self.api_endpoint.api_version,
-                        )
+                    language_model = LanguageModelClientRegistry.get_or_create(
+                        self.__get_client_key(op_type, None, credential_fingerprint, is_async),
+                        lambda: async_aoi(**client_settings) if is_async else aoi(**client_settings)
+                    )
+                    # The raw clients are shared, so the model parameters are not applied to them.
+                    return language_model
                 else:
                     raise LangChainException(f"Unsupported operation type: {op_type}", 400)
+            except LangChainException:
+                raise
+            except Exception as e:
+                raise LangChainException(f"Failed to create Azure OpenAI API connector: {str(e)}", 500)
 
         else:
             try:
@@ -310,11 +314,30 @@ class LangChainAgentBase():
 
             if api_key is None:
                 raise LangChainException("API key is missing from the configuration settings.", 400)
-                
+
+            client, async_client = LanguageModelClientRegistry.get_or_create(
+                self.__get_client_key(
+                    self.api_endpoint.operation_type,
+                    None,
+                    LanguageModelClientRegistry.get_credential_fingerprint(api_key)),
+                lambda: (
+                    openai_client(base_url=self.api_endpoint.url, api_key=api_key),
+                    async_openai_client(base_url=self.api_endpoint.url, api_key=api_key)
+                )
+            )
             language_model = (
-                ChatOpenAI(base_url=self.api_endpoint.url, api_key=api_key)
+                ChatOpenAI(
+                    base_url=self.api_endpoint.url,
+                    api_key=api_key,
+                    client=client.chat.completions,
+                    async_client=async_client.chat.completions,
+                    stream_usage=True)
                 if self.api_endpoint.operation_type == OperationTypes.CHAT
-                else OpenAI(base_url=self.api_endpoint.url, api_key=api_key)
+                else OpenAI(
+                    base_url=self.api_endpoint.url,
+                    api_key=api_key,
+                    client=client.completions,
+                    async_client=async_client.completions)
             )
 
         # Set model parameters.
@@ -322,4 +345,30 @@ class LangChainAgentBase():
             if hasattr(language_model, key):
                 setattr(language_model, key, value)
 
+        if streaming and isinstance(language_model, AzureChatOpenAI):
+            # AzureChatOpenAI has no stream_usage setting in langchain-openai 0.1.20, so the
+            # usage chunk is requested from the streamed calls. Without it, streamed completions
+            # report no token usage.
+            language_model = language_model.bind(stream_options={'include_usage': True})
+
         return language_model
+
+    def __get_client_key(
+        self,
+        operation_type: str,
+        deployment_name: str,
+        credential_fingerprint: str,
+        is_async: bool = None) -> tuple:
+        """
+        Returns the key of the endpoint clients in the LanguageModelClientRegistry.
+        """
+        return (
+            self.api_endpoint.provider,
+            self.api_endpoint.url,
+            self.api_endpoint.api_version,
+            deployment_name,
+            self.api_endpoint.authentication_type,
+            operation_type,
+            is_async,
+            credential_fingerprint
+        )
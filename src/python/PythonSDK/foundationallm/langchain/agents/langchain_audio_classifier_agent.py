@@ -1,10 +1,11 @@
-﻿from langchain_community.callbacks import get_openai_callback
+﻿from typing import Awaitable, Callable
+from langchain_community.callbacks import get_openai_callback
 from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import RunnablePassthrough, RunnableLambda
 from langchain_core.output_parsers import StrOutputParser
 from foundationallm.langchain.agents import LangChainAgentBase
 from foundationallm.langchain.exceptions import LangChainException
-from foundationallm.langchain.retrievers import RetrieverFactory, CitationRetrievalBase
+from foundationallm.langchain.retrievers import RetrieverFactory
 from foundationallm.models.orchestration import (
     CompletionResponse
 )
@@ -292,8 +293,10 @@ class LangChainAudioClassifierAgent(LangChainAgentBase):
                     agent.conversation_history_settings
                 )
 
+                retrieval = None
                 if retriever is not None:
-                    chain_context = { "context": retriever | retriever.format_docs, "question": RunnablePassthrough() }
+                    retrieval = retriever.retrieve(request.user_prompt)
+                    chain_context = { "context": lambda x: retriever.format_docs(retrieval.documents), "question": RunnablePassthrough() }
                 else:
                     chain_context = { "context": RunnablePassthrough() }
 
@@ -308,8 +311,8 @@ class LangChainAudioClassifierAgent(LangChainAgentBase):
 
                 completion = chain.invoke(request.user_prompt)
                 citations = []
-                if isinstance(retriever, CitationRetrievalBase):
-                    citations = retriever.get_document_citations()
+                if retrieval is not None:
+                    citations = retrieval.citations
 
                 return CompletionResponse(
                     operation_id = request.operation_id,
@@ -325,7 +328,10 @@ class LangChainAudioClassifierAgent(LangChainAgentBase):
             except Exception as e:
                 raise LangChainException(f"An unexpected exception occurred when executing the completion request: {str(e)}", 500)
 
-    async def ainvoke(self, request: KnowledgeManagementCompletionRequest) -> CompletionResponse:
+    async def ainvoke(
+        self,
+        request: KnowledgeManagementCompletionRequest,
+        on_token: Callable[[str], Awaitable[None]] = None) -> CompletionResponse:
         """
         Executes an async completion request.
         If a vector index exists, it will be queryied with the user prompt.
@@ -334,6 +340,8 @@ class LangChainAudioClassifierAgent(LangChainAgentBase):
         ----------
         request : KnowledgeManagementCompletionRequest
             The completion request to execute.
+        on_token : Callable[[str], Awaitable[None]]
+            Not used; audio classification results are not streamed.
 
         Returns
         -------
@@ -357,8 +365,10 @@ class LangChainAudioClassifierAgent(LangChainAgentBase):
                     agent.conversation_history_settings
                 )
 
+                retrieval = None
                 if retriever is not None:
-                    chain_context = { "context": retriever | retriever.format_docs, "question": RunnablePassthrough() }
+                    retrieval = retriever.retrieve(request.user_prompt)
+                    chain_context = { "context": lambda x: retriever.format_docs(retrieval.documents), "question": RunnablePassthrough() }
                 else:
                     chain_context = { "context": RunnablePassthrough() }
 
@@ -376,8 +386,8 @@ class LangChainAudioClassifierAgent(LangChainAgentBase):
                 completion = chain.invoke(request.user_prompt)
 
                 citations = []
-                if isinstance(retriever, CitationRetrievalBase):
-                    citations = retriever.get_document_citations()
+                if retrieval is not None:
+                    citations = retrieval.citations
 
                 return CompletionResponse(
                     operation_id = request.operation_id,
@@ -1,11 +1,15 @@
-﻿from langchain_community.callbacks import get_openai_callback
+﻿from collections import OrderedDict
+from operator import itemgetter
+import threading
+from typing import Awaitable, Callable
+from langchain_community.callbacks import get_openai_callback
 from langchain_core.prompts import PromptTemplate
-from langchain_core.runnables import RunnablePassthrough, RunnableLambda
+from langchain_core.runnables import Runnable, RunnableLambda, RunnableParallel, RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
 from foundationallm.config import UserIdentity
 from foundationallm.langchain.agents import LangChainAgentBase
 from foundationallm.langchain.exceptions import LangChainException
-from foundationallm.langchain.retrievers import RetrieverFactory, CitationRetrievalBase
+from foundationallm.langchain.retrievers import RetrieverFactory, RetrievalResult
 from foundationallm.models.constants import AgentCapabilityCategories
 from foundationallm.models.orchestration import (
     CompletionRequestObjectKeys,
@@ -30,6 +34,7 @@ from foundationallm.models.resource_providers.vectorization import (
     AzureOpenAIEmbeddingProfile
 )
 from foundationallm.models.services import OpenAIAssistantsAPIRequest
+from foundationallm.models.utils import ResourceObjectCache
 from foundationallm.services import ImageAnalysisService, OpenAIAssistantsApiService
 from foundationallm.services.gateway_text_embedding import GatewayTextEmbeddingService
 from openai.types import CompletionUsage
@@ -37,7 +42,16 @@ from openai.types import CompletionUsage
 class LangChainKnowledgeManagementAgent(LangChainAgentBase):
     """
     The LangChain Knowledge Management agent.
+
+    The LCEL chains of the agents are compiled once for each agent prompt and shared by
+    the requests. The message history, question, context, retriever and language model of
+    a request are passed to the chain as inputs, so cached chains hold no client.
     """
+    # The maximum number of compiled chains kept in memory.
+    MAX_CACHED_CHAINS = 128
+
+    __chains: OrderedDict[tuple, Runnable] = OrderedDict()
+    __chains_lock = threading.Lock()
 
     def _get_document_retriever(
         self,
@@ -97,12 +111,9 @@ class LangChainKnowledgeManagementAgent(LangChainAgentBase):
                 retriever = retriever_factory.get_retriever()
         return retriever
 
-    def _get_prompt_template(
-        self,
-        request: KnowledgeManagementCompletionRequest,
-        conversation_history: AgentConversationHistorySettings) -> PromptTemplate:
+    def _get_prompt_template(self, include_question: bool) -> PromptTemplate:
         """
-        Build a prompt template.
+        Build a prompt template with history, context and, optionally, question input variables.
         """
         prompt_builder = ''
 
@@ -110,27 +121,145 @@ class LangChainKnowledgeManagementAgent(LangChainAgentBase):
         if self.prompt.prefix is not None:
             prompt_builder = f'{self.prompt.prefix}\n\n'
 
-        # Add the message history, if it exists.
-        if conversation_history is not None and conversation_history.enabled:
-            prompt_builder += self._build_conversation_history(
-                request.message_history,
-                conversation_history.max_history)
-
-        # Insert the context into the template.
-        prompt_builder += '{context}'
+        # Insert the message history and the context into the template.
+        prompt_builder += '{history}{context}'
 
         # Add the suffix, if it exists.
         if self.prompt.suffix is not None:
             prompt_builder += f'\n\n{self.prompt.suffix}'
 
-        image_attachments = [attachment for attachment in request.attachments if (attachment.provider == AttachmentProviders.FOUNDATIONALLM_ATTACHMENT and attachment.content_type.startswith('image/'))] if request.attachments is not None else []
-        if self.has_retriever or len(image_attachments) > 0:
+        if include_question:
             # Insert the user prompt into the template.
             prompt_builder += "\n\nQuestion: {question}"
 
         # Create the prompt template.
         return PromptTemplate.from_template(prompt_builder)
 
+    def _get_conversation_history(
+        self,
+        request: KnowledgeManagementCompletionRequest,
+        conversation_history: AgentConversationHistorySettings) -> str:
+        """
+        Builds the message history input of the chain, if the message history is enabled.
+        """
+        if conversation_history is not None and conversation_history.enabled:
+            return self._build_conversation_history(
+                request.message_history,
+                conversation_history.max_history)
+        return ''
+
+    @staticmethod
+    def __retrieve(inputs: dict) -> RetrievalResult:
+        """
+        Retrieves the documents and citations for the question.
+        """
+        return inputs['retriever'].retrieve(inputs['question'])
+
+    @staticmethod
+    async def __aretrieve(inputs: dict) -> RetrievalResult:
+        """
+        Retrieves the documents and citations for the question.
+        """
+        return await inputs['retriever'].aretrieve(inputs['question'])
+
+    def _get_chain(
+        self,
+        request: KnowledgeManagementCompletionRequest,
+        include_retriever: bool,
+        include_question: bool) -> Runnable:
+        """
+        Returns the compiled LCEL chain of the agent, building it on first use.
+
+        The chain expects history, question, language_model and either retriever or context inputs,
+        and returns a dictionary with the full_prompt, the completion and the retrieval result, if any.
+        Chains are cached by agent and by the hash of the prompt object, so a new version of the
+        prompt compiles a new chain. The language model is bound per request, so the chain does not
+        depend on the lifetime of the model clients.
+
+        Parameters
+        ----------
+        request : KnowledgeManagementCompletionRequest
+            The completion request, which must have been validated.
+        include_retriever : bool
+            True to retrieve the context with the retriever input.
+        include_question : bool
+            True to add the question to the prompt.
+
+        Returns
+        -------
+        Runnable
+            The compiled chain.
+        """
+        key = (
+            request.agent.object_id or request.agent.name,
+            include_retriever,
+            include_question,
+            ResourceObjectCache.get_content_hash(request.objects.get(request.agent.prompt_object_id))
+        )
+        with self.__chains_lock:
+            chain = self.__chains.get(key)
+            if chain is not None:
+                self.__chains.move_to_end(key)
+                return chain
+
+        chain = (
+            # The language model input is passed through as is, since a runnable
+            # returned by a step would be invoked with the step inputs.
+            RunnablePassthrough.assign(
+                prompt = self._get_prompt_template(include_question),
+                retrieval = RunnableLambda(lambda inputs: inputs.get('retrieval'))
+            )
+            | RunnableParallel(
+                full_prompt = itemgetter('prompt'),
+                # The returned runnable is invoked, and streamed, with the same inputs.
+                completion = RunnableLambda(lambda inputs: itemgetter('prompt') | inputs['language_model'])
+                    | StrOutputParser(),
+                retrieval = itemgetter('retrieval')
+            )
+        )
+        if include_retriever:
+            # The retrieval result of each request flows through the chain, so the
+            # retriever holds no state and the citations are returned with the completion.
+            chain = (
+                RunnablePassthrough.assign(
+                    retrieval = RunnableLambda(self.__retrieve, afunc=self.__aretrieve)
+                )
+                | RunnablePassthrough.assign(
+                    context = lambda inputs: inputs['retriever'].format_docs(inputs['retrieval'].documents)
+                )
+                | chain
+            )
+
+        with self.__chains_lock:
+            self.__chains[key] = chain
+            self.__chains.move_to_end(key)
+            while len(self.__chains) > self.MAX_CACHED_CHAINS:
+                self.__chains.popitem(last=False)
+        return chain
+
+    def _get_chain_inputs(
+        self,
+        request: KnowledgeManagementCompletionRequest,
+        retriever,
+        image_analysis_context: str = None,
+        streaming: bool = False) -> dict:
+        """
+        Builds the request-specific inputs of the compiled chain.
+        The language model reports its token usage when the chain is streamed.
+        """
+        inputs = {
+            'history': self._get_conversation_history(request, request.agent.conversation_history_settings),
+            'question': request.user_prompt,
+            'language_model': self._get_language_model(streaming=streaming)
+        }
+        if retriever is not None:
+            inputs['retriever'] = retriever
+        elif image_analysis_context is not None:
+            inputs['context'] = image_analysis_context
+        else:
+            inputs['context'] = request.user_prompt
+        return inputs
+
     def _validate_conversation_history(self, conversation_history_settings: AgentConversationHistorySettings):
         """
         Validates that the agent contains all required properties.
@@ -320,37 +449,30 @@ class LangChainKnowledgeManagementAgent(LangChainAgentBase):
                 retriever = self._get_document_retriever(request, agent)
                 if retriever is not None:
                     self.has_retriever = True
-                # Get the prompt template.
-                prompt_template = self._get_prompt_template(
+                # Get the compiled LCEL chain and the inputs of the request.
+                chain = self._get_chain(
                     request,
-                    agent.conversation_history_settings
+                    include_retriever = retriever is not None,
+                    include_question = retriever is not None or len(image_attachments) > 0
                 )
-
-                if retriever is not None:
-                    chain_context = { "context": retriever | retriever.format_docs, "question": RunnablePassthrough() }
-                elif image_analysis_results is not None:
-                    chain_context = { "context": lambda x: image_analysis_svc.format_results(image_analysis_results), "question": RunnablePassthrough() }
-                else:
-                    chain_context = { "context": RunnablePassthrough() }
-
-                # Compose LCEL chain
-                chain = (
-                    chain_context
-                    | prompt_template
-                    | RunnableLambda(self._record_full_prompt)
-                    | self._get_language_model()
-                    | StrOutputParser()
+                inputs = self._get_chain_inputs(
+                    request,
+                    retriever,
+                    image_analysis_svc.format_results(image_analysis_results) if image_analysis_results is not None else None
                 )
 
-                completion = chain.invoke(request.user_prompt)
+                result = chain.invoke(inputs)
+                completion = result['completion']
+                self.full_prompt = result['full_prompt']
+                retrieval = result['retrieval']
                 response_content = OpenAITextMessageContentItem(
                     value = completion,
                     agent_capability_category = AgentCapabilityCategories.FOUNDATIONALLM_KNOWLEDGE_MANAGEMENT
                 )
 
                 citations = []
-                if isinstance(retriever, CitationRetrievalBase):
-                    citations = retriever.get_document_citations()
+                if retrieval is not None:
+                    citations = retrieval.citations
 
                 return CompletionResponse(
                     operation_id = request.operation_id,
@@ -366,7 +488,10 @@ class LangChainKnowledgeManagementAgent(LangChainAgentBase):
             except Exception as e:
                 raise LangChainException(f"An unexpected exception occurred when executing the completion request: {str(e)}", 500)
 
-    async def ainvoke(self, request: KnowledgeManagementCompletionRequest) -> CompletionResponse:
+    async def ainvoke(
+        self,
+        request: KnowledgeManagementCompletionRequest,
+        on_token: Callable[[str], Awaitable[None]] = None) -> CompletionResponse:
         """
         Executes an async completion request.
         If a vector index exists, it will be queryied with the user prompt.
@@ -375,6 +500,8 @@ class LangChainKnowledgeManagementAgent(LangChainAgentBase):
         ----------
         request : KnowledgeManagementCompletionRequest
             The completion request to execute.
+        on_token : Callable[[str], Awaitable[None]]
+            Optional callback awaited with each completion token as it is generated.
 
         Returns
         -------
@@ -450,33 +577,39 @@ class LangChainKnowledgeManagementAgent(LangChainAgentBase):
                 retriever = self._get_document_retriever(request, agent)
                 if retriever is not None:
                     self.has_retriever = True
-                # Get the prompt template.
-                prompt_template = self._get_prompt_template(
+                # Get the compiled LCEL chain and the inputs of the request.
+                chain = self._get_chain(
                     request,
-                    agent.conversation_history_settings
+                    include_retriever = retriever is not None,
+                    include_question = retriever is not None or len(image_attachments) > 0
                 )
-
-                if retriever is not None:
-                    chain_context = { "context": retriever | retriever.format_docs, "question": RunnablePassthrough() }
-                elif image_analysis_results is not None:
-                    chain_context = { "context": lambda x: image_analysis_svc.format_results(image_analysis_results), "question": RunnablePassthrough() }
-                else:
-                    chain_context = { "context": RunnablePassthrough() }
-
-                # Compose LCEL chain
-                chain = (
-                    chain_context
-                    | prompt_template
-                    | RunnableLambda(self._record_full_prompt)
-                    | self._get_language_model()
-                    | StrOutputParser()
+                inputs = self._get_chain_inputs(
+                    request,
+                    retriever,
+                    image_analysis_svc.format_results(image_analysis_results) if image_analysis_results is not None else None,
+                    streaming = on_token is not None
                 )
 
-                # ainvoke isn't working if search is involved in the completion request. Need to dive deeper into how to get this working.
-                if self.has_retriever:
-                    completion = chain.invoke(request.user_prompt)
+                # The retriever searches asynchronously, so requests with a retriever do not block the event loop.
+                if on_token is not None:
+                    # Stream the tokens produced by the StrOutputParser as they are generated.
+                    tokens = []
+                    retrieval = None
+                    async for chunk in chain.astream(inputs):
+                        if 'full_prompt' in chunk:
+                            self.full_prompt = chunk['full_prompt']
+                        if chunk.get('retrieval') is not None:
+                            retrieval = chunk['retrieval']
+                        token = chunk.get('completion')
+                        if token:
+                            tokens.append(token)
+                            await on_token(token)
+                    completion = ''.join(tokens)
                 else:
-                    completion = await chain.ainvoke(request.user_prompt)
+                    result = await chain.ainvoke(inputs)
+                    completion = result['completion']
+                    self.full_prompt = result['full_prompt']
+                    retrieval = result['retrieval']
 
                 response_content = OpenAITextMessageContentItem(
                     value = completion,
@@ -484,8 +617,8 @@ class LangChainKnowledgeManagementAgent(LangChainAgentBase):
                 )
 
                 citations = []
-                if isinstance(retriever, CitationRetrievalBase):
-                    citations = retriever.get_document_citations()
+                if retrieval is not None:
+                    citations = retrieval.citations
 
                 return CompletionResponse(
                     operation_id = request.operation_id,
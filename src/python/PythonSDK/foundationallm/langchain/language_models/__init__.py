@@ -1,2 +1,3 @@
 """Language model module"""
 from .language_model_base import LanguageModelBase
+from .language_model_client_registry import LanguageModelClientRegistry
@@ -0,0 +1,150 @@
+import asyncio
+import hashlib
+import inspect
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List
+
+class LanguageModelClientRegistry:
+    """
+    Process-wide registry of the clients used to call language model endpoints.
+
+    Every OpenAI client owns an HTTP connection pool, so creating one per request pays
+    for new connections and TLS handshakes on every completion. Clients are created once
+    for each endpoint, API version, deployment, authentication and operation type, and
+    shared by every request. The least recently used clients are dropped once the registry
+    is full, without being closed since requests in flight may still use them, and the
+    remaining clients are closed on shutdown.
+    """
+    # The maximum number of endpoint clients kept open.
+    MAX_CLIENTS = 32
+
+    __clients: OrderedDict[Hashable, Any] = OrderedDict()
+    __lock = threading.Lock()
+
+    @staticmethod
+    def get_credential_fingerprint(secret: str) -> str:
+        """
+        Returns a digest that identifies a secret in a registry key without retaining it.
+
+        Parameters
+        ----------
+        secret : str
+            The API key, or other secret, used by a client.
+
+        Returns
+        -------
+        str
+            The SHA-256 digest of the secret.
+        """
+        return hashlib.sha256(secret.encode('utf-8')).hexdigest() if secret else ''
+
+    @classmethod
+    def get_or_create(cls, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Returns the client registered for the key, creating it on first use.
+
+        Parameters
+        ----------
+        key : Hashable
+            Identifies the endpoint, API version, deployment, authentication and operation type of the client.
+        factory : Callable[[], Any]
+            Creates the client, or a tuple of clients, when none is registered for the key.
+
+        Returns
+        -------
+        Any
+            The client registered for the key.
+        """
+        with cls.__lock:
+            client = cls.__clients.get(key)
+            if client is not None:
+                cls.__clients.move_to_end(key)
+                return client
+
+        # Clients are created outside of the lock so a slow endpoint does not block the others.
+        created = factory()
+        with cls.__lock:
+            client = cls.__clients.get(key)
+            if client is None:
+                client = cls.__clients[key] = created
+                created = None
+            cls.__clients.move_to_end(key)
+            while len(cls.__clients) > cls.MAX_CLIENTS:
+                # Evicted clients may still be used by requests in flight, so they are
+                # not closed. Their connections are released when they are garbage collected.
+                cls.__clients.popitem(last=False)
+        if created is not None:
+            # Another request registered a client for the key first, so this one was never shared.
+            cls.__close([created])
+        return client
+
+    @staticmethod
+    def __flatten(clients: List[Any]) -> List[Any]:
+        """
+        Returns the individual clients of a list of clients and tuples of clients.
+        """
+        flattened = []
+        for client in clients:
+            flattened.extend(client if isinstance(client, tuple) else (client,))
+        return flattened
+
+    @classmethod
+    def __close(cls, clients: List[Any]):
+        """
+        Closes clients that were never shared. Async clients are closed
+        on the running event loop, if any, otherwise they are left to the garbage collector.
+        """
+        for client in cls.__flatten(clients):
+            close = getattr(client, 'close', None)
+            if close is None:
+                continue
+            try:
+                if inspect.iscoroutinefunction(close):
+                    try:
+                        asyncio.get_running_loop().create_task(close())
+                    except RuntimeError:
+                        pass
+                else:
+                    close()
+            except Exception as e:
+                logging.warning(f'Failed to close a language model client: {e}')
+
+    @classmethod
+    def clear(cls) -> List[Any]:
+        """
+        Removes every client from the registry without closing them.
+
+        Returns
+        -------
+        List[Any]
+            The clients that were registered.
+        """
+        with cls.__lock:
+            clients = list(cls.__clients.values())
+            cls.__clients.clear()
+        return clients
+
+    @classmethod
+    async def aclose(cls):
+        """
+        Closes every registered client. Call it on application shutdown.
+        """
+        for client in cls.__flatten(cls.clear()):
+            close = getattr(client, 'close', None)
+            if close is None:
+                continue
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logging.warning(f'Failed to close a language model client: {e}')
+
+    @classmethod
+    def get_client_count(cls) -> int:
+        """
+        Returns the number of registered clients.
+        """
+        return len(cls.__clients)
@@ -1,3 +1,4 @@
+from typing import Awaitable, Callable
 from foundationallm.config import Configuration, UserIdentity
 from foundationallm.langchain.agents import AgentFactory, LangChainAgentBase
 from foundationallm.models.orchestration import (
@@ -56,7 +57,10 @@ class OrchestrationManager:
         """
         return self.agent.invoke(request)
 
-    async def ainvoke(self, request: CompletionRequestBase) -> CompletionResponse:
+    async def ainvoke(
+        self,
+        request: CompletionRequestBase,
+        on_token: Callable[[str], Awaitable[None]] = None) -> CompletionResponse:
         """
         Executes an async completion request against the LanguageModel using 
         the LangChain agent assembled by the OrchestrationManager.
@@ -65,11 +69,13 @@ class OrchestrationManager:
         ----------
         prompt : str
             The prompt for which a completion is being generated.
+        on_token : Callable[[str], Awaitable[None]]
+            Optional callback awaited with each completion token as it is generated.
             
         Returns
         -------
         CompletionResponse
             Object containing the completion response and token usage details.
         """        
-        completion_response = await self.agent.ainvoke(request)
+        completion_response = await self.agent.ainvoke(request, on_token=on_token)
         return completion_response
@@ -1,4 +1,12 @@
+from .retrieval_result import RetrievalResult
 from .citation_retrieval_base import CitationRetrievalBase
+from .rank_fusion import (
+    RankFusionStrategies,
+    RankFusionBase,
+    ReciprocalRankFusion,
+    MinMaxRankFusion,
+    get_rank_fusion
+)
 from .azure_ai_search_service_retriever import AzureAISearchServiceRetriever
 from .search_service_filter_retriever import SearchServiceFilterRetriever
 from .retriever_factory import RetrieverFactory
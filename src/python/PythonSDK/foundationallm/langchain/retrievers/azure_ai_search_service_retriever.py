@@ -2,22 +2,26 @@
 Class: AzureAISearchServiceRetriever
 Description: LangChain retriever for Azure AI Search.
 """
+import asyncio
 import json
-from typing import List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Any
 from langchain_openai import OpenAIEmbeddings
 from langchain_core.callbacks import (
     AsyncCallbackManagerForRetrieverRun,
     CallbackManagerForRetrieverRun,
 )
 from langchain_core.documents import Document
+from langchain_core.pydantic_v1 import Field
 from langchain_core.retrievers import BaseRetriever
 from azure.search.documents import SearchClient
+from azure.search.documents.aio import SearchClient as AsyncSearchClient
 from azure.search.documents.models import VectorizedQuery
-from azure.identity import DefaultAzureCredential
-from foundationallm.models.orchestration import Citation
+from foundationallm.authentication import AzureCredentialCache
 from foundationallm.models.vectors import VectorDocument
 from foundationallm.services.gateway_text_embedding import GatewayTextEmbeddingService
 from .citation_retrieval_base import CitationRetrievalBase
+from .rank_fusion import RankFusionBase, ReciprocalRankFusion
 from foundationallm.models.agents import KnowledgeManagementIndexConfiguration
 
 class AzureAISearchServiceRetriever(BaseRetriever, CitationRetrievalBase):
@@ -29,6 +33,11 @@ class AzureAISearchServiceRetriever(BaseRetriever, CitationRetrievalBase):
             -> List of indexing profiles and associated API endpoint configurations
         gateway_text_embedding_service: GatewayTextEmbeddingService
             -> Service for retrieving text embeddings
+        rank_fusion: RankFusionBase
+            -> Fuses the results of the indexes, reciprocal rank fusion by default
+
+    The retriever keeps no per-query state: retrieve and aretrieve return the documents
+    and citations of each query, so a retriever can be shared by concurrent requests.
 
     Searches embedding and text fields in the index for the top_n most relevant documents.
 
@@ -46,7 +55,7 @@ class AzureAISearchServiceRetriever(BaseRetriever, CitationRetrievalBase):
     config : Any
     index_configurations: List[KnowledgeManagementIndexConfiguration]
     gateway_text_embedding_service: GatewayTextEmbeddingService
-    search_results: Optional[VectorDocument] = [] # Tuple of document id and document
+    rank_fusion: RankFusionBase = Field(default_factory=ReciprocalRankFusion)
 
     def __get_embeddings(self, text: str) -> List[float]:
         """
@@ -55,98 +64,156 @@ class AzureAISearchServiceRetriever(BaseRetriever, CitationRetrievalBase):
         embedding_response = self.gateway_text_embedding_service.get_embedding(text)
         return embedding_response.embedding_vector
 
-    def _get_relevant_documents(
-        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
-    ) -> List[Document]:
+    async def __aget_embeddings(self, text: str) -> List[float]:
         """
-        Performs a synchronous hybrid search on Azure AI Search index
+        Asynchronously returns embeddings vector for a given text.
         """
+        embedding_response = await self.gateway_text_embedding_service.aget_embedding(text)
+        return embedding_response.embedding_vector
 
-        self.search_results.clear()
+    def __get_search_arguments(
+        self,
+        query: str,
+        index_config: KnowledgeManagementIndexConfiguration,
+        embeddings: List[float]) -> dict:
+        """
+        Returns the arguments of the hybrid search of an index.
+        """
+        vector_query = VectorizedQuery(vector=embeddings,
+                                        k_nearest_neighbors=3,
+                                        fields=index_config.indexing_profile.settings.embedding_field_name)
+        return {
+            'search_text': query,
+            'filter': index_config.indexing_profile.settings.filters,
+            'vector_queries': [vector_query],
+            #'query_type': "semantic",
+            #'semantic_configuration_name': "fllm",
+            'top': index_config.indexing_profile.settings.top_n,
+            #'select': [self.id_field_name, self.text_field_name, self.metadata_field_name]
+        }
 
-        #search each indexing profile
-        for index_config in self.index_configurations:
+    def __get_vector_document(self, index_config: KnowledgeManagementIndexConfiguration, result: dict) -> VectorDocument:
+        """
+        Loads a search result into a VectorDocument object for score processing.
+        """
+        metadata = {}
+
+        if index_config.indexing_profile.settings.metadata_field_name in result:
+
+            try:
+                metadata = json.loads(result[index_config.indexing_profile.settings.metadata_field_name]) if index_config.indexing_profile.settings.metadata_field_name in result else {}
+            except Exception as e:
+                metadata = {}
 
-            credential_type = index_config.api_endpoint_configuration.authentication_type
+        document = VectorDocument(
+                id=result[index_config.indexing_profile.settings.id_field_name],
+                page_content=result[index_config.indexing_profile.settings.text_field_name],
+                metadata=metadata,
+                score=result["@search.score"]
+        )
+        document.score = result["@search.score"]
+        return document
+
+    def __get_top_n(self) -> int:
+        """
+        Returns the number of documents to keep from the fused results of all the indexes.
+        """
+        return max(int(index_config.indexing_profile.settings.top_n) for index_config in self.index_configurations)
 
-            credential = None
-            if credential_type == "AzureIdentity":
-                credential = DefaultAzureCredential()
+    def __fuse(self, index_results: List[List[VectorDocument]]) -> List[VectorDocument]:
+        """
+        Fuses the results of the indexes and returns the global top n.
+        """
+        return self.rank_fusion.fuse(
+            index_results,
+            self.__get_top_n(),
+            [float(index_config.indexing_profile.settings.weight or 1) for index_config in self.index_configurations])
+
+    def __search_index(
+        self,
+        query: str,
+        index_config: KnowledgeManagementIndexConfiguration,
+        embeddings: List[float]) -> List[VectorDocument]:
+        """
+        Performs a synchronous hybrid search on an index.
+        """
+        credential_type = index_config.api_endpoint_configuration.authentication_type
 
-            endpoint = index_config.api_endpoint_configuration.url
+        credential = None
+        if credential_type == "AzureIdentity":
+            # Search has always accepted the service principal of the environment credential.
+            credential = AzureCredentialCache.get_credential(exclude_environment_credential=False)
 
-            search_client = SearchClient(endpoint, index_config.indexing_profile.settings.index_name, credential)
-            vector_query = VectorizedQuery(vector=self.__get_embeddings(query),
-                                            k_nearest_neighbors=3,
-                                            fields=index_config.indexing_profile.settings.embedding_field_name)
+        endpoint = index_config.api_endpoint_configuration.url
 
-            results = search_client.search(
-                search_text=query,
-                filter=index_config.indexing_profile.settings.filters,
-                vector_queries=[vector_query],
-                #query_type="semantic",
-                #semantic_configuration_name = "fllm",
-                top=index_config.indexing_profile.settings.top_n,
-                #select=[self.id_field_name, self.text_field_name, self.metadata_field_name]
-            )
+        search_client = SearchClient(endpoint, index_config.indexing_profile.settings.index_name, credential)
+        results = search_client.search(**self.__get_search_arguments(query, index_config, embeddings))
+
+        #load search results into VectorDocument objects for score processing
+        return [self.__get_vector_document(index_config, result) for result in results]
+
+    async def __asearch_index(
+        self,
+        query: str,
+        index_config: KnowledgeManagementIndexConfiguration,
+        embeddings: List[float]) -> List[VectorDocument]:
+        """
+        Performs an asynchronous hybrid search on an index.
+        """
+        credential_type = index_config.api_endpoint_configuration.authentication_type
+
+        credential = None
+        if credential_type == "AzureIdentity":
+            credential = AzureCredentialCache.get_async_credential(exclude_environment_credential=False)
+
+        endpoint = index_config.api_endpoint_configuration.url
+
+        async with AsyncSearchClient(endpoint, index_config.indexing_profile.settings.index_name, credential) as search_client:
+            results = await search_client.search(**self.__get_search_arguments(query, index_config, embeddings))
 
             #load search results into VectorDocument objects for score processing
-            for result in results:
-                metadata = {}              
-                
-                if index_config.indexing_profile.settings.metadata_field_name in result:
-                    
-                    try:
-                        metadata = json.loads(result[index_config.indexing_profile.settings.metadata_field_name]) if index_config.indexing_profile.settings.metadata_field_name in result else {}
-                    except Exception as e:
-                        metadata = {}
-
-                document = VectorDocument(
-                        id=result[index_config.indexing_profile.settings.id_field_name],
-                        page_content=result[index_config.indexing_profile.settings.text_field_name],
-                        metadata=metadata,
-                        score=result["@search.score"]
-                )
-                document.score = result["@search.score"]
-                self.search_results.append(document)
-
-        #sort search results by score
-        self.search_results.sort(key=lambda x: x.score, reverse=True)
-
-        #take top n of search_results
-        self.search_results = self.search_results[:int(index_config.indexing_profile.settings.top_n)]
-
-        return self.search_results
+            return [self.__get_vector_document(index_config, result) async for result in results]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        """
+        Performs a synchronous hybrid search on Azure AI Search index.
+        The query is embedded once and the indexes are searched concurrently.
+        """
+        # All the indexes are searched with the embedding model of the agent.
+        embeddings = self.__get_embeddings(query)
+
+        #search each indexing profile
+        if len(self.index_configurations) == 1:
+            index_results = [self.__search_index(query, self.index_configurations[0], embeddings)]
+        else:
+            with ThreadPoolExecutor(max_workers=len(self.index_configurations)) as executor:
+                index_results = list(executor.map(
+                    lambda index_config: self.__search_index(query, index_config, embeddings),
+                    self.index_configurations))
+
+        #take the top n of the fused search results
+        return self.__fuse(index_results)
 
     async def _aget_relevant_documents(
         self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
     ) -> List[Document]:
         """
-        Performs an asynchronous hybrid search on Azure AI Search index
-        NOTE: This functionality is not currently supported in the underlying Azure SDK.
+        Performs an asynchronous hybrid search on Azure AI Search index.
+        The query is embedded once and the indexes are searched concurrently.
         """
-        raise Exception(f"Asynchronous search not supported.")
+        # All the indexes are searched with the embedding model of the agent.
+        embeddings = await self.__aget_embeddings(query)
 
-    def get_document_citations(self) -> List[Citation]:
-        """
-        Gets sources from the documents retrieved from the retriever.
+        #search each indexing profile
+        index_results = await asyncio.gather(*[
+            self.__asearch_index(query, index_config, embeddings)
+            for index_config in self.index_configurations
+        ])
 
-        Returns:
-            List of citations from the retrieved documents.
-        """
-        citations = []
-        added_ids = set()  # Avoid duplicates
-        
-        for result in self.search_results:  # Unpack the tuple
-            result_id = result.id
-            metadata = result.metadata
-            if metadata is not None and 'multipart_id' in metadata and metadata['multipart_id']:
-                if result_id not in added_ids:
-                    title = (metadata['multipart_id'][-1]).split('/')[-1]
-                    filepath = '/'.join(metadata['multipart_id'])
-                    citations.append(Citation(id=result_id, title=title, filepath=filepath))
-                    added_ids.add(result_id)
-        return citations
+        #take the top n of the fused search results
+        return self.__fuse(index_results)
 
     def format_docs(self, docs:List[Document]) -> str:
         """
@@ -1,17 +1,72 @@
 from typing import List
-from abc import ABC, abstractmethod
+from abc import ABC
+from langchain_core.documents import Document
 from foundationallm.models.orchestration import Citation
+from .retrieval_result import RetrievalResult
 
 class CitationRetrievalBase(ABC):
     """
     Abstract base class indicating the ability for a retriever to retrieve citations.
+    Derived classes must also derive from BaseRetriever.
     """
-    @abstractmethod
-    def get_document_citations(self) -> List[Citation]:
+    def get_document_citations(self, documents: List[Document]) -> List[Citation]:
         """
         Gets sources from documents retrieved from the retriever.
-        
-        Returns:
+
+        Parameters
+        ----------
+        documents : List[Document]
+            The retrieved documents.
+
+        Returns
+        -------
+        List[Citation]
             List of citations from the retrieved documents.
         """
-        raise NotImplementedError()
+        citations = []
+        added_ids = set()  # Avoid duplicates
+
+        for document in documents:
+            result_id = getattr(document, 'id', None)
+            metadata = document.metadata
+            if metadata is not None and 'multipart_id' in metadata and metadata['multipart_id']:
+                if result_id not in added_ids:
+                    title = (metadata['multipart_id'][-1]).split('/')[-1]
+                    filepath = '/'.join(metadata['multipart_id'])
+                    citations.append(Citation(id=result_id, title=title, filepath=filepath))
+                    added_ids.add(result_id)
+        return citations
+
+    def retrieve(self, query: str) -> RetrievalResult:
+        """
+        Retrieves the documents and citations for a query.
+
+        Parameters
+        ----------
+        query : str
+            The query to retrieve documents for.
+
+        Returns
+        -------
+        RetrievalResult
+            The documents and citations retrieved for the query.
+        """
+        documents = self.invoke(query)
+        return RetrievalResult(documents=documents, citations=self.get_document_citations(documents))
+
+    async def aretrieve(self, query: str) -> RetrievalResult:
+        """
+        Asynchronously retrieves the documents and citations for a query.
+
+        Parameters
+        ----------
+        query : str
+            The query to retrieve documents for.
+
+        Returns
+        -------
+        RetrievalResult
+            The documents and citations retrieved for the query.
+        """
+        documents = await self.ainvoke(query)
+        return RetrievalResult(documents=documents, citations=self.get_document_citations(documents))
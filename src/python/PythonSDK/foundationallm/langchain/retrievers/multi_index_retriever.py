@@ -2,29 +2,33 @@
 Class: MultiIndexRetriever
 Description: LangChain retriever for multi-retriever search.
 """
+import asyncio
 import json
-from typing import List, Optional, Union, Tuple
+from typing import List
 from langchain_openai import OpenAIEmbeddings
 from langchain_core.callbacks import (
     AsyncCallbackManagerForRetrieverRun,
     CallbackManagerForRetrieverRun,
 )
 from langchain_core.documents import Document
+from langchain_core.pydantic_v1 import Field
 from langchain_core.retrievers import BaseRetriever
 from azure.search.documents import SearchClient
 from azure.search.documents.models import VectorizedQuery
 from azure.core.credentials import AzureKeyCredential
-from azure.identity import DefaultAzureCredential
-from foundationallm.models.orchestration import Citation
 from .citation_retrieval_base import CitationRetrievalBase
+from .rank_fusion import RankFusionBase, ReciprocalRankFusion
 
 class MultiIndexRetriever(BaseRetriever, CitationRetrievalBase):
     """
     LangChain multi retriever.
     Properties:
         retrievers: List[BaseRetriever] -> List of retrievers to use for completion requests.
+        rank_fusion: RankFusionBase -> Fuses the results of the retrievers, reciprocal rank fusion by default.
 
     Searches embedding and text fields in the list of retrievers indexes for the top_n most relevant documents.
+    The documents and citations of a query are returned by retrieve and aretrieve, so the
+    retriever keeps no per-query state.
 
     Default FFLM document structure (overridable by setting the embedding and text field names):
         {
@@ -39,8 +43,8 @@ class MultiIndexRetriever(BaseRetriever, CitationRetrievalBase):
     """
 
     top_n: int = 10
-    retrievers: List[BaseRetriever] = []
-    search_results: Optional[Tuple[str, Document]] = [] # Tuple of document id and document
+    retrievers: List[BaseRetriever] = Field(default_factory=list)
+    rank_fusion: RankFusionBase = Field(default_factory=ReciprocalRankFusion)
 
     def add_retriever(self, retriever: BaseRetriever):
         """
@@ -53,22 +57,6 @@ class MultiIndexRetriever(BaseRetriever, CitationRetrievalBase):
         """
         self.retrievers.append(retriever)
 
-    def get_document_citations(self):
-
-        citations = []
-        added_ids = set()  # Avoid duplicates
-        for result in self.search_results:  # Unpack the tuple
-            result_id = result.id
-            metadata = result.metadata
-            if metadata is not None and 'multipart_id' in metadata and metadata['multipart_id']:
-                if result_id not in added_ids:
-                    title = (metadata['multipart_id'][-1]).split('/')[-1]
-                    filepath = '/'.join(metadata['multipart_id'])
-                    citations.append(Citation(id=result_id, title=title, filepath=filepath))
-                    added_ids.add(result_id)
-
-        return citations
-
     def _get_relevant_documents(
         self, query: str, *, run_manager: CallbackManagerForRetrieverRun
     ) -> List[Document]:
@@ -76,24 +64,28 @@ class MultiIndexRetriever(BaseRetriever, CitationRetrievalBase):
         Performs a synchronous hybrid search on Azure AI Search index
         """
 
-        total_results = []
-
-        for retriever in self.retrievers:
+        results = [
+            retriever.invoke(query, config={"callbacks": run_manager.get_child()})
+            for retriever in self.retrievers
+        ]
 
-            results = retriever._get_relevant_documents(
-                query=query,
-                run_manager=run_manager
-            )
+        #take the top n of the fused search results
+        return self.rank_fusion.fuse(results, self.top_n)
 
-            total_results.extend(results)
-
-        #sort by relevance/score/metric
-        total_results.sort(key=lambda x: x.score, reverse=True)
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        """
+        Performs an asynchronous hybrid search on the indexes of all the retrievers concurrently
+        """
 
-        #take top n of search_results
-        self.search_results = total_results[:self.top_n]
+        results = await asyncio.gather(*[
+            retriever.ainvoke(query, config={"callbacks": run_manager.get_child()})
+            for retriever in self.retrievers
+        ])
 
-        return self.search_results
+        #take the top n of the fused search results
+        return self.rank_fusion.fuse(results, self.top_n)
 
     def format_docs(self, docs:List[Document]) -> str:
         """
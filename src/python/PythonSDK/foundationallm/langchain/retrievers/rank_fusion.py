@@ -0,0 +1,160 @@
+"""
+Classes:
+    RankFusionStrategies: Enumerator of the rank fusion strategies.
+    RankFusionBase: Merges the ranked results of several indexes.
+    ReciprocalRankFusion: Fuses results by their rank in each index.
+    MinMaxRankFusion: Fuses results by their min-max normalized score in each index.
+Description:
+    Scores returned by different indexes and query types are not comparable, so the results
+    of the indexes are fused into a single ranking before the global top n is selected.
+"""
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import List
+import numpy as np
+from foundationallm.models.vectors import VectorDocument
+
+class RankFusionStrategies(str, Enum):
+    """Enumerator of the rank fusion strategies."""
+
+    RECIPROCAL_RANK = "reciprocal_rank"
+    MIN_MAX = "min_max"
+
+class RankFusionBase(ABC):
+    """
+    Merges the ranked results of several indexes into a single ranking.
+
+    The fused score of a document is the weighted sum of its fused scores in each
+    index, so a document returned by several indexes ranks higher.
+    """
+    @abstractmethod
+    def _get_fused_scores(self, scores: np.ndarray, list_indexes: np.ndarray, list_count: int) -> np.ndarray:
+        """
+        Returns the fused score of each result.
+
+        Parameters
+        ----------
+        scores : np.ndarray
+            The scores of the results of all the indexes.
+        list_indexes : np.ndarray
+            The index of the result list of each result.
+        list_count : int
+            The number of result lists.
+
+        Returns
+        -------
+        np.ndarray
+            The fused score of each result, before weighting.
+        """
+        raise NotImplementedError()
+
+    def fuse(
+        self,
+        result_lists: List[List[VectorDocument]],
+        top_n: int,
+        weights: List[float] = None) -> List[VectorDocument]:
+        """
+        Fuses the results of several indexes and returns the global top n.
+
+        Parameters
+        ----------
+        result_lists : List[List[VectorDocument]]
+            The results of each index.
+        top_n : int
+            The number of documents to return.
+        weights : List[float]
+            The weight of each index. All the indexes have the same weight by default.
+
+        Returns
+        -------
+        List[VectorDocument]
+            Copies of the top n documents, by descending fused score and then in order of appearance,
+            with their score set to the fused score. The documents of the result lists are not modified.
+        """
+        documents = [document for results in result_lists for document in results]
+        if len(documents) == 0 or top_n <= 0:
+            return []
+
+        list_indexes = np.repeat(np.arange(len(result_lists)), [len(results) for results in result_lists])
+        scores = np.fromiter((document.score for document in documents), dtype=float, count=len(documents))
+        list_weights = np.ones(len(result_lists)) if weights is None else np.asarray(weights, dtype=float)
+        fused_scores = self._get_fused_scores(scores, list_indexes, len(result_lists)) * list_weights[list_indexes]
+
+        # Sum the scores of the documents returned by more than one index.
+        codes = {}
+        document_codes = np.fromiter(
+            (codes.setdefault(document.id, len(codes)) for document in documents),
+            dtype=np.intp,
+            count=len(documents))
+        totals = np.bincount(document_codes, weights=fused_scores)
+        # Codes are assigned in order of appearance, so this is the first result of each document.
+        _, first_indexes = np.unique(document_codes, return_index=True)
+
+        top_n = min(top_n, len(totals))
+        # Keep every document tied with the n-th total, so the tie order decides which ones are returned.
+        threshold = np.partition(totals, len(totals) - top_n)[len(totals) - top_n]
+        candidates = np.flatnonzero(totals >= threshold)
+        # Order by descending total, then by first appearance.
+        top_codes = candidates[np.lexsort((first_indexes[candidates], -totals[candidates]))][:top_n]
+
+        return [
+            documents[first_indexes[code]].copy(update={'score': float(totals[code])})
+            for code in top_codes
+        ]
+
+class ReciprocalRankFusion(RankFusionBase):
+    """
+    Fuses results by their rank in each index, ignoring the raw scores.
+    """
+    def __init__(self, k: int = 60):
+        """
+        Initializes the fusion.
+
+        Parameters
+        ----------
+        k : int
+            Dampens the weight of the top ranked results.
+        """
+        self.k = k
+
+    def _get_fused_scores(self, scores: np.ndarray, list_indexes: np.ndarray, list_count: int) -> np.ndarray:
+        # Sort by result list, then by descending score, and number the results of each list.
+        order = np.lexsort((-scores, list_indexes))
+        list_starts = np.searchsorted(list_indexes[order], np.arange(list_count))
+        ranks = np.empty(len(scores), dtype=float)
+        ranks[order] = np.arange(len(scores)) - list_starts[list_indexes[order]]
+        return 1.0 / (self.k + ranks + 1)
+
+class MinMaxRankFusion(RankFusionBase):
+    """
+    Fuses results by their score normalized to [0, 1] within each index.
+    """
+    def _get_fused_scores(self, scores: np.ndarray, list_indexes: np.ndarray, list_count: int) -> np.ndarray:
+        minimums = np.full(list_count, np.inf)
+        maximums = np.full(list_count, -np.inf)
+        np.minimum.at(minimums, list_indexes, scores)
+        np.maximum.at(maximums, list_indexes, scores)
+        spans = (maximums - minimums)[list_indexes]
+        normalized = np.ones(len(scores))
+        np.divide(scores - minimums[list_indexes], spans, out=normalized, where=spans > 0)
+        return normalized
+
+def get_rank_fusion(strategy: RankFusionStrategies) -> RankFusionBase:
+    """
+    Returns the rank fusion of a strategy.
+
+    Parameters
+    ----------
+    strategy : RankFusionStrategies
+        The rank fusion strategy.
+
+    Returns
+    -------
+    RankFusionBase
+        The rank fusion implementing the strategy.
+    """
+    if strategy == RankFusionStrategies.MIN_MAX:
+        return MinMaxRankFusion()
+    if strategy == RankFusionStrategies.RECIPROCAL_RANK:
+        return ReciprocalRankFusion()
+    raise ValueError(f'The rank fusion strategy {strategy} is not supported.')
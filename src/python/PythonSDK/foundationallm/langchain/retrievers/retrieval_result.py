@@ -0,0 +1,24 @@
+from dataclasses import dataclass, field
+from typing import List
+from langchain_core.documents import Document
+from foundationallm.models.orchestration import Citation
+
+@dataclass
+class RetrievalResult:
+    """
+    The documents and citations retrieved for a single query.
+
+    A new result is returned by every retrieval, so retrievers keep no per-query
+    state and can be shared by concurrent requests.
+    """
+    documents: List[Document] = field(default_factory=list)
+    citations: List[Citation] = field(default_factory=list)
+
+    @property
+    def scores(self) -> List[float]:
+        """
+        The scores of the documents, or None for the documents without a score.
+        The results fused from several indexes or queries are scored by their fused score,
+        which ranks them but is not comparable to the relevance scores of the indexes.
+        """
+        return [getattr(document, 'score', None) for document in self.documents]
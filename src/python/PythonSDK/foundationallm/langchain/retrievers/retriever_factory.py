@@ -1,5 +1,4 @@
 from typing import List
-from azure.identity import DefaultAzureCredential
 from langchain_core.retrievers import BaseRetriever
 from foundationallm.config import Configuration
 from foundationallm.langchain.language_models.openai import OpenAIModel
@@ -32,8 +31,6 @@ class RetrieverFactory:
         BaseRetriever
             Returns the concrete initialization of a vectorstore retriever.
         """               
-        credential = DefaultAzureCredential(exclude_environment_credential=True)                                   
-  
         """
         # use indexing profile to build the retriever (current only supporting Azure AI Search)
         top_n = self.indexing_profile.settings.top_n
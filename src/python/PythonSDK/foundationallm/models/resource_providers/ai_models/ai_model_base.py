@@ -1,7 +1,7 @@
 from pydantic import Field
 from typing import Any, Self, Optional
 from foundationallm.models.resource_providers import ResourceBase
-from foundationallm.models.utils import ObjectUtils
+from foundationallm.models.utils import ResourceObjectCache
 from foundationallm.langchain.exceptions import LangChainException
 
 class AIModelBase(ResourceBase):
@@ -19,7 +19,7 @@ class AIModelBase(ResourceBase):
         ai_model: AIModelBase = None
 
         try:
-            ai_model = AIModelBase(**ObjectUtils.translate_keys(obj))
+            ai_model = ResourceObjectCache.get_or_create(AIModelBase, obj, translate_keys=True)
         except Exception as e:
             raise LangChainException(f"The AI model object provided is invalid. {str(e)}", 400)
         
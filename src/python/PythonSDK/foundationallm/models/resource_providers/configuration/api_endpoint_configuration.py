@@ -5,7 +5,7 @@ from foundationallm.models.resource_providers.configuration import (
     ConfigurationTypes,
     UrlException
 )
-from foundationallm.models.utils import ObjectUtils
+from foundationallm.models.utils import ResourceObjectCache
 from foundationallm.langchain.exceptions import LangChainException
 
 class APIEndpointConfiguration(ResourceBase):
@@ -30,7 +30,7 @@ class APIEndpointConfiguration(ResourceBase):
         endpoint_configuration: APIEndpointConfiguration = None
 
         try:
-            endpoint_configuration = APIEndpointConfiguration(**ObjectUtils.translate_keys(obj))
+            endpoint_configuration = ResourceObjectCache.get_or_create(APIEndpointConfiguration, obj, translate_keys=True)
         except Exception as e:
             raise LangChainException(f"The API Endpoint Configuration object provided is invalid. {str(e)}", 400)
         
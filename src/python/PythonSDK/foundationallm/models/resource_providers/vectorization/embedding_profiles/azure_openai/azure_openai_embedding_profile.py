@@ -6,7 +6,7 @@ Description:
 """
 from typing import Any, Self, Optional
 from foundationallm.models.resource_providers.vectorization import EmbeddingProfileBase
-from foundationallm.models.utils import ObjectUtils
+from foundationallm.models.utils import ResourceObjectCache
 from foundationallm.langchain.exceptions import LangChainException
 
 class AzureOpenAIEmbeddingProfile(EmbeddingProfileBase):
@@ -22,7 +22,7 @@ class AzureOpenAIEmbeddingProfile(EmbeddingProfileBase):
         text_embedding_profile: AzureOpenAIEmbeddingProfile = None
 
         try:
-            text_embedding_profile = AzureOpenAIEmbeddingProfile(**ObjectUtils.translate_keys(obj))
+            text_embedding_profile = ResourceObjectCache.get_or_create(AzureOpenAIEmbeddingProfile, obj, translate_keys=True)
         except Exception as e:
             raise LangChainException(f"The text embedding profile object provided in the agent parameters is invalid. {str(e)}", 400)
         
@@ -10,7 +10,7 @@ from typing import Any, Self
 from foundationallm.models.resource_providers.vectorization import IndexingProfileBase
 from .azure_ai_search_settings import AzureAISearchSettings
 from .azure_ai_search_configuration_references import AzureAISearchConfigurationReferences
-from foundationallm.models.utils import ObjectUtils
+from foundationallm.models.utils import ResourceObjectCache
 from foundationallm.langchain.exceptions import LangChainException
 
 class AzureAISearchIndexingProfile(IndexingProfileBase):
@@ -26,7 +26,7 @@ class AzureAISearchIndexingProfile(IndexingProfileBase):
         indexing_profile: AzureAISearchIndexingProfile = None
         
         try:
-            indexing_profile = AzureAISearchIndexingProfile(**ObjectUtils.translate_keys(obj))
+            indexing_profile = ResourceObjectCache.get_or_create(AzureAISearchIndexingProfile, obj, translate_keys=True)
         except Exception as e:
             raise LangChainException(f"The indexing profile object provided in the agent parameters is invalid. {str(e)}", 400)
         
@@ -17,3 +17,4 @@ class AzureAISearchSettings(BaseModel):
     text_field_name: Optional[str] = "Text"
     metadata_field_name: Optional[str] = "AdditionalMetadata"
     id_field_name: Optional[str] = "Id"
+    weight: Optional[str] = "1" # weight of the index results when they are fused with the results of other indexes
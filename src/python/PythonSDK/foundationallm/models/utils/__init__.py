@@ -1 +1,2 @@
 from .object_utils import ObjectUtils
+from .resource_object_cache import ResourceObjectCache
@@ -1,22 +1,139 @@
 import re
+import threading
+import typing
+from functools import lru_cache
+from typing import Any, Callable, Dict, Type
+from pydantic import BaseModel
+
+WORD_BOUNDARY_PATTERN = re.compile('(.)([A-Z][a-z]+)')
+LOWER_UPPER_BOUNDARY_PATTERN = re.compile('([a-z0-9])([A-Z])')
 
 class ObjectUtils:
 
+    # Translators compiled for each pydantic model type.
+    __translators: Dict[Type[BaseModel], Callable[[Any], Any]] = {}
+    __translators_lock = threading.Lock()
+
     @staticmethod
-    def pascal_to_snake(name):  
-        # Convert PascalCase or camelCase to snake_case  
-        s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)  
-        return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()  
+    @lru_cache(maxsize=4096)
+    def pascal_to_snake(name):
+        # Convert PascalCase or camelCase to snake_case
+        # The conversions are memoized, since the same keys are translated on every request.
+        s1 = WORD_BOUNDARY_PATTERN.sub(r'\1_\2', name)
+        return LOWER_UPPER_BOUNDARY_PATTERN.sub(r'\1_\2', s1).lower()
 
     @staticmethod
-    def translate_keys(obj):  
-        if isinstance(obj, dict):  
-            new_dict = {}  
-            for key, value in obj.items():  
-                new_key = ObjectUtils.pascal_to_snake(key)  
-                new_dict[new_key] = ObjectUtils.translate_keys(value)  # Recursively apply to values  
-            return new_dict  
-        elif isinstance(obj, list):  
-            return [ObjectUtils.translate_keys(item) for item in obj]  # Apply to each item in the list  
-        else:  
+    def translate_keys(obj, model_type: Type[BaseModel] = None):
+        """
+        Converts the keys of a dictionary, and of the dictionaries nested in it, to snake_case.
+
+        Parameters
+        ----------
+        obj : Any
+            The dictionary, list or value to translate.
+        model_type : Type[BaseModel]
+            The pydantic model the object represents, if known. The keys of its fields
+            are then translated with a translator compiled once for the model.
+
+        Returns
+        -------
+        Any
+            The object with its keys converted to snake_case.
+        """
+        if model_type is not None:
+            return ObjectUtils.get_translator(model_type)(obj)
+        if isinstance(obj, dict):
+            new_dict = {}
+            for key, value in obj.items():
+                new_key = ObjectUtils.pascal_to_snake(key) if isinstance(key, str) else key
+                new_dict[new_key] = ObjectUtils.translate_keys(value)  # Recursively apply to values
+            return new_dict
+        elif isinstance(obj, list):
+            return [ObjectUtils.translate_keys(item) for item in obj]  # Apply to each item in the list
+        else:
             return obj  # Return the item itself if it's not a dict or list
+
+    @staticmethod
+    def get_translator(model_type: Type[BaseModel]) -> Callable[[Any], Any]:
+        """
+        Returns the key translator of a pydantic model, compiling it on first use.
+
+        The translator maps the PascalCase, camelCase and snake_case keys of the model fields
+        with a single dictionary lookup, and uses the translators of the nested models for
+        their values. Other keys and values are translated like translate_keys does.
+
+        Parameters
+        ----------
+        model_type : Type[BaseModel]
+            The pydantic model to compile a translator for.
+
+        Returns
+        -------
+        Callable[[Any], Any]
+            The translator of the model.
+        """
+        translator = ObjectUtils.__translators.get(model_type)
+        if translator is None:
+            with ObjectUtils.__translators_lock:
+                translator = ObjectUtils.__translators.get(model_type)
+                if translator is None:
+                    translator = ObjectUtils.__compile_translator(model_type)
+                    ObjectUtils.__translators[model_type] = translator
+        return translator
+
+    @staticmethod
+    def __get_nested_model(annotation: Any) -> Type[BaseModel]:
+        """
+        Returns the pydantic model of a field annotation, or of the items of a list
+        or optional annotation, or None if the field does not hold a model.
+        """
+        if isinstance(annotation, type):
+            return annotation if issubclass(annotation, BaseModel) else None
+        origin = typing.get_origin(annotation)
+        if origin in (typing.Union, list):
+            models = [
+                model for model in map(ObjectUtils.__get_nested_model, typing.get_args(annotation))
+                if model is not None
+            ]
+            return models[0] if len(models) == 1 else None
+        return None
+
+    @staticmethod
+    def __compile_translator(model_type: Type[BaseModel]) -> Callable[[Any], Any]:
+        """
+        Builds the key translator of a pydantic model.
+        """
+        key_map: Dict[str, str] = {}
+        value_translators: Dict[str, Callable[[Any], Any]] = {}
+        for field_name, field in model_type.model_fields.items():
+            words = field_name.split('_')
+            pascal_case = ''.join(word.capitalize() for word in words)
+            camel_case = words[0] + pascal_case[len(words[0]):]
+            for key in (pascal_case, camel_case, field_name):
+                # Only keys that translate to the field name are mapped, so the compiled
+                # translator returns the same keys as translate_keys.
+                if ObjectUtils.pascal_to_snake(key) == field_name:
+                    key_map[key] = field_name
+            nested_model = ObjectUtils.__get_nested_model(field.annotation)
+            if nested_model is not None and nested_model is not model_type:
+                value_translators[field_name] = (
+                    lambda value, model=nested_model:
+                        [ObjectUtils.get_translator(model)(item) for item in value]
+                        if isinstance(value, list)
+                        else ObjectUtils.get_translator(model)(value))
+
+        translate_value = ObjectUtils.translate_keys
+        to_snake = ObjectUtils.pascal_to_snake
+
+        def translate(obj: Any) -> Any:
+            if not isinstance(obj, dict):
+                return translate_value(obj)
+            new_dict = {}
+            for key, value in obj.items():
+                new_key = key_map.get(key)
+                if new_key is None:
+                    new_key = to_snake(key) if isinstance(key, str) else key
+                new_dict[new_key] = value_translators.get(new_key, translate_value)(value)
+            return new_dict
+
+        return translate
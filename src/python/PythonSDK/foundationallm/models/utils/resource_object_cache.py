@@ -0,0 +1,96 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Tuple, Type, TypeVar
+from .object_utils import ObjectUtils
+
+T = TypeVar('T')
+
+class ResourceObjectCache:
+    """
+    Process-wide cache of the resource objects parsed from completion requests.
+
+    Agents send the same prompt, AI model, API endpoint and vectorization profile
+    objects with every request. Parsed objects are cached by type and by the hash of
+    their content, so an object that was already parsed is neither translated nor
+    validated again. Cached objects are shared by every request and must not be modified.
+    Objects that fail to parse are not cached.
+    """
+    # The maximum number of cached objects.
+    MAX_SIZE = 1024
+
+    hits = 0
+    misses = 0
+    __objects: OrderedDict[Tuple[Hashable, bool, str], Any] = OrderedDict()
+    __lock = threading.Lock()
+
+    @staticmethod
+    def get_content_hash(obj: Any) -> str:
+        """
+        Returns a hash of the content of an object that does not depend on the order of its keys.
+
+        Parameters
+        ----------
+        obj : Any
+            The dictionary representation of a resource object.
+
+        Returns
+        -------
+        str
+            The SHA-256 digest of the canonical JSON representation of the object.
+        """
+        content = json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def get_or_create(cls, resource_type: Type[T], obj: Any, translate_keys: bool = False) -> T:
+        """
+        Returns the resource object parsed from its dictionary representation.
+
+        Parameters
+        ----------
+        resource_type : Type[T]
+            The pydantic model of the resource object.
+        obj : Any
+            The dictionary representation of the resource object.
+        translate_keys : bool
+            True to convert the keys of the object from PascalCase or camelCase to snake_case before parsing.
+
+        Returns
+        -------
+        T
+            The parsed resource object.
+        """
+        try:
+            key = (resource_type, translate_keys, cls.get_content_hash(obj))
+        except (TypeError, ValueError):
+            # Objects that cannot be serialized are parsed without caching.
+            return resource_type(**(ObjectUtils.translate_keys(obj, resource_type) if translate_keys else obj))
+
+        with cls.__lock:
+            resource = cls.__objects.get(key)
+            if resource is not None:
+                cls.__objects.move_to_end(key)
+                cls.hits += 1
+                return resource
+            cls.misses += 1
+
+        resource = resource_type(**(ObjectUtils.translate_keys(obj, resource_type) if translate_keys else obj))
+
+        with cls.__lock:
+            cls.__objects[key] = resource
+            cls.__objects.move_to_end(key)
+            while len(cls.__objects) > cls.MAX_SIZE:
+                cls.__objects.popitem(last=False)
+        return resource
+
+    @classmethod
+    def clear(cls):
+        """
+        Removes every object from the cache.
+        """
+        with cls.__lock:
+            cls.__objects.clear()
+            cls.hits = 0
+            cls.misses = 0
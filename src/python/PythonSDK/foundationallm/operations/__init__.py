@@ -2,3 +2,12 @@
 Operations module for FoundationaLLM package.
 """
 from .operations_manager import OperationsManager
+from .operation_state_buffer import OperationStateBuffer, OperationStateWriteError
+from .operation_state_cache import OperationStateCache
+from .operation_event_broker import OperationEventBroker
+from .job_scheduler import (
+    JobPriority,
+    JobQueueFullError,
+    JobScheduler,
+    JobSchedulerClosedError
+)
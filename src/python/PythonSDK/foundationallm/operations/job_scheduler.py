@@ -0,0 +1,263 @@
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Awaitable, Callable, Dict, List, Optional
+
+class JobPriority(IntEnum):
+    """Enumerator of the job priority lanes. Lower values are scheduled first."""
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+class JobQueueFullError(Exception):
+    """
+    Raised when a job cannot be accepted because the scheduler queue is full.
+    """
+    def __init__(self, message: str, retry_after_seconds: int):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+class JobSchedulerClosedError(Exception):
+    """
+    Raised when a job is submitted to a scheduler that is shutting down.
+    """
+
+@dataclass(order=True)
+class ScheduledJob:
+    """
+    A queued job, ordered by priority and then by submission order.
+    """
+    priority: int
+    sequence: int
+    enqueued_at: float = field(compare=False)
+    run: Callable[[], Awaitable[None]] = field(compare=False)
+    on_cancel: Optional[Callable[[], Awaitable[None]]] = field(default=None, compare=False)
+
+@dataclass
+class JobLaneMetrics:
+    """
+    Counters and timings of the jobs of a lane.
+    """
+    concurrency: int
+    queued: int = 0
+    running: int = 0
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    average_wait_seconds: float = 0
+    max_wait_seconds: float = 0
+    average_run_seconds: float = 0
+
+class JobScheduler():
+    """
+    In-process scheduler that runs background jobs with bounded concurrency and queue depth.
+
+    Jobs are grouped in lanes, such as the agent type of a completion request. Each lane has
+    its own number of workers, so a burst of one kind of job cannot starve the others. Queued
+    jobs are started by priority and then in submission order. The total number of queued
+    jobs is bounded; check_capacity raises JobQueueFullError, with a Retry-After estimate,
+    once the limit is reached. The jobs still queued or running when the scheduler is closed
+    are cancelled, and their on_cancel callbacks are awaited.
+    """
+    # Weight of the latest sample in the moving averages of the wait and run times.
+    SMOOTHING = 0.2
+
+    def __init__(
+        self,
+        concurrency: Dict[str, int] = None,
+        default_concurrency: int = 4,
+        max_queue_depth: int = 256):
+        """
+        Initializes the scheduler.
+
+        Parameters
+        ----------
+        concurrency : Dict[str, int]
+            The number of jobs of each lane that may run at the same time.
+        default_concurrency : int
+            The number of concurrent jobs of the lanes not listed in concurrency.
+        max_queue_depth : int
+            The maximum number of jobs waiting to run, across all lanes.
+        """
+        self.concurrency = dict(concurrency or {})
+        self.default_concurrency = default_concurrency
+        self.max_queue_depth = max_queue_depth
+        self.rejected = 0
+        self.__queues: Dict[str, asyncio.PriorityQueue] = {}
+        self.__workers: Dict[str, list] = {}
+        self.__metrics: Dict[str, JobLaneMetrics] = {}
+        self.__sequence = 0
+        self.__closed = False
+        self.__cancelled: List[ScheduledJob] = []
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        The number of jobs waiting to run, across all lanes.
+        """
+        return sum(metrics.queued for metrics in self.__metrics.values())
+
+    def __get_retry_after(self) -> int:
+        """
+        Estimates the number of seconds until the queue has room for another job.
+        """
+        running = [m for m in self.__metrics.values() if m.average_run_seconds > 0]
+        average_run_seconds = (
+            sum(m.average_run_seconds for m in running) / len(running)) if running else 5
+        total_concurrency = sum(m.concurrency for m in self.__metrics.values()) or 1
+        estimate = average_run_seconds * (self.queue_depth + 1) / total_concurrency
+        return max(1, min(60, math.ceil(estimate)))
+
+    def check_capacity(self):
+        """
+        Raises an exception if the scheduler cannot accept another job.
+        Call it before doing any work on behalf of a job that is about to be submitted.
+        """
+        if self.__closed:
+            raise JobSchedulerClosedError('The job scheduler is shutting down.')
+        if self.queue_depth >= self.max_queue_depth:
+            self.rejected += 1
+            raise JobQueueFullError(
+                f'The job queue is full ({self.max_queue_depth} jobs are waiting to run).',
+                self.__get_retry_after())
+
+    def submit(
+        self,
+        lane: str,
+        run: Callable[[], Awaitable[None]],
+        priority: JobPriority = JobPriority.NORMAL,
+        on_cancel: Callable[[], Awaitable[None]] = None):
+        """
+        Queues a job to run on the workers of a lane.
+
+        Parameters
+        ----------
+        lane : str
+            The lane of the job, such as the agent type of a completion request.
+        run : Callable[[], Awaitable[None]]
+            Creates the coroutine that performs the job.
+        priority : JobPriority
+            The priority of the job within its lane.
+        on_cancel : Callable[[], Awaitable[None]]
+            Creates the coroutine that records the cancellation of the job, if the
+            scheduler is closed before the job has finished.
+
+        Raises
+        ------
+        JobQueueFullError
+            The queue is full. The capacity is checked again, since it may have been
+            taken by other jobs after check_capacity was called.
+        JobSchedulerClosedError
+            The scheduler is shutting down.
+        """
+        self.check_capacity()
+
+        queue = self.__queues.get(lane)
+        if queue is None:
+            queue = self.__start_lane(lane)
+
+        self.__sequence += 1
+        queue.put_nowait(ScheduledJob(int(priority), self.__sequence, time.monotonic(), run, on_cancel))
+        metrics = self.__metrics[lane]
+        metrics.queued += 1
+        metrics.submitted += 1
+
+    def __start_lane(self, lane: str) -> asyncio.PriorityQueue:
+        """
+        Creates the queue and starts the workers of a lane.
+        """
+        concurrency = self.concurrency.get(lane, self.default_concurrency)
+        queue = asyncio.PriorityQueue()
+        self.__queues[lane] = queue
+        self.__metrics[lane] = JobLaneMetrics(concurrency=concurrency)
+        loop = asyncio.get_running_loop()
+        self.__workers[lane] = [
+            loop.create_task(self.__work(lane, queue)) for _ in range(concurrency)
+        ]
+        return queue
+
+    def __average(self, average: float, sample: float) -> float:
+        """
+        Updates an exponential moving average with a new sample.
+        """
+        return sample if average == 0 else average + self.SMOOTHING * (sample - average)
+
+    async def __work(self, lane: str, queue: asyncio.PriorityQueue):
+        """
+        Runs the jobs of a lane, one at a time.
+        """
+        metrics = self.__metrics[lane]
+        while True:
+            job: ScheduledJob = await queue.get()
+            started_at = time.monotonic()
+            wait_seconds = started_at - job.enqueued_at
+            metrics.queued -= 1
+            metrics.running += 1
+            metrics.average_wait_seconds = self.__average(metrics.average_wait_seconds, wait_seconds)
+            metrics.max_wait_seconds = max(metrics.max_wait_seconds, wait_seconds)
+            try:
+                await job.run()
+                metrics.completed += 1
+            except asyncio.CancelledError:
+                self.__cancelled.append(job)
+                raise
+            except Exception as e:
+                metrics.failed += 1
+                logging.error(f'A background job in the {lane} lane failed: {e}')
+            finally:
+                metrics.running -= 1
+                metrics.average_run_seconds = self.__average(
+                    metrics.average_run_seconds, time.monotonic() - started_at)
+                queue.task_done()
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the queue depth, the rejected job count and the counters and timings of each lane.
+        """
+        return {
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'rejected': self.rejected,
+            'lanes': {lane: vars(metrics).copy() for lane, metrics in self.__metrics.items()}
+        }
+
+    async def close(self, timeout_seconds: float = 30):
+        """
+        Stops accepting jobs, waits for the queued and running jobs to finish,
+        and stops the workers. The jobs that did not finish in time are cancelled,
+        and their on_cancel callbacks are awaited.
+
+        Parameters
+        ----------
+        timeout_seconds : float
+            How long to wait for the remaining jobs before they are cancelled.
+        """
+        self.__closed = True
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*[queue.join() for queue in self.__queues.values()]),
+                timeout_seconds)
+        except asyncio.TimeoutError:
+            pass
+        workers = [worker for lane_workers in self.__workers.values() for worker in lane_workers]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+        # The running jobs were recorded by their workers, the queued jobs never started.
+        cancelled, self.__cancelled = self.__cancelled, []
+        for lane, queue in self.__queues.items():
+            while not queue.empty():
+                cancelled.append(queue.get_nowait())
+                self.__metrics[lane].queued -= 1
+        if cancelled:
+            logging.warning(f'{len(cancelled)} jobs were cancelled on shutdown.')
+        for job in cancelled:
+            if job.on_cancel is not None:
+                try:
+                    await job.on_cancel()
+                except Exception as e:
+                    logging.error(f'The cancellation of a background job could not be recorded: {e}')
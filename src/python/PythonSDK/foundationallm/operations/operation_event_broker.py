@@ -0,0 +1,150 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+class OperationEventStream():
+    """
+    The ordered events published for a single operation.
+    """
+    def __init__(self):
+        self.events: List[Tuple[str, Any]] = []
+        self.closed = False
+        self.subscribers = 0
+        self.changed = asyncio.Event()
+
+    def notify(self):
+        """
+        Wakes up the subscribers waiting for new events.
+        """
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+class OperationEventBroker():
+    """
+    In-process publish/subscribe broker for the events of the operations run by this node,
+    such as status changes and completion tokens.
+
+    Every subscriber receives all the events of an operation from the first one, so a client
+    that subscribes after the operation started does not miss any tokens. Closed streams are
+    kept for retention_seconds so late subscribers can still replay them.
+    """
+    def __init__(self, retention_seconds: float = 60):
+        """
+        Initializes the broker.
+
+        Parameters
+        ----------
+        retention_seconds : float
+            How long the events of an operation are kept after its stream is closed.
+        """
+        self.retention_seconds = retention_seconds
+        self.__streams: Dict[Tuple[str, str], OperationEventStream] = {}
+
+    def open(self, operation_id: str, instance_id: str):
+        """
+        Creates the event stream of an operation run by this node.
+
+        Parameters
+        ----------
+        operation_id : str
+            The unique identifier for the operation.
+        instance_id : str
+            The unique identifier for the FLLM instance.
+        """
+        self.__streams.setdefault((instance_id, operation_id), OperationEventStream())
+
+    def has_stream(self, operation_id: str, instance_id: str) -> bool:
+        """
+        Determines whether the events of an operation are available from this node.
+
+        Parameters
+        ----------
+        operation_id : str
+            The unique identifier for the operation.
+        instance_id : str
+            The unique identifier for the FLLM instance.
+        """
+        return (instance_id, operation_id) in self.__streams
+
+    def has_subscribers(self, operation_id: str, instance_id: str) -> bool:
+        """
+        Determines whether a client is subscribed to the events of an operation.
+        The completion tokens are only streamed to the subscribed clients, so the
+        operations nobody listens to run as regular, non-streamed, completions.
+
+        Parameters
+        ----------
+        operation_id : str
+            The unique identifier for the operation.
+        instance_id : str
+            The unique identifier for the FLLM instance.
+        """
+        stream = self.__streams.get((instance_id, operation_id))
+        return stream is not None and stream.subscribers > 0
+
+    def publish(self, operation_id: str, instance_id: str, event: str, data: Any):
+        """
+        Publishes an event to the subscribers of an operation.
+
+        Parameters
+        ----------
+        operation_id : str
+            The unique identifier for the operation.
+        instance_id : str
+            The unique identifier for the FLLM instance.
+        event : str
+            The event name, such as status, token or result.
+        data : Any
+            The event payload.
+        """
+        stream = self.__streams.get((instance_id, operation_id))
+        if stream is None or stream.closed:
+            return
+        stream.events.append((event, data))
+        stream.notify()
+
+    def close(self, operation_id: str, instance_id: str):
+        """
+        Ends the event stream of an operation. The events are discarded after the retention period.
+
+        Parameters
+        ----------
+        operation_id : str
+            The unique identifier for the operation.
+        instance_id : str
+            The unique identifier for the FLLM instance.
+        """
+        key = (instance_id, operation_id)
+        stream = self.__streams.get(key)
+        if stream is None or stream.closed:
+            return
+        stream.closed = True
+        stream.notify()
+        asyncio.get_running_loop().call_later(
+            self.retention_seconds, self.__streams.pop, key, None)
+
+    async def subscribe(self, operation_id: str, instance_id: str) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Yields the events of an operation, from the first one, until its stream is closed.
+
+        Parameters
+        ----------
+        operation_id : str
+            The unique identifier for the operation.
+        instance_id : str
+            The unique identifier for the FLLM instance.
+        """
+        stream = self.__streams.get((instance_id, operation_id))
+        if stream is None:
+            return
+        stream.subscribers += 1
+        try:
+            index = 0
+            while True:
+                while index < len(stream.events):
+                    yield stream.events[index]
+                    index += 1
+                if stream.closed:
+                    return
+                await stream.changed.wait()
+        finally:
+            stream.subscribers -= 1
@@ -0,0 +1,289 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from foundationallm.models.operations import LongRunningOperation, OperationStatus
+from foundationallm.models.orchestration import CompletionResponse
+from .operation_event_broker import OperationEventBroker
+from .operation_state_cache import OperationStateCache
+from .operations_manager import OperationsManager
+
+@dataclass
+class PendingOperationState:
+    """
+    The writes to a single operation that have not been sent to the State API yet.
+    """
+    operation: Optional[LongRunningOperation] = None
+    result: Optional[CompletionResponse] = None
+    attempts: int = 0
+    retry_at: float = 0
+
+class OperationStateWriteError(Exception):
+    """
+    Raised when the operation state buffer is closed with writes that could not be sent to the State API.
+    """
+    def __init__(self, message: str, operation_ids: List[str]):
+        super().__init__(message)
+        self.operation_ids = operation_ids
+
+class OperationStateBuffer():
+    """
+    Write-behind buffer for operation status and result writes to the State API.
+
+    Writes are queued without waiting for the State API and sent by a background
+    flush loop. Status changes that are superseded before they are flushed are
+    merged, so only the latest status of an operation is sent. For each operation,
+    the result is always sent before the status, so a client that sees a completed
+    status can retrieve the result. Writes to different operations are sent concurrently.
+
+    Writes that fail are queued again with an exponential backoff, merged with the writes
+    queued for the same operation in the meantime, until max_send_attempts is reached.
+    """
+    # The longest delay between two attempts to send the writes of an operation.
+    MAX_RETRY_DELAY_SECONDS = 8
+
+    def __init__(
+        self,
+        operations_manager: OperationsManager,
+        flush_delay_seconds: float = 0.05,
+        cache: OperationStateCache = None,
+        event_broker: OperationEventBroker = None,
+        retry_delay_seconds: float = 0.5,
+        max_send_attempts: int = 5):
+        """
+        Initializes the buffer.
+
+        Parameters
+        ----------
+        operations_manager : OperationsManager
+            The operations manager used to send the writes to the State API.
+        flush_delay_seconds : float
+            How long writes are held before they are flushed,
+            giving later writes to the same operation a chance to be merged.
+        cache : OperationStateCache
+            When provided, queued writes are also stored in the cache so they can be
+            read locally before and after they are flushed. They are removed from the
+            cache if they cannot be sent to the State API.
+        event_broker : OperationEventBroker
+            When provided, queued writes are also published as status and result events,
+            and the event stream of an operation is closed when it reaches a final status.
+        retry_delay_seconds : float
+            How long failed writes are held before they are sent again. The delay doubles
+            with each failed attempt, up to MAX_RETRY_DELAY_SECONDS.
+        max_send_attempts : int
+            How many times the writes of an operation are sent before they are dropped.
+        """
+        self.operations_manager = operations_manager
+        self.flush_delay_seconds = flush_delay_seconds
+        self.cache = cache
+        self.event_broker = event_broker
+        self.retry_delay_seconds = retry_delay_seconds
+        self.max_send_attempts = max_send_attempts
+        self.__undelivered: List[str] = []
+        self.__pending: Dict[Tuple[str, str], PendingOperationState] = {}
+        self.__pending_event: asyncio.Event = None
+        self.__flush_task: asyncio.Task = None
+        self.__flush_lock = asyncio.Lock()
+        self.__closed = False
+
+    def update_operation(
+        self,
+        operation_id: str,
+        instance_id: str,
+        status: OperationStatus,
+        status_message: str):
+        """
+        Queues a change of the status of an operation.
+
+        Parameters
+        ----------
+        operation_id : str
+            The unique identifier for the operation.
+        instance_id : str
+            The unique identifier for the FLLM instance.
+        status: OperationStatus
+            The new status to assign to the operation.
+        status_message: str
+            The message to associate with the new status.
+        """
+        operation = LongRunningOperation(
+            operation_id=operation_id,
+            status=status,
+            status_message=status_message
+        )
+        self.__get_pending(operation_id, instance_id).operation = operation
+        if self.cache is not None:
+            self.cache.set_operation(
+                operation_id,
+                instance_id,
+                operation.model_copy(update={'last_updated': datetime.now(timezone.utc)}),
+                status,
+                authoritative=True)
+        if self.event_broker is not None:
+            self.event_broker.publish(
+                operation_id, instance_id, 'status', operation.model_dump(mode='json'))
+            if OperationStateCache.is_final(status):
+                self.event_broker.close(operation_id, instance_id)
+
+    def set_operation_result(
+        self,
+        operation_id: str,
+        instance_id: str,
+        completion_response: CompletionResponse):
+        """
+        Queues the result of a completion operation.
+
+        Parameters
+        ----------
+        operation_id : str
+            The unique identifier for the operation.
+        instance_id : str
+            The unique identifier for the FLLM instance.
+        completion_response : CompletionResponse
+            The result of the operation.
+        """
+        self.__get_pending(operation_id, instance_id).result = completion_response
+        if self.cache is not None:
+            self.cache.set_result(operation_id, instance_id, completion_response)
+        if self.event_broker is not None:
+            self.event_broker.publish(
+                operation_id, instance_id, 'result', completion_response.model_dump(mode='json'))
+
+    def __get_pending(self, operation_id: str, instance_id: str) -> PendingOperationState:
+        """
+        Returns the pending writes of an operation and makes sure the flush loop is running.
+        """
+        if self.__closed:
+            raise Exception('The operation state buffer is closed.')
+
+        if self.__flush_task is None or self.__flush_task.done():
+            self.__pending_event = asyncio.Event()
+            self.__flush_task = asyncio.get_running_loop().create_task(self.__flush_loop())
+
+        pending = self.__pending.setdefault((operation_id, instance_id), PendingOperationState())
+        self.__pending_event.set()
+        return pending
+
+    def __get_next_retry_delay(self) -> Optional[float]:
+        """
+        Returns how long until the earliest failed write is due to be sent again,
+        or None if no failed write is waiting.
+        """
+        retry_at = [state.retry_at for state in self.__pending.values() if state.attempts > 0]
+        if not retry_at:
+            return None
+        return max(0, min(retry_at) - asyncio.get_running_loop().time())
+
+    async def __flush_loop(self):
+        """
+        Flushes the pending writes as they are queued, and the failed writes when
+        they are due, until the buffer is closed.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(self.__pending_event.wait(), self.__get_next_retry_delay())
+            except asyncio.TimeoutError:
+                pass
+            if not self.__closed:
+                await asyncio.sleep(self.flush_delay_seconds)
+            await self.flush()
+            if self.__closed:
+                return
+
+    async def flush(self):
+        """
+        Sends the pending writes to the State API, except the failed writes that are not due yet.
+        Flushes are serialized so the writes to an operation are sent in order.
+        """
+        async with self.__flush_lock:
+            if self.__pending_event is not None:
+                self.__pending_event.clear()
+            now = asyncio.get_running_loop().time()
+            due = {key: state for key, state in self.__pending.items() if state.retry_at <= now}
+            for key in due:
+                del self.__pending[key]
+            if due:
+                await asyncio.gather(*[
+                    self.__send(operation_id, instance_id, state)
+                    for (operation_id, instance_id), state in due.items()
+                ])
+
+    async def __send(self, operation_id: str, instance_id: str, state: PendingOperationState):
+        """
+        Sends the pending writes of an operation, the result before the status.
+        The writes that fail are queued again.
+        """
+        try:
+            if state.result is not None:
+                await self.operations_manager.set_operation_result(
+                    operation_id=operation_id,
+                    instance_id=instance_id,
+                    completion_response=state.result)
+                state.result = None
+            if state.operation is not None:
+                await self.operations_manager.update_operation(
+                    operation_id=operation_id,
+                    instance_id=instance_id,
+                    status=state.operation.status,
+                    status_message=state.operation.status_message)
+        except Exception as e:
+            self.__requeue(operation_id, instance_id, state, e)
+
+    def __requeue(self, operation_id: str, instance_id: str, state: PendingOperationState, error: Exception):
+        """
+        Queues the failed writes of an operation again, unless they ran out of attempts.
+        The writes queued while they were being sent supersede them.
+        """
+        key = (operation_id, instance_id)
+        newer = self.__pending.get(key)
+        if newer is not None:
+            state.operation = newer.operation or state.operation
+            state.result = newer.result or state.result
+        state.attempts += 1
+        if state.attempts >= self.max_send_attempts:
+            self.__pending.pop(key, None)
+            logging.error(
+                f'Failed to write the state of operation {operation_id} to the State API '
+                f'after {state.attempts} attempts: {error}')
+            # The queued state was cached as written by this node, but the State API never
+            # received it, so the state is read from the State API again.
+            if self.cache is not None:
+                self.cache.remove_operation(operation_id, instance_id)
+            if self.__closed:
+                self.__undelivered.append(operation_id)
+            return
+
+        delay = min(self.retry_delay_seconds * 2 ** (state.attempts - 1), self.MAX_RETRY_DELAY_SECONDS)
+        logging.warning(
+            f'Failed to write the state of operation {operation_id} to the State API, '
+            f'retrying in {delay} seconds: {error}')
+        state.retry_at = asyncio.get_running_loop().time() + delay
+        self.__pending[key] = state
+
+    async def close(self):
+        """
+        Stops the flush loop once it has sent the remaining pending writes,
+        retrying the failed writes until they are sent or run out of attempts.
+
+        Raises
+        ------
+        OperationStateWriteError
+            Some writes could not be sent to the State API.
+        """
+        self.__closed = True
+        if self.__flush_task is not None and not self.__flush_task.done():
+            self.__pending_event.set()
+            await self.__flush_task
+        self.__flush_task = None
+        await self.flush()
+        while self.__pending:
+            await asyncio.sleep(self.__get_next_retry_delay() or 0)
+            await self.flush()
+
+        undelivered, self.__undelivered = self.__undelivered, []
+        if undelivered:
+            raise OperationStateWriteError(
+                f'The state of {len(undelivered)} operations could not be written to the State API: '
+                f'{", ".join(undelivered)}.',
+                undelivered)
@@ -0,0 +1,157 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+from foundationallm.models.operations import OperationStatus
+
+FINAL_STATUSES = (OperationStatus.COMPLETED, OperationStatus.FAILED)
+
+class OperationStateCache():
+    """
+    In-process LRU cache of operation statuses and results.
+
+    The cache is filled by the worker that runs an operation as it writes the
+    operation state, and by reads from the State API. The worker is the only writer
+    of the state of its operations, so the statuses it writes are kept, as are final
+    statuses and results, which never change. They are removed if the worker fails to
+    write them to the State API. Statuses of running operations read
+    from the State API expire after the time-to-live. Entries are evicted as least
+    recently used once the cache is full.
+    """
+    def __init__(self, max_size: int = 4096, ttl_seconds: float = 5):
+        """
+        Initializes the cache.
+
+        Parameters
+        ----------
+        max_size : int
+            The maximum number of cached statuses and results.
+        ttl_seconds : float
+            How long the status of a running operation read from the State API is served from the cache.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.__entries: OrderedDict[Tuple[str, str, str], Tuple[Any, Optional[float]]] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def is_final(status: str) -> bool:
+        """
+        Determines whether an operation status can no longer change.
+
+        Parameters
+        ----------
+        status : str
+            The operation status.
+
+        Returns
+        -------
+        True if the status is Completed or Failed, otherwise False.
+        """
+        return status in FINAL_STATUSES
+
+    def __get(self, key: Tuple[str, str, str]) -> Any:
+        """
+        Returns the cached value, or None if the key is not cached or has expired.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self.__entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.__entries[key]
+            self.misses += 1
+            return None
+
+    def __set(self, key: Tuple[str, str, str], value: Any, final: bool):
+        """
+        Caches the value, evicting the least recently used entries beyond the maximum size.
+        """
+        expires_at = None if final else time.monotonic() + self.ttl_seconds
+        with self.__lock:
+            self.__entries[key] = (value, expires_at)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+
+    def get_operation(self, operation_id: str, instance_id: str) -> Any:
+        """
+        Returns the cached status of an operation, or None if it is not cached.
+
+        Parameters
+        ----------
+        operation_id : str
+            The unique identifier for the operation.
+        instance_id : str
+            The unique identifier for the FLLM instance.
+        """
+        return self.__get((instance_id, operation_id, 'status'))
+
+    def set_operation(self, operation_id: str, instance_id: str, operation: Any, status: str,
+                      authoritative: bool = False):
+        """
+        Caches the status of an operation.
+
+        Parameters
+        ----------
+        operation_id : str
+            The unique identifier for the operation.
+        instance_id : str
+            The unique identifier for the FLLM instance.
+        operation : Any
+            The LongRunningOperation, or its dictionary representation.
+        status : str
+            The status of the operation. Statuses that are not final expire unless authoritative.
+        authoritative : bool
+            True when the status is written by the worker running the operation.
+        """
+        self.__set((instance_id, operation_id, 'status'), operation,
+                   authoritative or self.is_final(status))
+
+    def get_result(self, operation_id: str, instance_id: str) -> Any:
+        """
+        Returns the cached result of an operation, or None if it is not cached.
+
+        Parameters
+        ----------
+        operation_id : str
+            The unique identifier for the operation.
+        instance_id : str
+            The unique identifier for the FLLM instance.
+        """
+        return self.__get((instance_id, operation_id, 'result'))
+
+    def set_result(self, operation_id: str, instance_id: str, result: Any):
+        """
+        Caches the result of an operation. Results are final once they are set.
+
+        Parameters
+        ----------
+        operation_id : str
+            The unique identifier for the operation.
+        instance_id : str
+            The unique identifier for the FLLM instance.
+        result : Any
+            The CompletionResponse, or its dictionary representation.
+        """
+        self.__set((instance_id, operation_id, 'result'), result, True)
+
+    def remove_operation(self, operation_id: str, instance_id: str):
+        """
+        Removes the cached status and result of an operation, so they are read from the State API again.
+
+        Parameters
+        ----------
+        operation_id : str
+            The unique identifier for the operation.
+        instance_id : str
+            The unique identifier for the FLLM instance.
+        """
+        with self.__lock:
+            self.__entries.pop((instance_id, operation_id, 'status'), None)
+            self.__entries.pop((instance_id, operation_id, 'result'), None)
@@ -1,7 +1,6 @@
-import json
 import os
-import requests
 from typing import List
+import aiohttp
 from foundationallm.config import Configuration
 from foundationallm.models.operations import (
     LongRunningOperation,
@@ -9,19 +8,118 @@ from foundationallm.models.operations import (
     OperationStatus
 )
 from foundationallm.models.orchestration import CompletionResponse
+from foundationallm.services import RetryStrategy
+
+class StateAPITransientError(aiohttp.ClientResponseError):
+    """
+    Raised when the State API returns a status code that may be worth retrying.
+    """
 
 class OperationsManager():
     """
     Class for managing long running operations via calls to the StateAPI.
+
+    A single OperationsManager is meant to be created per application lifespan.
+    It owns a keep-alive aiohttp connection pool that is created on first use
+    and released by close().
     """
-    def __init__(self, config: Configuration):
+    # Retry with jitter on transient errors. Up to 2^x * 0.25 seconds between each retry
+    # until the range reaches 4 seconds. Stop after three attempts.
+    RETRY_STRATEGY = RetryStrategy('StateAPI', max_attempts=3, initial_delay=0.25, max_delay=4)
+
+    def __init__(
+        self,
+        config: Configuration,
+        timeout_seconds: float = 30,
+        max_connections: int = 100):
+        """
+        Initializes the operations manager.
+
+        Parameters
+        ----------
+        config : Configuration
+            The application configuration used to resolve the State API endpoint and key.
+        timeout_seconds : float
+            The total timeout of each State API call, including retries of the connection.
+        max_connections : int
+            The maximum number of pooled connections to the State API.
+        """
         self.config = config
         # Retrieve the State API configuration settings.
         self.state_api_url = config.get_value('FoundationaLLM:APIEndpoints:StateAPI:Essentials:APIUrl').rstrip('/')
         self.state_api_key = config.get_value('FoundationaLLM:APIEndpoints:StateAPI:Essentials:APIKey')
         env = os.environ.get('FOUNDATIONALLM_ENV', 'prod')
         self.verify_certs = False if env == 'dev' else True
-        
+        self.timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+        self.max_connections = max_connections
+        self.headers = {
+            "x-api-key": self.state_api_key,
+            "charset":"utf-8",
+            "Content-Type":"application/json"
+        }
+        self.__session: aiohttp.ClientSession = None
+
+    def __get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the pooled client session, creating it on first use.
+        """
+        if self.__session is None or self.__session.closed:
+            self.__session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    ssl=None if self.verify_certs else False
+                )
+            )
+        return self.__session
+
+    async def close(self):
+        """
+        Closes the pooled connections to the State API.
+        """
+        if self.__session is not None and not self.__session.closed:
+            await self.__session.close()
+        self.__session = None
+
+    async def __send(self, method: str, path: str, error_message: str, json: dict = None, idempotent: bool = True):
+        """
+        Sends a request to the State API and returns the parsed JSON response body,
+        or None if the State API returns 404.
+
+        Idempotent requests are retried on any transient error. Other requests are only retried
+        when the State API did not process them, so an operation is never created or completed twice.
+        """
+        return await self.RETRY_STRATEGY.get_async_retrying(idempotent)(
+            self.__send_once, method, path, error_message, json)
+
+    async def __send_once(self, method: str, path: str, error_message: str, json: dict = None):
+        """
+        Sends a single attempt of a request to the State API.
+        """
+        async with self.__get_session().request(
+            method,
+            f'{self.state_api_url}{path}',
+            json=json
+        ) as r:
+            if r.status == 404:
+                return None
+
+            if r.status != 200:
+                text = await r.text()
+                if r.status in RetryStrategy.TRANSIENT_STATUS_CODES:
+                    raise StateAPITransientError(
+                        r.request_info,
+                        r.history,
+                        status=r.status,
+                        message=f'{error_message}: ({r.status}) {text}',
+                        headers=r.headers)
+                raise Exception(f'{error_message}: ({r.status}) {text}')
+
+            if r.content_length == 0:
+                return None
+            return await r.json(content_type=None)
+
     async def create_operation(
         self,
         operation_id: str,
@@ -43,26 +141,16 @@ class OperationsManager():
         LongRunningOperation
             Object representing the operation.
         """               
-        try:
-            headers = {
-                "x-api-key": self.state_api_key,
-                "charset":"utf-8",
-                "Content-Type":"application/json"
-            }
-            
-            # Call the State API to create a new operation.
-            r = requests.post(
-                f'{self.state_api_url}/instances/{instance_id}/operations/{operation_id}',
-                headers=headers,
-                verify=self.verify_certs
-            )
+        operation = await self.__send(
+            'POST',
+            f'/instances/{instance_id}/operations/{operation_id}',
+            f'An error occurred while creating the operation {operation_id}',
+            idempotent=False)
 
-            if r.status_code != 200:
-                raise Exception(f'An error occurred while creating the operation {operation_id}: ({r.status_code}) {r.text}')
+        if operation is None:
+            raise Exception(f'An error occurred while creating the operation {operation_id}: (404)')
 
-            return r.json()
-        except Exception as e:
-            raise e
+        return operation
 
     async def update_operation(self,
         operation_id: str,
@@ -96,30 +184,11 @@ class OperationsManager():
             status_message=status_message
         )
         
-        try:
-            # Call the State API to create a new operation.
-            headers = {
-                "x-api-key": self.state_api_key,
-                "charset":"utf-8",
-                "Content-Type":"application/json"
-            }
-
-            r = requests.put(
-                f'{self.state_api_url}/instances/{instance_id}/operations/{operation_id}',
-                json=operation.model_dump(exclude_unset=True),
-                headers=headers,
-                verify=self.verify_certs
-            )
-
-            if r.status_code == 404:
-                return None
-
-            if r.status_code != 200:
-                raise Exception(f'An error occurred while updating the status of operation {operation_id}: ({r.status_code}) {r.text}')
-
-            return r.json()
-        except Exception as e:
-            raise e
+        return await self.__send(
+            'PUT',
+            f'/instances/{instance_id}/operations/{operation_id}',
+            f'An error occurred while updating the status of operation {operation_id}',
+            json=operation.model_dump(exclude_unset=True))
 
     async def get_operation(
         self,
@@ -142,31 +211,10 @@ class OperationsManager():
         LongRunningOperation
             Object representing the operation.
         """
-        try:
-            # Call the State API to create a new operation.
-            headers = {
-                "x-api-key": self.state_api_key,
-                "charset":"utf-8",
-                "Content-Type":"application/json"
-            }
-
-            print(f'status endpoint: {self.state_api_url}/instances/{instance_id}/operations/{operation_id}')
-
-            r = requests.get(
-                f'{self.state_api_url}/instances/{instance_id}/operations/{operation_id}',
-                headers=headers,
-                verify=self.verify_certs
-            )
-
-            if r.status_code == 404:
-                return None
-
-            if r.status_code != 200:
-                raise Exception(f'An error occurred while retrieving the status of the operation {operation_id}: ({r.status_code}) {r.text}')
-
-            return r.json()
-        except Exception as e:
-            raise e
+        return await self.__send(
+            'GET',
+            f'/instances/{instance_id}/operations/{operation_id}',
+            f'An error occurred while retrieving the status of the operation {operation_id}')
 
     async def set_operation_result(
         self,
@@ -187,29 +235,12 @@ class OperationsManager():
         completion_response : CompletionResponse
             The result of the operation.
         """
-        try:
-            # Call the State API to create a new operation.
-            headers = {
-                "x-api-key": self.state_api_key,
-                "charset":"utf-8",
-                "Content-Type":"application/json"
-            }
-
-            r = requests.post(
-                f'{self.state_api_url}/instances/{instance_id}/operations/{operation_id}/result',
-                json=completion_response.model_dump(),
-                headers=headers,
-                verify=self.verify_certs
-            )
-
-            if r.status_code == 404:
-                return None
-
-            if r.status_code != 200:
-                raise Exception(f'An error occurred while submitting the result of operation {operation_id}: ({r.status_code}) {r.text}')
-
-        except Exception as e:
-            raise e
+        await self.__send(
+            'POST',
+            f'/instances/{instance_id}/operations/{operation_id}/result',
+            f'An error occurred while submitting the result of operation {operation_id}',
+            json=completion_response.model_dump(),
+            idempotent=False)
 
     async def get_operation_result(
         self,
@@ -232,29 +263,10 @@ class OperationsManager():
         CompletionResponse
             Object representing the operation result.
         """
-        try:
-            # Call the State API to create a new operation.
-            headers = {
-                "x-api-key": self.state_api_key,
-                "charset":"utf-8",
-                "Content-Type":"application/json"
-            }
-
-            r = requests.get(
-                f'{self.state_api_url}/instances/{instance_id}/operations/{operation_id}/result',
-                headers=headers,
-                verify=self.verify_certs
-            )
-
-            if r.status_code == 404:
-                return None
-
-            if r.status_code != 200:
-                raise Exception(f'An error occurred while retrieving the result of operation {operation_id}: ({r.status_code}) {r.text}')
-
-            return r.json()
-        except Exception as e:
-            raise e
+        return await self.__send(
+            'GET',
+            f'/instances/{instance_id}/operations/{operation_id}/result',
+            f'An error occurred while retrieving the result of operation {operation_id}')
 
     async def get_operation_log(
         self,
@@ -277,26 +289,7 @@ class OperationsManager():
         List[LongRunningOperationLogEntry]
             List of log entries for the operation.
         """
-        try:
-            # Call the State API to create a new operation.
-            headers = {
-                "x-api-key": self.state_api_key,
-                "charset":"utf-8",
-                "Content-Type":"application/json"
-            }
-
-            r = requests.get(
-                f'{self.state_api_url}/instances/{instance_id}/operations/{operation_id}/logs',
-                headers=headers,
-                verify=self.verify_certs
-            )
-
-            if r.status_code == 404:
-                return None
-
-            if r.status_code != 200:
-                raise Exception(f'An error occurred while retrieving the log of steps for the operation {operation_id}: ({r.status_code}) {r.text}')
-
-            return r.json()
-        except Exception as e:
-            raise e
+        return await self.__send(
+            'GET',
+            f'/instances/{instance_id}/operations/{operation_id}/logs',
+            f'An error occurred while retrieving the log of steps for the operation {operation_id}')
@@ -1,3 +1,6 @@
 from .image_analysis_service import ImageAnalysisService
 from .openai_assistants_api_service import OpenAIAssistantsApiService
 from .http_client_service import HttpClientService
+from .http_session_pool import HttpSessionPool
+from .circuit_breaker import CircuitBreaker, CircuitBreakerOpenError, CircuitBreakerStates
+from .retry_strategy import RetryStrategy, RetryStrategyNames, get_retry_strategy
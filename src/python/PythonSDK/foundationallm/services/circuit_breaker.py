@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Hashable
+
+class CircuitBreakerStates(str, Enum):
+    """Enumerator of the states of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitBreakerOpenError(Exception):
+    """
+    Raised when a request is not sent because the circuit breaker of its endpoint is open.
+    """
+
+class CircuitBreaker():
+    """
+    Stops sending requests to an endpoint that keeps failing.
+
+    The circuit opens after a number of consecutive transient failures, and requests then fail
+    immediately instead of waiting for timeouts and retries. Once the recovery time has elapsed,
+    a single trial request is let through: the circuit closes if it succeeds and opens again if it fails.
+    """
+    # The maximum number of endpoint circuit breakers kept.
+    MAX_CIRCUIT_BREAKERS = 256
+
+    __circuit_breakers: OrderedDict[Hashable, 'CircuitBreaker'] = OrderedDict()
+    __circuit_breakers_lock = threading.Lock()
+
+    def __init__(self, failure_threshold: int = 5, recovery_seconds: float = 30):
+        """
+        Initializes the circuit breaker.
+
+        Parameters
+        ----------
+        failure_threshold : int
+            The number of consecutive failures that open the circuit.
+        recovery_seconds : float
+            The number of seconds the circuit stays open before a trial request is let through.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.state = CircuitBreakerStates.CLOSED
+        self.failure_count = 0
+        self.rejected_count = 0
+        self.__opened_at = 0.0
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def get_or_create(cls, key: Hashable) -> 'CircuitBreaker':
+        """
+        Returns the circuit breaker of an endpoint, creating it on first use.
+
+        Parameters
+        ----------
+        key : Hashable
+            Identifies the endpoint, usually by its base URL.
+
+        Returns
+        -------
+        CircuitBreaker
+            The circuit breaker shared by every client of the endpoint.
+        """
+        with cls.__circuit_breakers_lock:
+            circuit_breaker = cls.__circuit_breakers.get(key)
+            if circuit_breaker is None:
+                circuit_breaker = cls.__circuit_breakers[key] = CircuitBreaker()
+                while len(cls.__circuit_breakers) > cls.MAX_CIRCUIT_BREAKERS:
+                    cls.__circuit_breakers.popitem(last=False)
+            cls.__circuit_breakers.move_to_end(key)
+            return circuit_breaker
+
+    def before_request(self) -> bool:
+        """
+        Checks that a request may be sent.
+
+        Returns
+        -------
+        bool
+            True if the request is the trial request of a half-open circuit.
+            Its outcome must be recorded, or its trial released with release_trial.
+
+        Raises
+        ------
+        CircuitBreakerOpenError
+            The circuit is open, or a trial request is already in progress.
+        """
+        with self.__lock:
+            if self.state == CircuitBreakerStates.CLOSED:
+                return False
+            if self.state == CircuitBreakerStates.OPEN \
+                and time.monotonic() - self.__opened_at >= self.recovery_seconds:
+                self.state = CircuitBreakerStates.HALF_OPEN
+                return True
+            self.rejected_count += 1
+        raise CircuitBreakerOpenError(
+            f'The requests to the endpoint are suspended after {self.failure_count} consecutive failures.')
+
+    def release_trial(self):
+        """
+        Releases the trial of a request that ended without an outcome, for instance because it was cancelled.
+        The circuit opens again, and the next request is let through as the new trial request.
+        """
+        with self.__lock:
+            if self.state == CircuitBreakerStates.HALF_OPEN:
+                # The recovery time of the previous opening has already elapsed.
+                self.state = CircuitBreakerStates.OPEN
+
+    def record_success(self):
+        """
+        Records a request that reached the endpoint, which closes the circuit.
+        """
+        with self.__lock:
+            self.state = CircuitBreakerStates.CLOSED
+            self.failure_count = 0
+
+    def record_failure(self):
+        """
+        Records a request that failed with a transient error, which may open the circuit.
+        """
+        with self.__lock:
+            self.failure_count += 1
+            if self.state == CircuitBreakerStates.HALF_OPEN or self.failure_count >= self.failure_threshold:
+                self.state = CircuitBreakerStates.OPEN
+                self.__opened_at = time.monotonic()
@@ -1 +1,4 @@
 from .gateway_text_embedding_service import GatewayTextEmbeddingService
+from .text_embedding_cache import TextEmbeddingCache
+from .adaptive_polling_delay import AdaptivePollingDelay
+from .embedding_operation_metrics import EmbeddingOperationMetrics
@@ -0,0 +1,52 @@
+"""
+Class: AdaptivePollingDelay
+Description: Computes the delays between the polls of a long-running Gateway API operation.
+"""
+from typing import Mapping, Optional
+from foundationallm.services.retry_strategy import RetryStrategy
+
+class AdaptivePollingDelay():
+    """
+    Computes the delays between the polls of a long-running Gateway API operation.
+
+    The first poll happens after a short delay, so fast operations complete quickly,
+    and the delay grows exponentially up to a cap for slow operations.
+    A Retry-After header returned by the Gateway API takes precedence over the computed delay,
+    up to RetryStrategy.MAX_RETRY_AFTER_SECONDS.
+    """
+    def __init__(self, initial_delay: float = 0.05, multiplier: float = 2.0, max_delay: float = 1.0):
+        """
+        Initializes the polling delay.
+
+        Parameters
+        ----------
+        initial_delay : float
+            The delay before the first poll, in seconds.
+        multiplier : float
+            The factor applied to the delay after each poll.
+        max_delay : float
+            The maximum computed delay, in seconds.
+        """
+        self.initial_delay = initial_delay
+        self.multiplier = multiplier
+        self.max_delay = max_delay
+        self.__delay = initial_delay
+
+    def get_next_delay(self, headers: Optional[Mapping[str, str]] = None) -> float:
+        """
+        Returns the delay before the next poll.
+
+        Parameters
+        ----------
+        headers : Mapping[str, str]
+            The headers of the last response of the Gateway API.
+
+        Returns
+        -------
+        float
+            The delay before the next poll, in seconds.
+        """
+        delay = self.__delay
+        self.__delay = min(self.__delay * self.multiplier, self.max_delay)
+        retry_after = RetryStrategy.get_retry_after(headers)
+        return delay if retry_after is None else min(retry_after, RetryStrategy.MAX_RETRY_AFTER_SECONDS)
@@ -0,0 +1,16 @@
+"""
+Class: EmbeddingOperationMetrics
+Description: Metrics of a Gateway API text embedding operation.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class EmbeddingOperationMetrics():
+    """
+    Metrics of a Gateway API text embedding operation.
+    """
+    operation_id: Optional[str] = None
+    poll_count: int = 0
+    wait_seconds: float = 0.0
+    duration_seconds: float = 0.0
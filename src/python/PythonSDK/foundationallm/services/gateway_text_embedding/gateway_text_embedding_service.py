@@ -3,12 +3,20 @@ Class: GatewayTextEmbeddingService
 Description:  Class responsible for obtaining text embedding vectors from the Gateway API.
 """
 import asyncio
+import concurrent.futures
+import logging
+import threading
 import time
+from typing import Dict, List, Mapping, Tuple
+import numpy as np
 from foundationallm.config import Configuration, UserIdentity
 from foundationallm.models.resource_providers.configuration import APIEndpointConfiguration
 from foundationallm.models.services import GatewayTextEmbeddingResponse
 from foundationallm.services import HttpClientService
+from .adaptive_polling_delay import AdaptivePollingDelay
+from .embedding_operation_metrics import EmbeddingOperationMetrics
 from .text_chunk import TextChunk
+from .text_embedding_cache import TextEmbeddingCache
 from .text_embedding_request import TextEmbeddingRequest
 from .text_embedding_response import TextEmbeddingResponse
 
@@ -16,68 +24,391 @@ class GatewayTextEmbeddingService():
     """
     Class for obtaining embedding vectors from the Gateway API.
     """
+    # The default maximum number of tokens of the texts embedded by one operation.
+    # Operations within the limit are embedded by a single Azure OpenAI request.
+    MAX_BATCH_TOKENS = 8191
+    # The default maximum number of texts embedded by one operation.
+    MAX_BATCH_SIZE = 2048
+    # The maximum number of seconds a batch waits for the tokenizer to load.
+    # Token counts are estimated until it is loaded.
+    TOKENIZER_LOAD_TIMEOUT_SECONDS = 5
+    # The share of max_batch_tokens filled when the token counts are estimated, since the
+    # estimate is too low for the texts with fewer than 4 characters per token.
+    ESTIMATED_BATCH_TOKENS_RATIO = 0.5
+
+    # Totals of the embedding operations run by all the services of the process.
+    operation_count = 0
+    poll_count = 0
+    wait_seconds = 0.0
+    __metrics_lock = threading.Lock()
+
+    __encoding_future: concurrent.futures.Future = None
+    __encoding_lock = threading.Lock()
+
     def __init__(self,
                  instance_id:str,
                  user_identity:UserIdentity,
                  gateway_api_endpoint_configuration: APIEndpointConfiguration,
                  model_name:str,
-                 config: Configuration):
+                 config: Configuration,
+                 cache: TextEmbeddingCache = None,
+                 max_batch_tokens: int = MAX_BATCH_TOKENS,
+                 max_batch_size: int = MAX_BATCH_SIZE):
         self.http_client = HttpClientService(gateway_api_endpoint_configuration, user_identity, config)       
         self.model_name = model_name
         self.config = config
+        self.cache = cache or TextEmbeddingCache.get_default()
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
         self.url =  f'/instances/{instance_id}/embeddings'
+        self.last_operation_metrics: EmbeddingOperationMetrics = None
         
     def get_embedding(self, text: str) -> GatewayTextEmbeddingResponse:
         """
         Get the embedding vector for a given text.
         """        
-        # create the text embedding request        
-        text_embedding_request = self._create_text_embedding_request(text)
-        
-        # start the operation
-        request_json = text_embedding_request.model_dump_json(by_alias=True)
-        
-        resp = self.http_client.post(self.url, data=request_json)        
-        response = TextEmbeddingResponse.model_validate(resp)        
-        # poll until completion
-        while response.in_progress and not response.failed:            
-            # delay for a second in between polling            
-            time.sleep(1)
-            get_resp = self.http_client.get(self.url + f'?operationId={response.operation_id}')            
-            response = TextEmbeddingResponse.model_validate(get_resp)
-
-        if response.failed:
-            raise Exception(f"Text embedding operation failed: {response.error_message}")
-
-        return GatewayTextEmbeddingResponse(
-            embedding_vector=response.text_chunks[0].embedding,
-            tokens_count=response.text_chunks[0].tokens_count)
+        return self._embed_texts([text])[0]
 
     async def aget_embedding(self, text: str) -> GatewayTextEmbeddingResponse:
         """
         Asynchronously get the embedding vector for a given text.
         """
-        
-        text_embedding_request = self._create_text_embedding_request(text)
+        return (await self._aembed_texts([text]))[0]
 
-        # start the operation
-        request_json = text_embedding_request.model_dump_json(by_alias=True)
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Get the embedding vectors of several texts with as few Gateway API operations as possible.
 
-        # Send asynchronous POST request to start the operation
-        response = TextEmbeddingResponse.model_validate(await self.http_client.apost(self.url, data=request_json))
-        
-        # Poll until operation is complete
-        while response.in_progress and not response.failed:
-            await asyncio.sleep(1)  # Use asyncio.sleep for non-blocking delay
-            response = TextEmbeddingResponse.model_validate(await self.http_client.aget(self.url + f'?operationId={response.operation_id}'))
-        
+        Parameters
+        ----------
+        texts : List[str]
+            The texts to embed.
+
+        Returns
+        -------
+        np.ndarray
+            The float32 embedding vectors, one row per text, in the order of the texts.
+        """
+        return self._to_array(self._embed_texts(texts))
+
+    async def aget_embeddings(self, texts: List[str]) -> np.ndarray:
+        """
+        Asynchronously get the embedding vectors of several texts with as few Gateway API operations as possible.
+
+        Parameters
+        ----------
+        texts : List[str]
+            The texts to embed.
+
+        Returns
+        -------
+        np.ndarray
+            The float32 embedding vectors, one row per text, in the order of the texts.
+        """
+        return self._to_array(await self._aembed_texts(texts))
+
+    @classmethod
+    def get_metrics(cls) -> dict:
+        """
+        Returns the number of embedding operations run by the process,
+        with their average number of polls and time spent waiting between polls.
+        """
+        with cls.__metrics_lock:
+            operation_count = max(cls.operation_count, 1)
+            return {
+                'operations': cls.operation_count,
+                'polls': cls.poll_count,
+                'wait_seconds': cls.wait_seconds,
+                'average_polls': cls.poll_count / operation_count,
+                'average_wait_seconds': cls.wait_seconds / operation_count
+            }
+
+    @classmethod
+    def __load_encoding(cls) -> concurrent.futures.Future:
+        """
+        Starts loading the tokenizer of the OpenAI embedding models in a background thread on first use.
+        Loading the tokenizer may download its definition, so it is never loaded by the calling thread.
+        """
+        with cls.__encoding_lock:
+            if cls.__encoding_future is None:
+                future = concurrent.futures.Future()
+                # The load cannot be cancelled by a caller that stops waiting for it.
+                future.set_running_or_notify_cancel()
+
+                def load():
+                    try:
+                        import tiktoken
+                        future.set_result(tiktoken.get_encoding('cl100k_base'))
+                    except Exception as e:
+                        logging.warning(f'The tokenizer could not be loaded, token counts will be estimated: {e}')
+                        future.set_result(None)
+
+                threading.Thread(target=load, name='tokenizer-loader', daemon=True).start()
+                cls.__encoding_future = future
+            return cls.__encoding_future
+
+    @classmethod
+    def get_encoding(cls):
+        """
+        Returns the tokenizer of the OpenAI embedding models, waiting at most
+        TOKENIZER_LOAD_TIMEOUT_SECONDS for it to load.
+
+        Returns
+        -------
+        tiktoken.Encoding
+            The tokenizer, or None if it is not loaded yet or could not be loaded.
+        """
+        try:
+            return cls.__load_encoding().result(timeout=cls.TOKENIZER_LOAD_TIMEOUT_SECONDS)
+        except concurrent.futures.TimeoutError:
+            return None
+
+    @classmethod
+    async def aget_encoding(cls):
+        """
+        Asynchronously returns the tokenizer of the OpenAI embedding models, waiting at most
+        TOKENIZER_LOAD_TIMEOUT_SECONDS for it to load without blocking the event loop.
+
+        Returns
+        -------
+        tiktoken.Encoding
+            The tokenizer, or None if it is not loaded yet or could not be loaded.
+        """
+        try:
+            # The load is shielded, so a timeout does not cancel it for the next batches.
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(cls.__load_encoding())),
+                cls.TOKENIZER_LOAD_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            return None
+
+    @staticmethod
+    def get_tokens_count(text: str, encoding) -> int:
+        """
+        Returns the number of tokens of a text for the OpenAI embedding models.
+
+        Parameters
+        ----------
+        text : str
+            The text.
+        encoding : tiktoken.Encoding
+            The tokenizer. The number of tokens is estimated from the length of the text when it is None.
+
+        Returns
+        -------
+        int
+            The number of tokens of the text.
+        """
+        if encoding is None:
+            return len(text) // 4 + 1
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def _embed_texts(self, texts: List[str]) -> List[GatewayTextEmbeddingResponse]:
+        """
+        Returns the embeddings of several texts, starting all the operations before waiting for them.
+        """
+        embeddings, pending_texts = self._get_cached_embeddings(texts)
+        # A single text is sent as is, so it is not tokenized.
+        encoding = self.get_encoding() if len(pending_texts) > 1 else None
+        batches = self._create_batches(pending_texts, encoding)
+        start_time = time.perf_counter()
+        operations = [self._start_operation(batch) for batch in batches]
+        for batch, (response, headers, metrics) in zip(batches, operations):
+            response = self._wait_for_operation(response, headers, metrics, start_time)
+            self._set_embeddings(batch, response, pending_texts, embeddings)
+        return embeddings
+
+    async def _aembed_texts(self, texts: List[str]) -> List[GatewayTextEmbeddingResponse]:
+        """
+        Asynchronously returns the embeddings of several texts, running the operations concurrently.
+        """
+        embeddings, pending_texts = self._get_cached_embeddings(texts)
+        if len(pending_texts) > 1:
+            # Tokenizing the texts is CPU-bound, so it does not run on the event loop.
+            batches = await asyncio.to_thread(self._create_batches, pending_texts, await self.aget_encoding())
+        else:
+            # A single text is sent as is, so it is not tokenized.
+            batches = self._create_batches(pending_texts, None)
+        start_time = time.perf_counter()
+
+        async def run_operation(batch: List[TextChunk]) -> TextEmbeddingResponse:
+            response, headers, metrics = await self._astart_operation(batch)
+            return await self._await_operation(response, headers, metrics, start_time)
+
+        responses = await asyncio.gather(*(run_operation(batch) for batch in batches))
+        for batch, response in zip(batches, responses):
+            self._set_embeddings(batch, response, pending_texts, embeddings)
+        return embeddings
+
+    def _get_cached_embeddings(
+        self,
+        texts: List[str]) -> Tuple[List[GatewayTextEmbeddingResponse], Dict[str, List[int]]]:
+        """
+        Returns the cached embedding of each text, or None if it is not cached,
+        and the positions of each distinct text that must be embedded.
+        """
+        embeddings = [None] * len(texts)
+        pending_texts: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            positions = pending_texts.get(text)
+            if positions is not None:
+                positions.append(i)
+                continue
+            embeddings[i] = self.cache.get(self.model_name, text)
+            if embeddings[i] is None:
+                pending_texts[text] = [i]
+        return embeddings, pending_texts
+
+    def _create_batches(self, texts: Dict[str, List[int]], encoding) -> List[List[TextChunk]]:
+        """
+        Splits texts into batches within the token and size limits of an embedding operation.
+        A single text makes a single batch and is not tokenized. The length of the texts is not
+        checked, whether they are batched or not: the Gateway API rejects the texts that exceed
+        the token limit of the embedding model.
+        """
+        if len(texts) <= 1:
+            return [[TextChunk(position=1, content=text) for text in texts]] if len(texts) > 0 else []
+        max_batch_tokens = self.max_batch_tokens if encoding is not None \
+            else int(self.max_batch_tokens * self.ESTIMATED_BATCH_TOKENS_RATIO)
+        batches: List[List[TextChunk]] = []
+        batch: List[TextChunk] = []
+        batch_tokens = 0
+        for text in texts:
+            tokens_count = self.get_tokens_count(text, encoding)
+            if len(batch) > 0 and (
+                batch_tokens + tokens_count > max_batch_tokens or len(batch) >= self.max_batch_size):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(TextChunk(position=len(batch) + 1, content=text, tokens_count=tokens_count))
+            batch_tokens += tokens_count
+        if len(batch) > 0:
+            batches.append(batch)
+        return batches
+
+    def _start_operation(
+        self,
+        text_chunks: List[TextChunk]) -> Tuple[TextEmbeddingResponse, Mapping[str, str], EmbeddingOperationMetrics]:
+        """
+        Starts an embedding operation.
+        """
+        request_json = self._create_text_embedding_request(text_chunks).model_dump_json(by_alias=True)
+        resp, headers = self.http_client.post(self.url, data=request_json, return_headers=True)
+        response = TextEmbeddingResponse.model_validate(resp)
+        return response, headers, EmbeddingOperationMetrics(operation_id=response.operation_id)
+
+    async def _astart_operation(
+        self,
+        text_chunks: List[TextChunk]) -> Tuple[TextEmbeddingResponse, Mapping[str, str], EmbeddingOperationMetrics]:
+        """
+        Asynchronously starts an embedding operation.
+        """
+        request_json = self._create_text_embedding_request(text_chunks).model_dump_json(by_alias=True)
+        resp, headers = await self.http_client.apost(self.url, data=request_json, return_headers=True)
+        response = TextEmbeddingResponse.model_validate(resp)
+        return response, headers, EmbeddingOperationMetrics(operation_id=response.operation_id)
+
+    def _wait_for_operation(
+        self,
+        response: TextEmbeddingResponse,
+        headers: Mapping[str, str],
+        metrics: EmbeddingOperationMetrics,
+        start_time: float) -> TextEmbeddingResponse:
+        """
+        Polls an embedding operation until completion, unless the vectors were returned inline.
+        """
+        polling_delay = AdaptivePollingDelay()
+        while self._is_pending(response):
+            delay = polling_delay.get_next_delay(headers)
+            time.sleep(delay)
+            metrics.wait_seconds += delay
+            metrics.poll_count += 1
+            get_resp, headers = self.http_client.get(
+                self.url + f'?operationId={response.operation_id}', return_headers=True)
+            response = TextEmbeddingResponse.model_validate(get_resp)
+        self._record_operation_metrics(metrics, start_time)
+        return response
+
+    async def _await_operation(
+        self,
+        response: TextEmbeddingResponse,
+        headers: Mapping[str, str],
+        metrics: EmbeddingOperationMetrics,
+        start_time: float) -> TextEmbeddingResponse:
+        """
+        Asynchronously polls an embedding operation until completion, unless the vectors were returned inline.
+        """
+        polling_delay = AdaptivePollingDelay()
+        while self._is_pending(response):
+            delay = polling_delay.get_next_delay(headers)
+            await asyncio.sleep(delay)
+            metrics.wait_seconds += delay
+            metrics.poll_count += 1
+            get_resp, headers = await self.http_client.aget(
+                self.url + f'?operationId={response.operation_id}', return_headers=True)
+            response = TextEmbeddingResponse.model_validate(get_resp)
+        self._record_operation_metrics(metrics, start_time)
+        return response
+
+    def _is_pending(self, response: TextEmbeddingResponse) -> bool:
+        """
+        Returns True if the embedding operation is still running and its vectors were not returned yet.
+        """
+        if not response.in_progress or response.failed:
+            return False
+        return not response.text_chunks or any(chunk.embedding is None for chunk in response.text_chunks)
+
+    def _record_operation_metrics(self, metrics: EmbeddingOperationMetrics, start_time: float):
+        """
+        Records the metrics of a completed embedding operation.
+        """
+        metrics.duration_seconds = time.perf_counter() - start_time
+        self.last_operation_metrics = metrics
+        cls = GatewayTextEmbeddingService
+        with cls.__metrics_lock:
+            cls.operation_count += 1
+            cls.poll_count += metrics.poll_count
+            cls.wait_seconds += metrics.wait_seconds
+        logging.debug(
+            f'Text embedding operation {metrics.operation_id} completed in {metrics.duration_seconds:.3f}s '
+            f'after {metrics.poll_count} polls.')
+
+    def _set_embeddings(
+        self,
+        text_chunks: List[TextChunk],
+        response: TextEmbeddingResponse,
+        pending_texts: Dict[str, List[int]],
+        embeddings: List[GatewayTextEmbeddingResponse]):
+        """
+        Sets the embeddings of a completed operation at the positions of their texts and adds them to the cache.
+        """
         if response.failed:
             raise Exception(f"Text embedding operation failed: {response.error_message}")
+        if not response.text_chunks or len(response.text_chunks) != len(text_chunks):
+            raise Exception(
+                f"Text embedding operation {response.operation_id} returned "
+                f"{len(response.text_chunks or [])} embeddings for {len(text_chunks)} texts.")
+
+        # The positions of the text chunks are one-based.
+        for result_chunk in response.text_chunks:
+            text = text_chunks[result_chunk.position - 1].content
+            embedding = GatewayTextEmbeddingResponse(
+                embedding_vector=result_chunk.embedding,
+                tokens_count=result_chunk.tokens_count)
+            self.cache.set(self.model_name, text, embedding)
+            for i in pending_texts[text]:
+                embeddings[i] = embedding
 
-        return GatewayTextEmbeddingResponse(
-            embedding_vector=response.text_chunks[0].embedding,
-            tokens_count=response.text_chunks[0].tokens_count)
+    def _to_array(self, embeddings: List[GatewayTextEmbeddingResponse]) -> np.ndarray:
+        """
+        Returns the vectors of several embeddings as the rows of a contiguous float32 array.
+        """
+        if len(embeddings) == 0:
+            return np.empty((0, 0), dtype=np.float32)
+        vectors = np.empty((len(embeddings), len(embeddings[0].embedding_vector)), dtype=np.float32)
+        for i, embedding in enumerate(embeddings):
+            vectors[i] = embedding.embedding_vector
+        return vectors
 
-    def _create_text_embedding_request(self, text: str) -> TextEmbeddingRequest:
-        text_chunk = TextChunk(content=text)
-        return TextEmbeddingRequest(text_chunks=[text_chunk], embedding_model_name=self.model_name, prioritized=True)
+    def _create_text_embedding_request(self, text_chunks: List[TextChunk]) -> TextEmbeddingRequest:
+        return TextEmbeddingRequest(text_chunks=text_chunks, embedding_model_name=self.model_name, prioritized=True)
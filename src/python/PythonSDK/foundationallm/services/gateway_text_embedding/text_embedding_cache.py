@@ -0,0 +1,393 @@
+"""
+Class: TextEmbeddingCache
+Description: Cache of the text embeddings obtained from the Gateway API.
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import numpy as np
+from foundationallm.config.environment_variables import (
+    FOUNDATIONALLM_EMBEDDING_CACHE_SIZE,
+    FOUNDATIONALLM_EMBEDDING_CACHE_PATH,
+    FOUNDATIONALLM_EMBEDDING_CACHE_DISK_CAPACITY
+)
+from foundationallm.models.services import GatewayTextEmbeddingResponse
+try:
+    import fcntl
+except ImportError:
+    # File locks are not available on Windows, where the store files are named after the process instead.
+    fcntl = None
+
+class MemoryMappedEmbeddingStore():
+    """
+    On-disk store of the embeddings of one embedding model.
+
+    The vectors are stored as float32 in a memory-mapped file with a fixed number of slots,
+    which are reused in insertion order once they are all taken. The key, insertion sequence
+    and token count of each slot are stored in a second memory-mapped file, which is scanned
+    when the store is opened. Storing an embedding only writes to mapped memory, so it never
+    waits for the disk: the operating system writes the pages back, and flush forces it.
+
+    A store is locked by the process that opens it, so processes sharing a directory never
+    write to the same files.
+    """
+    # The layout of the slot records. The key is the SHA-256 digest of the text, and a
+    # sequence of 0 marks an empty slot.
+    SLOT_DTYPE = np.dtype([('key', np.uint8, (32,)), ('sequence', np.int64), ('tokens_count', np.int32)])
+
+    def __init__(self, path: str, capacity: int):
+        """
+        Initializes the store.
+
+        Parameters
+        ----------
+        path : str
+            The path of the store files, without extension.
+        capacity : int
+            The maximum number of stored vectors.
+
+        Raises
+        ------
+        BlockingIOError
+            The store is locked by another process.
+        """
+        self.vectors_path = f'{path}.f32'
+        self.slots_path = f'{path}.slots'
+        self.capacity = capacity
+        self.dimensions = None
+        self.__vectors: np.memmap = None
+        self.__records: np.memmap = None
+        self.__slots: Dict[str, int] = {}
+        self.__keys = [None] * capacity
+        self.__next_slot = 0
+        self.__sequence = 0
+        self.__lock_file = self.__lock(f'{path}.lock')
+        try:
+            self.__load()
+        except Exception:
+            self.close()
+            raise
+
+    @staticmethod
+    def __lock(lock_path: str):
+        """
+        Locks the store for the lifetime of the returned file, which must be kept open.
+        """
+        lock_file = open(lock_path, 'a+', encoding='utf-8')
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                raise BlockingIOError(f'The embedding store {lock_path} is locked by another process.')
+        return lock_file
+
+    def __load(self):
+        """
+        Opens the store files and reads the slot of each key, if the store exists.
+        """
+        record_size = self.capacity * self.SLOT_DTYPE.itemsize
+        if not os.path.exists(self.slots_path) or not os.path.exists(self.vectors_path) \
+            or os.path.getsize(self.slots_path) != record_size:
+            # The store does not exist or was created with another capacity.
+            return
+        vectors_size = os.path.getsize(self.vectors_path)
+        if vectors_size == 0 or vectors_size % (self.capacity * 4) != 0:
+            return
+        self.dimensions = vectors_size // (self.capacity * 4)
+        self.__records = np.memmap(self.slots_path, dtype=self.SLOT_DTYPE, mode='r+', shape=(self.capacity,))
+        self.__vectors = np.memmap(
+            self.vectors_path, dtype=np.float32, mode='r+', shape=(self.capacity, self.dimensions))
+
+        sequences = np.asarray(self.__records['sequence'])
+        for slot in np.flatnonzero(sequences > 0):
+            key = self.__records['key'][slot].tobytes().hex()
+            self.__keys[slot] = key
+            self.__slots[key] = int(slot)
+        if len(self.__slots) > 0:
+            last_slot = int(np.argmax(sequences))
+            self.__sequence = int(sequences[last_slot])
+            self.__next_slot = (last_slot + 1) % self.capacity
+
+    def __create(self, dimensions: int):
+        """
+        Creates the store files for vectors of a number of dimensions.
+        """
+        self.dimensions = dimensions
+        self.__records = np.memmap(self.slots_path, dtype=self.SLOT_DTYPE, mode='w+', shape=(self.capacity,))
+        self.__vectors = np.memmap(
+            self.vectors_path, dtype=np.float32, mode='w+', shape=(self.capacity, self.dimensions))
+
+    def get(self, key: str) -> Optional[GatewayTextEmbeddingResponse]:
+        """
+        Returns the stored embedding of a key, or None if it is not stored.
+        """
+        slot = self.__slots.get(key)
+        if slot is None:
+            return None
+        return GatewayTextEmbeddingResponse(
+            embedding_vector=self.__vectors[slot].tolist(),
+            tokens_count=int(self.__records['tokens_count'][slot]))
+
+    def set(self, key: str, embedding: GatewayTextEmbeddingResponse):
+        """
+        Stores the embedding of a key, replacing the oldest stored embedding if the store is full.
+
+        Parameters
+        ----------
+        key : str
+            The hexadecimal SHA-256 digest of the text.
+        embedding : GatewayTextEmbeddingResponse
+            The embedding of the text.
+        """
+        if key in self.__slots:
+            return
+        if self.__vectors is None:
+            self.__create(len(embedding.embedding_vector))
+        if len(embedding.embedding_vector) != self.dimensions:
+            return
+
+        slot = self.__next_slot
+        self.__next_slot = (slot + 1) % self.capacity
+        previous_key = self.__keys[slot]
+        if previous_key is not None:
+            del self.__slots[previous_key]
+        # The slot is marked empty while it is rewritten, so a crash cannot pair a key with another vector.
+        self.__records['sequence'][slot] = 0
+        self.__vectors[slot] = embedding.embedding_vector
+        self.__records['key'][slot] = np.frombuffer(bytes.fromhex(key), dtype=np.uint8)
+        self.__records['tokens_count'][slot] = embedding.tokens_count or 0
+        self.__sequence += 1
+        self.__records['sequence'][slot] = self.__sequence
+        self.__keys[slot] = key
+        self.__slots[key] = slot
+
+    def flush(self):
+        """
+        Writes the modified vectors and slots to disk.
+        """
+        if self.__vectors is not None:
+            self.__vectors.flush()
+            self.__records.flush()
+
+    def close(self):
+        """
+        Writes the store to disk and releases its lock.
+        """
+        self.flush()
+        self.__vectors = None
+        self.__records = None
+        self.__slots.clear()
+        if not self.__lock_file.closed:
+            self.__lock_file.close()
+
+class TextEmbeddingCache():
+    """
+    Cache of text embeddings keyed by embedding model and normalized text.
+
+    Recently used embeddings are kept in an in-memory LRU tier. When a path is set,
+    embeddings are also kept in memory-mapped files, one store per embedding model, so they
+    survive restarts and can hold many more vectors than the in-memory tier. The processes
+    sharing a path, such as the workers of an API, each open the first store of the model
+    that is not locked by another process.
+    """
+    # The maximum number of stores of a model, and so of processes sharing its on-disk tier.
+    MAX_STORES_PER_MODEL = 16
+
+    __default: 'TextEmbeddingCache' = None
+    __default_lock = threading.Lock()
+
+    def __init__(self, max_size: int = 1024, path: str = None, disk_capacity: int = 65536):
+        """
+        Initializes the cache.
+
+        Parameters
+        ----------
+        max_size : int
+            The maximum number of embeddings in the in-memory tier. 0 disables the cache.
+        path : str
+            The directory of the on-disk tier. The on-disk tier is disabled when not set.
+        disk_capacity : int
+            The maximum number of embeddings of each model in the on-disk tier.
+        """
+        self.max_size = max_size
+        self.path = path
+        self.disk_capacity = disk_capacity
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.__entries: OrderedDict[Tuple[str, str], GatewayTextEmbeddingResponse] = OrderedDict()
+        self.__stores: Dict[str, MemoryMappedEmbeddingStore] = {}
+        self.__lock = threading.Lock()
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    @classmethod
+    def get_default(cls) -> 'TextEmbeddingCache':
+        """
+        Returns the cache shared by the embedding services of the process,
+        configured with the FOUNDATIONALLM_EMBEDDING_CACHE_* environment variables.
+
+        Returns
+        -------
+        TextEmbeddingCache
+            The shared cache.
+        """
+        if cls.__default is None:
+            with cls.__default_lock:
+                if cls.__default is None:
+                    cls.__default = TextEmbeddingCache(
+                        max_size=int(os.environ.get(FOUNDATIONALLM_EMBEDDING_CACHE_SIZE, 1024)),
+                        path=os.environ.get(FOUNDATIONALLM_EMBEDDING_CACHE_PATH),
+                        disk_capacity=int(os.environ.get(FOUNDATIONALLM_EMBEDDING_CACHE_DISK_CAPACITY, 65536)))
+        return cls.__default
+
+    @staticmethod
+    def get_text_hash(text: str) -> str:
+        """
+        Returns the hash of a text after normalizing its Unicode form and whitespace.
+
+        Parameters
+        ----------
+        text : str
+            The embedded text.
+
+        Returns
+        -------
+        str
+            The SHA-256 digest of the normalized text.
+        """
+        normalized = re.sub(r'\s+', ' ', unicodedata.normalize('NFC', text)).strip()
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def __get_store(self, model_name: str) -> Optional[MemoryMappedEmbeddingStore]:
+        """
+        Returns the on-disk store of a model, opening it on first use.
+        """
+        if not self.path:
+            return None
+        if model_name in self.__stores:
+            return self.__stores[model_name]
+
+        file_name = re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)
+        if fcntl is None:
+            file_name = f'{file_name}.{os.getpid()}'
+        store = None
+        for index in range(self.MAX_STORES_PER_MODEL):
+            store_path = os.path.join(self.path, file_name if index == 0 else f'{file_name}.{index}')
+            try:
+                store = MemoryMappedEmbeddingStore(store_path, self.disk_capacity)
+                break
+            except BlockingIOError:
+                continue
+            except Exception as e:
+                logging.warning(f'The on-disk embedding cache of {model_name} could not be opened: {e}')
+                break
+        else:
+            logging.warning(
+                f'The on-disk embedding cache of {model_name} is disabled, since its '
+                f'{self.MAX_STORES_PER_MODEL} stores are used by other processes.')
+        # A store that could not be opened is not retried, so requests never wait for the disk again.
+        self.__stores[model_name] = store
+        return store
+
+    def get(self, model_name: str, text: str) -> Optional[GatewayTextEmbeddingResponse]:
+        """
+        Returns the cached embedding of a text, or None if it is not cached.
+
+        Parameters
+        ----------
+        model_name : str
+            The name of the embedding model.
+        text : str
+            The embedded text.
+        """
+        if self.max_size <= 0:
+            return None
+        key = (model_name, self.get_text_hash(text))
+        with self.__lock:
+            embedding = self.__entries.get(key)
+            if embedding is not None:
+                self.__entries.move_to_end(key)
+                self.memory_hits += 1
+                return embedding
+            store = self.__get_store(model_name)
+            embedding = store.get(key[1]) if store is not None else None
+            if embedding is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self.__set_entry(key, embedding)
+            return embedding
+
+    def set(self, model_name: str, text: str, embedding: GatewayTextEmbeddingResponse):
+        """
+        Caches the embedding of a text.
+
+        Parameters
+        ----------
+        model_name : str
+            The name of the embedding model.
+        text : str
+            The embedded text.
+        embedding : GatewayTextEmbeddingResponse
+            The embedding of the text.
+        """
+        if self.max_size <= 0:
+            return
+        key = (model_name, self.get_text_hash(text))
+        with self.__lock:
+            self.__set_entry(key, embedding)
+            store = self.__get_store(model_name)
+            if store is not None:
+                try:
+                    store.set(key[1], embedding)
+                except Exception as e:
+                    logging.warning(f'The embedding could not be written to the on-disk cache: {e}')
+
+    def __set_entry(self, key: Tuple[str, str], embedding: GatewayTextEmbeddingResponse):
+        """
+        Adds an embedding to the in-memory tier, evicting the least recently used embeddings.
+        """
+        self.__entries[key] = embedding
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+
+    def get_metrics(self) -> dict:
+        """
+        Returns the size and the hit counters of the cache.
+        """
+        requests = self.memory_hits + self.disk_hits + self.misses
+        return {
+            'size': len(self.__entries),
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': (self.memory_hits + self.disk_hits) / requests if requests > 0 else 0
+        }
+
+    def flush(self):
+        """
+        Writes the on-disk tier to disk.
+        """
+        with self.__lock:
+            for store in self.__stores.values():
+                if store is not None:
+                    store.flush()
+
+    def close(self):
+        """
+        Writes the on-disk tier to disk and releases its stores, so other processes can open them.
+        Call it on application shutdown.
+        """
+        with self.__lock:
+            for store in self.__stores.values():
+                if store is not None:
+                    store.close()
+            self.__stores.clear()
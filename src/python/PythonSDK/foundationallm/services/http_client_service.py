@@ -1,14 +1,29 @@
+import asyncio
+import concurrent.futures
 import os
-import requests
+import threading
+from typing import Any, Awaitable, Callable
 import aiohttp
 from foundationallm.config import Configuration, UserIdentity
 from foundationallm.models.authentication import AuthenticationTypes, AuthenticationParametersKeys
 from foundationallm.models.resource_providers.configuration import APIEndpointConfiguration
+from .circuit_breaker import CircuitBreaker
+from .http_session_pool import HttpSessionPool
+from .retry_strategy import RetryStrategy, get_retry_strategy
 
 class HttpClientService:
     """
-    Class for creating an HTTP client session based on an API endpoint configuration.
+    Class for sending HTTP requests based on an API endpoint configuration.
+    Requests are sent through the sessions of the HttpSessionPool, so connections are reused across calls.
+    Failed requests are retried with the retry strategy named by the endpoint configuration, and are
+    not sent while the circuit breaker of the endpoint is open.
     """
+    # The maximum number of threads sending hedged synchronous requests.
+    MAX_HEDGING_THREADS = 16
+
+    __hedging_executor: concurrent.futures.ThreadPoolExecutor = None
+    __hedging_executor_lock = threading.Lock()
+
     def __init__(self, api_endpoint_configuration: APIEndpointConfiguration, user_identity: UserIdentity, config: Configuration):
         self.config = config
         self.user_identity = user_identity
@@ -16,7 +31,9 @@ class HttpClientService:
         self.base_url = self.api_endpoint_configuration.url.rstrip('/')
         env = os.environ.get('FOUNDATIONALLM_ENV', 'prod')
         self.verify_certs = False if env == 'dev' else True
+        self.ssl = None if self.verify_certs else False
         self.time_out = self.api_endpoint_configuration.timeout_seconds
+        self.async_time_out = aiohttp.ClientTimeout(total=self.time_out)
 
         # build headers
         headers = {}
@@ -37,45 +54,177 @@ class HttpClientService:
                 break
 
         self.headers = headers
+        self.retry_strategy = get_retry_strategy(self.api_endpoint_configuration.retry_strategy_name)
+        self.circuit_breaker = CircuitBreaker.get_or_create(self.base_url)
 
-    def get(self, endpoint: str):
+    def get(self, endpoint: str, return_headers: bool = False):
         """
         Execute a synchronous GET request.
+        When return_headers is True, returns the response body and headers as a tuple.
         """
-        with requests.Session() as session:
-            session.headers.update(self.headers)
+        def send():
+            session = HttpSessionPool.get_session(self.base_url, self.verify_certs)
             url = self.base_url + endpoint
-            response = session.get(url, timeout=self.time_out, verify=self.verify_certs)
-            response.raise_for_status()
-            return response.json()
+            with session.get(url, headers=self.headers, timeout=self.time_out, verify=self.verify_certs) as response:
+                response.raise_for_status()
+                return (response.json(), response.headers) if return_headers else response.json()
+        return self.__send(send, idempotent=True)
 
-    def post(self, endpoint: str, data: dict = None):
+    def post(self, endpoint: str, data: dict = None, return_headers: bool = False):
         """
         Execute a synchronous POST request.
+        When return_headers is True, returns the response body and headers as a tuple.
         """        
-        with requests.Session() as session:
-            session.headers.update(self.headers)
+        def send():
+            session = HttpSessionPool.get_session(self.base_url, self.verify_certs)
             url = self.base_url + endpoint            
-            response = session.post(url, data=data, timeout=self.time_out, verify=self.verify_certs)            
-            response.raise_for_status()
-            return response.json()
+            with session.post(url, data=data, headers=self.headers, timeout=self.time_out, verify=self.verify_certs) as response:
+                response.raise_for_status()
+                return (response.json(), response.headers) if return_headers else response.json()
+        return self.__send(send, idempotent=False)
 
-    async def aget(self, endpoint: str):
+    async def aget(self, endpoint: str, return_headers: bool = False):
         """
         Execute an asynchronous GET request.
+        When return_headers is True, returns the response body and headers as a tuple.
         """
-        async with aiohttp.ClientSession(headers=self.headers) as session:
+        async def send():
+            session = HttpSessionPool.get_async_session(self.base_url, self.verify_certs)
             url = self.base_url + endpoint
-            async with session.get(url, timeout=self.time_out, ssl=self.verify_certs) as response:
+            async with session.get(url, headers=self.headers, timeout=self.async_time_out, ssl=self.ssl) as response:
                 response.raise_for_status()
-                return await response.json()
+                body = await response.json()
+                return (body, response.headers) if return_headers else body
+        return await self.__asend(send, idempotent=True)
 
-    async def apost(self, endpoint: str, data: dict = None):
+    async def apost(self, endpoint: str, data: dict = None, return_headers: bool = False):
         """
         Execute an asynchronous POST request.
+        When return_headers is True, returns the response body and headers as a tuple.
         """
-        async with aiohttp.ClientSession(headers=self.headers) as session:
+        async def send():
+            session = HttpSessionPool.get_async_session(self.base_url, self.verify_certs)
             url = self.base_url + endpoint
-            async with session.post(url, data=data, timeout=self.time_out, ssl=self.verify_certs) as response:
+            async with session.post(url, data=data, headers=self.headers, timeout=self.async_time_out, ssl=self.ssl) as response:
                 response.raise_for_status()
-                return await response.json()
+                body = await response.json()
+                return (body, response.headers) if return_headers else body
+        return await self.__asend(send, idempotent=False)
+
+    def __send(self, send: Callable[[], Any], idempotent: bool) -> Any:
+        """
+        Sends a request with the retry strategy, hedging idempotent requests if the strategy enables it.
+        """
+        if idempotent and self.retry_strategy.hedge_delay:
+            attempt = lambda: self.__send_hedged(lambda: self.__send_once(send))
+        else:
+            attempt = lambda: self.__send_once(send)
+        return self.retry_strategy.get_retrying(idempotent, self.time_out)(attempt)
+
+    async def __asend(self, send: Callable[[], Awaitable[Any]], idempotent: bool) -> Any:
+        """
+        Asynchronously sends a request with the retry strategy, hedging idempotent requests if the strategy enables it.
+        """
+        if idempotent and self.retry_strategy.hedge_delay:
+            attempt = lambda: self.__asend_hedged(lambda: self.__asend_once(send))
+        else:
+            attempt = lambda: self.__asend_once(send)
+        return await self.retry_strategy.get_async_retrying(idempotent, self.time_out)(attempt)
+
+    def __send_once(self, send: Callable[[], Any]) -> Any:
+        """
+        Sends a single attempt of a request and records its outcome in the circuit breaker.
+        """
+        trial = self.circuit_breaker.before_request()
+        try:
+            result = send()
+        except Exception as e:
+            self.__record_error(e)
+            raise
+        except BaseException:
+            if trial:
+                self.circuit_breaker.release_trial()
+            raise
+        self.circuit_breaker.record_success()
+        return result
+
+    async def __asend_once(self, send: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Asynchronously sends a single attempt of a request and records its outcome in the circuit breaker.
+        """
+        trial = self.circuit_breaker.before_request()
+        try:
+            result = await send()
+        except Exception as e:
+            self.__record_error(e)
+            raise
+        except BaseException:
+            # The request was cancelled, for instance because a hedged request won the race,
+            # so its outcome is unknown and another request must be let through as the trial.
+            if trial:
+                self.circuit_breaker.release_trial()
+            raise
+        self.circuit_breaker.record_success()
+        return result
+
+    def __record_error(self, error: Exception):
+        """
+        Records a failed attempt in the circuit breaker. Errors returned by a healthy endpoint are not failures.
+        """
+        if RetryStrategy.is_transient_error(error, idempotent=True):
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    def __send_hedged(self, send: Callable[[], Any]) -> Any:
+        """
+        Sends a request, and sends it again if it has not completed after the hedge delay.
+        Returns the first successful response.
+        """
+        executor = self.__get_hedging_executor()
+        futures = [executor.submit(send)]
+        done, _ = concurrent.futures.wait(futures, timeout=self.retry_strategy.hedge_delay)
+        if len(done) == 0:
+            futures.append(executor.submit(send))
+        error = None
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                return future.result()
+            except Exception as e:
+                error = e
+        raise error
+
+    async def __asend_hedged(self, send: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Asynchronously sends a request, and sends it again if it has not completed after the hedge delay.
+        Returns the first successful response and cancels the other request.
+        """
+        tasks = {asyncio.ensure_future(send())}
+        done, _ = await asyncio.wait(tasks, timeout=self.retry_strategy.hedge_delay)
+        if len(done) == 0:
+            tasks.add(asyncio.ensure_future(send()))
+        error = None
+        try:
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @classmethod
+    def __get_hedging_executor(cls) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        Returns the thread pool sending hedged synchronous requests, creating it on first use.
+        """
+        if cls.__hedging_executor is None:
+            with cls.__hedging_executor_lock:
+                if cls.__hedging_executor is None:
+                    cls.__hedging_executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=cls.MAX_HEDGING_THREADS,
+                        thread_name_prefix='http-hedging')
+        return cls.__hedging_executor
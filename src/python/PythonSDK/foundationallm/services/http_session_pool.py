@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, List, Tuple
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter that counts the requests sent through its connection pool
+    and the requests that had to wait for a free connection.
+    """
+    def __init__(self, pool_maxsize: int):
+        self.max_connections = pool_maxsize
+        self.requests = 0
+        self.queued_requests = 0
+        self.__in_flight = 0
+        self.__lock = threading.Lock()
+        # A single host is reached through each pooled session.
+        super().__init__(pool_connections=1, pool_maxsize=pool_maxsize, pool_block=True)
+
+    def send(self, request, **kwargs):
+        with self.__lock:
+            self.requests += 1
+            if self.__in_flight >= self.max_connections:
+                self.queued_requests += 1
+            self.__in_flight += 1
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            with self.__lock:
+                self.__in_flight -= 1
+
+    def get_connections_created(self) -> int:
+        """
+        Returns the number of connections opened by the pool.
+        """
+        pools = self.poolmanager.pools
+        return sum(pools[key].num_connections for key in pools.keys())
+
+class HttpSessionPool:
+    """
+    Process-wide pool of the HTTP sessions used to call FoundationaLLM APIs.
+
+    Opening a session per call pays for DNS resolution, a TCP connection and a TLS
+    handshake on every request, including every poll of a long-running operation.
+    Sessions are created once for each base URL and certificate verification setting,
+    and keep their connections alive between requests. Async sessions are bound to the
+    event loop that created them. The least recently used sessions are closed once the
+    pool is full, and the remaining sessions are closed on shutdown.
+    """
+    # The maximum number of sessions kept open for each of the sync and async pools.
+    MAX_SESSIONS = 64
+    # The maximum number of connections of a session.
+    MAX_CONNECTIONS = 100
+    # The number of seconds an idle async connection is kept open.
+    KEEP_ALIVE_SECONDS = 30
+
+    __sessions: OrderedDict[Hashable, Tuple[requests.Session, PooledHTTPAdapter]] = OrderedDict()
+    __async_sessions: OrderedDict[Hashable, aiohttp.ClientSession] = OrderedDict()
+    __lock = threading.Lock()
+
+    # Statistics of the async sessions.
+    __async_requests = 0
+    __async_connections_created = 0
+    __async_connections_reused = 0
+    __async_queued_requests = 0
+    __async_queue_wait_seconds = 0.0
+    # Statistics of the closed sync sessions.
+    __closed_requests = 0
+    __closed_connections_created = 0
+    __closed_queued_requests = 0
+
+    @classmethod
+    def get_session(cls, base_url: str, verify_certs: bool = True) -> requests.Session:
+        """
+        Returns the sync session of a base URL, creating it on first use.
+
+        Parameters
+        ----------
+        base_url : str
+            The base URL of the API.
+        verify_certs : bool
+            False to disable the verification of the server certificates.
+
+        Returns
+        -------
+        requests.Session
+            The pooled session. Headers and timeouts must be passed with each request.
+        """
+        key = (base_url, verify_certs)
+        evicted = []
+        with cls.__lock:
+            entry = cls.__sessions.get(key)
+            if entry is None:
+                session = requests.Session()
+                session.verify = verify_certs
+                adapter = PooledHTTPAdapter(cls.MAX_CONNECTIONS)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                entry = cls.__sessions[key] = (session, adapter)
+                while len(cls.__sessions) > cls.MAX_SESSIONS:
+                    evicted.append(cls.__sessions.popitem(last=False)[1])
+            cls.__sessions.move_to_end(key)
+        cls.__close_sessions(evicted)
+        return entry[0]
+
+    @classmethod
+    def get_async_session(cls, base_url: str, verify_certs: bool = True) -> aiohttp.ClientSession:
+        """
+        Returns the async session of a base URL for the running event loop, creating it on first use.
+
+        Parameters
+        ----------
+        base_url : str
+            The base URL of the API.
+        verify_certs : bool
+            False to disable the verification of the server certificates.
+
+        Returns
+        -------
+        aiohttp.ClientSession
+            The pooled session. Headers and timeouts must be passed with each request.
+        """
+        loop = asyncio.get_running_loop()
+        key = (base_url, verify_certs, loop)
+        evicted = []
+        with cls.__lock:
+            session = cls.__async_sessions.get(key)
+            if session is None or session.closed:
+                session = cls.__async_sessions[key] = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=cls.MAX_CONNECTIONS,
+                        keepalive_timeout=cls.KEEP_ALIVE_SECONDS,
+                        ssl=None if verify_certs else False
+                    ),
+                    trace_configs=[cls.__create_trace_config()]
+                )
+                # Drop the sessions of the event loops that were closed.
+                for other_key in [k for k in cls.__async_sessions if k[2].is_closed()]:
+                    cls.__async_sessions.pop(other_key)
+                while len(cls.__async_sessions) > cls.MAX_SESSIONS:
+                    evicted.append(cls.__async_sessions.popitem(last=False))
+            cls.__async_sessions.move_to_end(key)
+        for evicted_key, evicted_session in evicted:
+            if evicted_key[2] is loop:
+                loop.create_task(evicted_session.close())
+        return session
+
+    @classmethod
+    def __create_trace_config(cls) -> aiohttp.TraceConfig:
+        """
+        Returns the trace configuration recording the statistics of the async sessions.
+        """
+        async def on_request_start(session, context, params):
+            cls.__async_requests += 1
+
+        async def on_connection_queued_start(session, context, params):
+            context.queued_start = time.perf_counter()
+
+        async def on_connection_queued_end(session, context, params):
+            cls.__async_queued_requests += 1
+            cls.__async_queue_wait_seconds += time.perf_counter() - context.queued_start
+
+        async def on_connection_create_end(session, context, params):
+            cls.__async_connections_created += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            cls.__async_connections_reused += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_queued_start.append(on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(on_connection_queued_end)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    @classmethod
+    def __close_sessions(cls, entries: List[Tuple[requests.Session, PooledHTTPAdapter]]):
+        """
+        Closes sync sessions, keeping their statistics.
+        """
+        for session, adapter in entries:
+            cls.__closed_requests += adapter.requests
+            cls.__closed_connections_created += adapter.get_connections_created()
+            cls.__closed_queued_requests += adapter.queued_requests
+            try:
+                session.close()
+            except Exception as e:
+                logging.warning(f'Failed to close an HTTP session: {e}')
+
+    @classmethod
+    def close(cls):
+        """
+        Closes every sync session.
+        """
+        with cls.__lock:
+            entries = list(cls.__sessions.values())
+            cls.__sessions.clear()
+        cls.__close_sessions(entries)
+
+    @classmethod
+    async def aclose(cls):
+        """
+        Closes every sync session, and every async session of the running event loop.
+        Call it on application shutdown.
+        """
+        cls.close()
+        loop = asyncio.get_running_loop()
+        with cls.__lock:
+            sessions = list(cls.__async_sessions.items())
+            cls.__async_sessions.clear()
+        for key, session in sessions:
+            # The sessions of other event loops can only be closed by their loop.
+            if key[2] is loop and not session.closed:
+                try:
+                    await session.close()
+                except Exception as e:
+                    logging.warning(f'Failed to close an HTTP session: {e}')
+
+    @classmethod
+    def get_metrics(cls) -> dict:
+        """
+        Returns the connection reuse and pool wait statistics of the sessions.
+
+        Returns
+        -------
+        dict
+            The number of open sessions, requests, created and reused connections,
+            and requests that waited for a free connection, for the sync and async sessions.
+        """
+        with cls.__lock:
+            adapters = [adapter for _, adapter in cls.__sessions.values()]
+            sync_sessions = len(cls.__sessions)
+            async_sessions = len(cls.__async_sessions)
+        sync_requests = cls.__closed_requests + sum(adapter.requests for adapter in adapters)
+        sync_connections_created = cls.__closed_connections_created \
+            + sum(adapter.get_connections_created() for adapter in adapters)
+        return {
+            'sync': {
+                'sessions': sync_sessions,
+                'requests': sync_requests,
+                'connections_created': sync_connections_created,
+                'connections_reused': max(sync_requests - sync_connections_created, 0),
+                'queued_requests': cls.__closed_queued_requests + sum(adapter.queued_requests for adapter in adapters)
+            },
+            'async': {
+                'sessions': async_sessions,
+                'requests': cls.__async_requests,
+                'connections_created': cls.__async_connections_created,
+                'connections_reused': cls.__async_connections_reused,
+                'queued_requests': cls.__async_queued_requests,
+                'queue_wait_seconds': cls.__async_queue_wait_seconds
+            }
+        }
@@ -1,17 +1,30 @@
+import asyncio
 import base64
 import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from foundationallm.models.attachments import AttachmentProperties
 from foundationallm.config import Configuration
 from foundationallm.storage import BlobStorageManager
 from openai import AzureOpenAI, AsyncAzureOpenAI
 from openai.types import CompletionUsage
-from typing import List, Union
+from typing import List, Optional, Tuple, Union
 
 class ImageAnalysisService:
     """
     Performs image analysis via the Azure OpenAI SDK.
+
+    The images of a request are analyzed concurrently, up to max_concurrency at a time.
     """
-    def __init__(self, config: Configuration, client: Union[AzureOpenAI, AsyncAzureOpenAI], deployment_model: str):
+    # The default maximum number of images analyzed at the same time.
+    MAX_CONCURRENCY = 4
+
+    def __init__(
+        self,
+        config: Configuration,
+        client: Union[AzureOpenAI, AsyncAzureOpenAI],
+        deployment_model: str,
+        max_concurrency: int = MAX_CONCURRENCY):
         """
         Initializes the ImageAnalysisService.
 
@@ -23,10 +36,46 @@ class ImageAnalysisService:
             The Azure OpenAI client to use for image analysis.
         deployment_model : str
             The deployment model to use for the Azure OpenAI client.
+        max_concurrency : int
+            The maximum number of images analyzed at the same time.
         """
         self.config = config
         self.client = client
         self.deployment_model = deployment_model
+        self.max_concurrency = max(max_concurrency, 1)
+
+    def _get_storage_manager(self, storage_account_name: str, file_path: str) -> Tuple[BlobStorageManager, str]:
+        """
+        Returns the storage manager of the container of an image and the path of the image in the container.
+
+        Parameters
+        ----------
+        storage_account_name : str
+            The name of the storage account of the image.
+        file_path : str
+            The path of the image, starting with the name of its container.
+
+        Returns
+        -------
+        Tuple[BlobStorageManager, str]
+            The storage manager of the container and the path of the image in the container.
+        """
+        # Remove any leading slashes from the file path.
+        file_path = file_path.lstrip('/')
+        # Attempt to retrieve the image from blob storage.
+        container_name = file_path.split('/')[0]
+        # Get the file path without the container name.
+        file_name = file_path.removeprefix(container_name)
+
+        try:
+            storage_manager = BlobStorageManager(
+                account_name=storage_account_name,
+                container_name=container_name,
+                authentication_type=self.config.get_value('FoundationaLLM:ResourceProviders:Attachment:Storage:AuthenticationType')
+            )
+        except Exception as e:
+            raise Exception(f'Error connecting to the {storage_account_name} blob storage account and the container named {container_name}: {e}')
+        return storage_manager, file_name
 
     def _get_as_base64(self, mime_type: str, storage_account_name, file_path: str) -> str:
         """
@@ -45,21 +94,7 @@ class ImageAnalysisService:
             The image as a base64 string.
         """
         try:
-            # Remove any leading slashes from the file path.
-            file_path = file_path.lstrip('/')
-            # Attempt to retrieve the image from blob storage.
-            container_name = file_path.split('/')[0]
-            # Get the file path without the container name.
-            file_name = file_path.removeprefix(container_name)
-
-            try:
-                storage_manager = BlobStorageManager(
-                    account_name=storage_account_name,
-                    container_name=container_name,
-                    authentication_type=self.config.get_value('FoundationaLLM:ResourceProviders:Attachment:Storage:AuthenticationType')
-                )
-            except Exception as e:
-                raise Exception(f'Error connecting to the {storage_account_name} blob storage account and the container named {container_name}: {e}')
+            storage_manager, file_name = self._get_storage_manager(storage_account_name, file_path)
 
             if (storage_manager.file_exists(file_name)):
                 try:
@@ -71,7 +106,35 @@ class ImageAnalysisService:
             else:
                 raise Exception(f'The specified image {storage_account_name}/{file_path} does not exist.')
         except Exception as e:
-            print(f'Error getting image as base64: {e}')
+            logging.warning(f'Error getting image as base64: {e}')
+            return None
+
+    async def _aget_as_base64(self, mime_type: str, storage_account_name, file_path: str) -> str:
+        """
+        Asynchronously retrieves an image from blob storage and converts it to a base64 string.
+
+        Parameters
+        ----------
+        mime_type : str
+            The mime type of the image.
+        storage_account_name : str
+            The name of the storage account of the image.
+        file_path : str
+            The path of the image, starting with the name of its container.
+
+        Returns
+        -------
+        str
+            The image as a base64 string.
+        """
+        try:
+            storage_manager, file_name = self._get_storage_manager(storage_account_name, file_path)
+            image_blob = await storage_manager.aread_file_content(file_name)
+            if image_blob is None:
+                raise Exception(f'The specified image {storage_account_name}/{file_path} does not exist.')
+            return base64.b64encode(image_blob).decode('utf-8')
+        except Exception as e:
+            logging.warning(f'Error getting image as base64: {e}')
             return None
 
     def format_results(self, image_analyses: dict) -> str:
@@ -95,6 +158,86 @@ class ImageAnalysisService:
             formatted_results += f"- Analysis: {image_analyses[key]}\n\n"
         return formatted_results
 
+    def _get_messages(self, attachment: AttachmentProperties, image_base64: str) -> List[dict]:
+        """
+        Returns the messages of the completion request analyzing an image.
+        """
+        return [
+            {
+                "role": "system",
+                "content": "You are a helpful assistant who analyzes and describes images. Provide as many key insights and analysis about the data in the image as possible. Output the results in a markdown formatted table."
+            },
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "content": "Analyze the image:"
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{attachment.content_type};base64,{image_base64}"
+                        }
+                    }
+                ]
+            }
+        ]
+
+    def _get_invalid_image_analysis(self, attachment: AttachmentProperties) -> str:
+        """
+        Returns the analysis of an image that could not be retrieved.
+        """
+        return f"The image {attachment.original_file_name} was either invalid or inaccessible and could not be analyzed."
+
+    def _analyze_image(self, attachment: AttachmentProperties) -> Tuple[str, Optional[CompletionUsage]]:
+        """
+        Returns the analysis of an image and the token usage of the completion, if any.
+        """
+        image_base64 = self._get_as_base64(mime_type=attachment.content_type, storage_account_name=attachment.provider_storage_account_name, file_path=attachment.provider_file_name)
+        if image_base64 is None or image_base64 == '':
+            return self._get_invalid_image_analysis(attachment), None
+        response = self.client.chat.completions.create(
+            model=self.deployment_model,
+            messages=self._get_messages(attachment, image_base64),
+            max_tokens=4000,
+            temperature=0.5
+        )
+        return response.choices[0].message.content, response.usage
+
+    async def _aanalyze_image(self, attachment: AttachmentProperties, semaphore: asyncio.Semaphore) -> Tuple[str, Optional[CompletionUsage]]:
+        """
+        Asynchronously returns the analysis of an image and the token usage of the completion, if any.
+        """
+        async with semaphore:
+            image_base64 = await self._aget_as_base64(mime_type=attachment.content_type, storage_account_name=attachment.provider_storage_account_name, file_path=attachment.provider_file_name)
+            if image_base64 is None or image_base64 == '':
+                return self._get_invalid_image_analysis(attachment), None
+            response = await self.client.chat.completions.create(
+                model=self.deployment_model,
+                messages=self._get_messages(attachment, image_base64),
+                max_tokens=4000,
+                temperature=0.5
+            )
+            return response.choices[0].message.content, response.usage
+
+    def _aggregate_results(
+        self,
+        image_attachments: List[AttachmentProperties],
+        results: List[Tuple[str, Optional[CompletionUsage]]]) -> tuple:
+        """
+        Returns the analyses by image name, in the order of the attachments, and the total token usage.
+        """
+        image_analyses = {}
+        usage = CompletionUsage(completion_tokens=0, prompt_tokens=0, total_tokens=0)
+        for attachment, (analysis, analysis_usage) in zip(image_attachments, results):
+            image_analyses[attachment.original_file_name] = analysis
+            if analysis_usage is not None:
+                usage.prompt_tokens += analysis_usage.prompt_tokens
+                usage.completion_tokens += analysis_usage.completion_tokens
+                usage.total_tokens += analysis_usage.total_tokens
+        return image_analyses, usage
+
     async def aanalyze_images(self, image_attachments: List[AttachmentProperties]) -> tuple:
         """
         Get the image analysis results from Azure OpenAI.
@@ -104,47 +247,10 @@ class ImageAnalysisService:
         image_attachments : List[AttachmentProperties]
             The list containing properties of the images to analyze.
         """
-        image_analyses = {}
-        usage = CompletionUsage(completion_tokens=0, prompt_tokens=0, total_tokens=0)
-
-        for attachment in image_attachments:
-            if attachment.content_type.startswith('image/'):
-                image_base64 = self._get_as_base64(mime_type=attachment.content_type, storage_account_name=attachment.provider_storage_account_name, file_path=attachment.provider_file_name)
-                if image_base64 is not None and image_base64 != '':
-                    response = await self.client.chat.completions.create(
-                        model=self.deployment_model,
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": "You are a helpful assistant who analyzes and describes images. Provide as many key insights and analysis about the data in the image as possible. Output the results in a markdown formatted table."
-                            },
-                            {
-                                "role": "user",
-                                "content": [
-                                    {
-                                        "type": "text",
-                                        "content": "Analyze the image:"
-                                    },
-                                    {
-                                        "type": "image_url",
-                                        "image_url": {
-                                            "url": f"data:{attachment.content_type};base64,{image_base64}"
-                                        }
-                                    }
-                                ]
-                            }
-                        ],
-                        max_tokens=4000,
-                        temperature=0.5
-                    )
-                    image_analyses[attachment.original_file_name] = response.choices[0].message.content
-                    usage.prompt_tokens += response.usage.prompt_tokens
-                    usage.completion_tokens += response.usage.completion_tokens
-                    usage.total_tokens += response.usage.total_tokens
-                else:
-                    image_analyses[attachment.original_file_name] = f"The image {attachment.original_file_name} was either invalid or inaccessible and could not be analyzed."
-
-        return image_analyses, usage
+        image_attachments = [attachment for attachment in image_attachments if attachment.content_type.startswith('image/')]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*(self._aanalyze_image(attachment, semaphore) for attachment in image_attachments))
+        return self._aggregate_results(image_attachments, results)
 
     def analyze_images(self, image_attachments: List[AttachmentProperties]) -> tuple:
         """
@@ -155,44 +261,10 @@ class ImageAnalysisService:
         image_attachments : List[AttachmentProperties]
             The list containing properties of the images to analyze.
         """
-        image_analyses = {}
-        usage = CompletionUsage(completion_tokens=0, prompt_tokens=0, total_tokens=0)
-
-        for attachment in image_attachments:
-            if attachment.content_type.startswith('image/'):
-                image_base64 = self._get_as_base64(mime_type=attachment.content_type, storage_account_name=attachment.provider_storage_account_name, file_path=attachment.provider_file_name)
-                if image_base64 is not None and image_base64 != '':
-                    response = self.client.chat.completions.create(
-                        model=self.deployment_model,
-                        messages=[
-                            {
-                                "role": "system",
-                                "content": "You are a helpful assistant who analyzes and describes images. Provide as many key insights and analysis about the data in the image as possible. Output the results in a markdown formatted table."
-                            },
-                            {
-                                "role": "user",
-                                "content": [
-                                    {
-                                        "type": "text",
-                                        "content": "Analyze the image:"
-                                    },
-                                    {
-                                        "type": "image_url",
-                                        "image_url": {
-                                            "url": f"data:{attachment.content_type};base64,{image_base64}"
-                                        }
-                                    }
-                                ]
-                            }
-                        ],
-                        max_tokens=4000,
-                        temperature=0.5
-                    )
-                    image_analyses[attachment.original_file_name] = response.choices[0].message.content
-                    usage.prompt_tokens += response.usage.prompt_tokens
-                    usage.completion_tokens += response.usage.completion_tokens
-                    usage.total_tokens += response.usage.total_tokens
-                else:
-                    image_analyses[attachment.original_file_name] = f"The image {attachment.original_file_name} was either invalid or inaccessible and could not be analyzed."
-
-        return image_analyses, usage
+        image_attachments = [attachment for attachment in image_attachments if attachment.content_type.startswith('image/')]
+        if len(image_attachments) <= 1:
+            results = [self._analyze_image(attachment) for attachment in image_attachments]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(image_attachments))) as executor:
+                results = list(executor.map(self._analyze_image, image_attachments))
+        return self._aggregate_results(image_attachments, results)
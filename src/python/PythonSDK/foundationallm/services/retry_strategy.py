@@ -0,0 +1,270 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Mapping, Optional
+import aiohttp
+import requests
+from tenacity import (
+    AsyncRetrying,
+    Retrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    stop_after_delay
+)
+
+class RetryStrategyNames(str, Enum):
+    """Enumerator of the retry strategies of API endpoint configurations."""
+
+    EXPONENTIAL_BACKOFF = "ExponentialBackoff"
+    EXPONENTIAL_BACKOFF_WITH_HEDGING = "ExponentialBackoffWithHedging"
+    FIXED_DELAY = "FixedDelay"
+    NONE = "None"
+
+class RetryStrategy():
+    """
+    Retry policy of the calls to an API endpoint, selected by the retry strategy name
+    of its configuration.
+
+    Requests are retried when the endpoint is unreachable or returns a transient status code.
+    Idempotent requests are retried on any transient status code, other requests only on the
+    status codes that guarantee the request was not processed. A Retry-After header returned
+    by the endpoint takes precedence over the computed delay.
+    """
+    # Status codes worth retrying for idempotent requests.
+    TRANSIENT_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+    # Status codes worth retrying for any request, since the request was not processed.
+    REJECTED_STATUS_CODES = (429, 503)
+    # The maximum delay requested by a Retry-After header that is honored, in seconds.
+    MAX_RETRY_AFTER_SECONDS = 30
+
+    def __init__(
+        self,
+        name: str,
+        max_attempts: int = 1,
+        initial_delay: float = 0.25,
+        max_delay: float = 4,
+        exponential: bool = True,
+        jitter: bool = True,
+        hedge_delay: Optional[float] = None):
+        """
+        Initializes the retry strategy.
+
+        Parameters
+        ----------
+        name : str
+            The name of the retry strategy.
+        max_attempts : int
+            The maximum number of attempts of a request, including the first one.
+        initial_delay : float
+            The delay before the first retry, in seconds.
+        max_delay : float
+            The maximum delay between two attempts, in seconds.
+        exponential : bool
+            True to double the delay after each retry, False to use a fixed delay.
+        jitter : bool
+            True to pick a random delay up to the computed delay.
+        hedge_delay : float
+            The number of seconds after which an idempotent request that has not completed is sent again.
+            The first response is used. Hedging is disabled when not set.
+        """
+        self.name = name
+        self.max_attempts = max_attempts
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.exponential = exponential
+        self.jitter = jitter
+        self.hedge_delay = hedge_delay
+
+    @staticmethod
+    def get_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+        """
+        Returns the delay requested by the Retry-After header, or None if the header is missing or invalid.
+
+        Parameters
+        ----------
+        headers : Mapping[str, str]
+            The headers of a response. The header names are case-insensitive.
+
+        Returns
+        -------
+        float
+            The requested delay, in seconds.
+        """
+        if not headers:
+            return None
+        value = headers.get('Retry-After') or headers.get('retry-after')
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_time = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_time.tzinfo is None:
+            retry_time = retry_time.replace(tzinfo=timezone.utc)
+        return max((retry_time - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+    @staticmethod
+    def get_status_code(error: BaseException) -> Optional[int]:
+        """
+        Returns the status code of an HTTP error response, or None if the error is not an HTTP error response.
+        """
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status
+        return None
+
+    @classmethod
+    def is_transient_error(cls, error: BaseException, idempotent: bool) -> bool:
+        """
+        Returns True if a request that failed with an error is worth retrying.
+
+        Parameters
+        ----------
+        error : BaseException
+            The error raised by the request.
+        idempotent : bool
+            True if the request can be sent several times without side effects.
+
+        Returns
+        -------
+        bool
+            True if the request should be retried.
+        """
+        status_code = cls.get_status_code(error)
+        if status_code is not None:
+            return status_code in (cls.TRANSIENT_STATUS_CODES if idempotent else cls.REJECTED_STATUS_CODES)
+        if isinstance(error, (requests.ConnectTimeout, aiohttp.ClientConnectorError)):
+            # The connection could not be established, so the request was not sent.
+            return True
+        if idempotent:
+            return isinstance(error, (
+                requests.ConnectionError,
+                requests.Timeout,
+                aiohttp.ClientConnectionError,
+                asyncio.TimeoutError))
+        return False
+
+    def get_delay(self, attempt_number: int, error: BaseException = None) -> float:
+        """
+        Returns the delay before the next attempt of a request.
+
+        Parameters
+        ----------
+        attempt_number : int
+            The number of the attempt that failed, starting at 1.
+        error : BaseException
+            The error raised by the attempt that failed.
+
+        Returns
+        -------
+        float
+            The delay before the next attempt, in seconds.
+        """
+        headers = None
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            headers = error.response.headers
+        elif isinstance(error, aiohttp.ClientResponseError):
+            headers = error.headers
+        retry_after = self.get_retry_after(headers)
+        if retry_after is not None:
+            return min(retry_after, self.MAX_RETRY_AFTER_SECONDS)
+
+        delay = self.initial_delay * 2 ** (attempt_number - 1) if self.exponential else self.initial_delay
+        delay = min(delay, self.max_delay)
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def __get_retrying_arguments(self, idempotent: bool, timeout_seconds: float) -> dict:
+        """
+        Returns the arguments of the tenacity retrying controllers.
+        """
+        def wait(retry_state: RetryCallState) -> float:
+            return self.get_delay(retry_state.attempt_number, retry_state.outcome.exception())
+
+        def before_sleep(retry_state: RetryCallState):
+            ex = retry_state.outcome.exception()
+            logging.warning(
+                f'Retrying HTTP request with the {self.name} retry strategy, '
+                f'attempt {retry_state.attempt_number} failed: {ex.__class__.__name__}: {ex}')
+
+        stop = stop_after_attempt(self.max_attempts)
+        if timeout_seconds:
+            stop = stop | stop_after_delay(timeout_seconds)
+        return {
+            'stop': stop,
+            'wait': wait,
+            'retry': retry_if_exception(lambda ex: self.is_transient_error(ex, idempotent)),
+            'before_sleep': before_sleep,
+            'reraise': True
+        }
+
+    def get_retrying(self, idempotent: bool, timeout_seconds: float = None) -> Retrying:
+        """
+        Returns the controller retrying a synchronous request.
+
+        Parameters
+        ----------
+        idempotent : bool
+            True if the request can be sent several times without side effects.
+        timeout_seconds : float
+            The time after which no more attempts are made.
+
+        Returns
+        -------
+        Retrying
+            The tenacity controller. Call it with the function sending the request.
+        """
+        return Retrying(**self.__get_retrying_arguments(idempotent, timeout_seconds))
+
+    def get_async_retrying(self, idempotent: bool, timeout_seconds: float = None) -> AsyncRetrying:
+        """
+        Returns the controller retrying an asynchronous request.
+
+        Parameters
+        ----------
+        idempotent : bool
+            True if the request can be sent several times without side effects.
+        timeout_seconds : float
+            The time after which no more attempts are made.
+
+        Returns
+        -------
+        AsyncRetrying
+            The tenacity controller. Call it with the coroutine function sending the request.
+        """
+        return AsyncRetrying(**self.__get_retrying_arguments(idempotent, timeout_seconds))
+
+@lru_cache(maxsize=32)
+def get_retry_strategy(name: str) -> RetryStrategy:
+    """
+    Returns the retry strategy of a name. Unknown names get the exponential backoff strategy.
+    Strategies are shared by all the endpoints using them.
+
+    Parameters
+    ----------
+    name : str
+        The retry strategy name of an API endpoint configuration.
+
+    Returns
+    -------
+    RetryStrategy
+        The retry strategy.
+    """
+    if name == RetryStrategyNames.NONE:
+        return RetryStrategy(name)
+    if name == RetryStrategyNames.FIXED_DELAY:
+        return RetryStrategy(name, max_attempts=3, initial_delay=1, exponential=False, jitter=False)
+    if name == RetryStrategyNames.EXPONENTIAL_BACKOFF_WITH_HEDGING:
+        return RetryStrategy(name, max_attempts=4, hedge_delay=2)
+    if name != RetryStrategyNames.EXPONENTIAL_BACKOFF:
+        logging.warning(f'The retry strategy {name} is not supported, {RetryStrategyNames.EXPONENTIAL_BACKOFF.value} is used instead.')
+    return RetryStrategy(RetryStrategyNames.EXPONENTIAL_BACKOFF.value, max_attempts=4)
@@ -1,8 +1,10 @@
 from io import BytesIO
 import fnmatch
+from azure.core.exceptions import ResourceNotFoundError
 from azure.storage.blob import BlobServiceClient
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
 from foundationallm.storage import StorageManagerBase
-from azure.identity import DefaultAzureCredential
+from foundationallm.authentication import AzureCredentialCache
 
 class BlobStorageManager(StorageManagerBase):
     """
@@ -20,11 +22,15 @@ class BlobStorageManager(StorageManagerBase):
         container_name : str
             The name of the container is blob storage from which blobs should be retrieved.
         """
+        self.__blob_connection_string = blob_connection_string
+        self.__account_url = f"https://{account_name}.blob.core.windows.net"
+        self.__authentication_type = authentication_type
+        self.__container_name = container_name
         if authentication_type == 'AzureIdentity':
             if account_name is None or account_name == '':
                 raise ValueError('The account_name parameter must be set to a valid account name.')
-            credential = DefaultAzureCredential(exclude_environment_credential=True)
-            blob_service_client = BlobServiceClient(account_url=f"https://{account_name}.blob.core.windows.net", credential=credential)
+            credential = AzureCredentialCache.get_credential()
+            blob_service_client = BlobServiceClient(account_url=self.__account_url, credential=credential)
         else:
             if blob_connection_string is None or blob_connection_string == '':
                 raise ValueError('The blob_connection_string parameter must be set to a valid connection string.')
@@ -127,6 +133,37 @@ class BlobStorageManager(StorageManagerBase):
         else:
             return None
 
+    async def aread_file_content(self, path) -> bytes:
+        """
+        Asynchronously retrieves the contents of a specified file in bytes.
+
+        Parameters
+        ----------
+        path : str
+            The path to the blob being retrieved.
+
+        Returns
+        -------
+        bytes
+            Returns the bytes representing the content of the specified file
+            or None if the file does not exist.
+        """
+        if self.__authentication_type == 'AzureIdentity':
+            blob_service_client = AsyncBlobServiceClient(
+                account_url=self.__account_url,
+                credential=AzureCredentialCache.get_async_credential())
+        else:
+            blob_service_client = AsyncBlobServiceClient.from_connection_string(self.__blob_connection_string)
+
+        full_path = self.__get_full_path(path)
+        async with blob_service_client:
+            blob = blob_service_client.get_blob_client(self.__container_name, full_path)
+            try:
+                downloader = await blob.download_blob()
+                return await downloader.readall()
+            except ResourceNotFoundError:
+                return None
+
     def write_file_content(self, path, content, overwrite=True, lease=None):
         """
         Writes data to a specified file.
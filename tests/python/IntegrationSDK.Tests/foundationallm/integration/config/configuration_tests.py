@@ -1,3 +1,4 @@
+import json
 import pytest
 from foundationallm.integration.config import Configuration
 
@@ -23,3 +24,60 @@ class ConfigurationTests:
         setting = test_config.get_value("FoundationaLLM:APIEndpoints:GatekeeperIntegrationAPI:APIKey")
         print(setting)
         assert setting is not None
+
+@pytest.fixture
+def local_config(tmp_path, monkeypatch):
+    settings_file = tmp_path / "settings.json"
+    settings_file.write_text(json.dumps({
+        "FoundationaLLM": {
+            "APIEndpoints": {
+                "GatekeeperIntegrationAPI": {
+                    "APIUrl": "http://localhost:8042",
+                    "APIKey": "file-key"
+                }
+            }
+        }
+    }))
+    monkeypatch.setenv("FOUNDATIONALLM_CONFIGURATION_PROVIDER", "local")
+    monkeypatch.setenv("FOUNDATIONALLM_CONFIGURATION_FILE", str(settings_file))
+    monkeypatch.setenv("FOUNDATIONALLM_CONFIGURATION_REFRESH_SECONDS", "0")
+    monkeypatch.setenv("FoundationaLLM__APIEndpoints__GatekeeperIntegrationAPI__APIKey", "env-key")
+    Configuration.reset()
+    yield Configuration()
+    Configuration.reset()
+
+class LocalConfigurationTests:
+    """
+    LocalConfigurationTests is responsible for testing the configuration snapshot
+    using the local configuration provider. These tests run offline.
+    """
+    def test_configuration_retrieves_key_from_file(self, local_config):
+        assert local_config.get_value("FoundationaLLM:APIEndpoints:GatekeeperIntegrationAPI:APIUrl") \
+            == "http://localhost:8042"
+
+    def test_environment_variable_overrides_file(self, local_config):
+        assert local_config.get_value("FoundationaLLM:APIEndpoints:GatekeeperIntegrationAPI:APIKey") \
+            == "env-key"
+
+    def test_refresh_is_shared_by_all_instances(self, local_config, monkeypatch):
+        monkeypatch.setenv("FoundationaLLM__Test__Setting", "value")
+        Configuration().refresh()
+        assert local_config.get_value("FoundationaLLM:Test:Setting") == "value"
+
+    def test_python_sdk_provider_name_is_accepted(self, local_config, monkeypatch):
+        monkeypatch.setenv("FOUNDATIONALLM_CONFIGURATION_PROVIDER", "file")
+        Configuration.reset()
+        assert Configuration().get_value("FoundationaLLM:APIEndpoints:GatekeeperIntegrationAPI:APIUrl") \
+            == "http://localhost:8042"
+
+    def test_local_provider_without_file_reads_environment(self, local_config, monkeypatch):
+        monkeypatch.delenv("FOUNDATIONALLM_CONFIGURATION_FILE")
+        Configuration.reset()
+        config = Configuration()
+        assert config.get_value("FoundationaLLM:APIEndpoints:GatekeeperIntegrationAPI:APIKey") == "env-key"
+        with pytest.raises(KeyError):
+            config.get_value("FoundationaLLM:APIEndpoints:GatekeeperIntegrationAPI:APIUrl")
+
+    def test_configuration_raises_for_missing_key(self, local_config):
+        with pytest.raises(KeyError):
+            local_config.get_value("FoundationaLLM:Missing")
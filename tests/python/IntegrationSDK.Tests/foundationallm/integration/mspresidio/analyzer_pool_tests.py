@@ -0,0 +1,31 @@
+import asyncio
+import os
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from foundationallm.integration.models import AnalyzeBatchRequest
+from foundationallm.integration.mspresidio import AnalyzerPool
+
+class AnalyzerPoolTests:
+    """
+    AnalyzerPoolTests is responsible for testing that the analyzer pool
+    recovers from the death of its worker processes.
+    """
+    def test_pool_is_replaced_when_a_worker_dies(self):
+        request = AnalyzeBatchRequest(
+            contents=["My cell is (555)555-5555"], anonymize=False, language="en")
+
+        async def test():
+            pool = AnalyzerPool(max_workers=1)
+            try:
+                broken_executor = pool.executor
+                with pytest.raises(BrokenProcessPool):
+                    await asyncio.wrap_future(broken_executor.submit(os._exit, 1))
+                with pytest.raises(BrokenProcessPool):
+                    await pool.analyze_batch(request)
+                assert pool.executor is not broken_executor
+                return await pool.analyze_batch(request)
+            finally:
+                pool.shutdown()
+
+        responses = asyncio.run(test())
+        assert any(obj.entity_type == "PHONE_NUMBER" for obj in responses[0].results)
@@ -1,5 +1,5 @@
 import pytest
-from foundationallm.integration.models import AnalyzeRequest
+from foundationallm.integration.models import AnalyzeBatchRequest, AnalyzeRequest
 from foundationallm.integration.mspresidio.analyzer import Analyzer
 
 class AnalyzerTests:
@@ -39,4 +39,22 @@ class AnalyzerTests:
         response = sut.analyze()
         print(response)
         assert any(obj.entity_type == "PHONE_NUMBER" for obj in response.results) and \
-               "<PHONE_NUMBER>" in response.content
\ No newline at end of file
+               "<PHONE_NUMBER>" in response.content
+
+    def test_analyzer_batch_returns_results_in_order(self):
+        request = AnalyzeBatchRequest(contents=["My cell is (555)555-5555",
+                                                "Nothing to see here.",
+                                                "My name is Inigo Montoya."],
+                                      anonymize=False, language="en")
+        responses = Analyzer.analyze_batch(request)
+        print(responses)
+        assert [r.content for r in responses] == request.contents and \
+               any(obj.entity_type == "PHONE_NUMBER" for obj in responses[0].results) and \
+               any(obj.entity_type == "PERSON" for obj in responses[2].results)
+
+    def test_analyzer_batch_anonymizes_entities(self):
+        request = AnalyzeBatchRequest(contents=["My cell is (555)555-5555"],
+                                      anonymize=True, language="en")
+        responses = Analyzer.analyze_batch(request)
+        print(responses)
+        assert "<PHONE_NUMBER>" in responses[0].content
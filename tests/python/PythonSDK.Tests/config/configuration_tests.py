@@ -1,13 +1,30 @@
 from azure.appconfiguration import AzureAppConfigurationClient, ConfigurationSetting
 from azure.identity import DefaultAzureCredential
 import pytest
-from foundationallm.config import Configuration
+from foundationallm.config import (
+    Configuration,
+    FileConfigurationProvider,
+    MemoryConfigurationProvider
+)
+import json
 import os
 
 @pytest.fixture
 def test_config():
     return Configuration()
 
+@pytest.fixture
+def settings_file(tmp_path):
+    path = tmp_path / 'settings.json'
+    path.write_text(json.dumps({
+        'FoundationaLLM': {
+            'APIEndpoints': { 'LangChainAPI': { 'Essentials': { 'APIKey': 'test-key' } } },
+            'Test': { 'TestSetting': 'Original' }
+        },
+        'FeatureManagementFeatureFlags': { 'TestFlag': { 'enabled': True } }
+    }))
+    return str(path)
+
 class ConfigurationTests:
     """
     ConfigurationTests is responsible for testing the application configuration functionality.
@@ -35,11 +52,44 @@ class ConfigurationTests:
         
         assert ((initial_config.get_value("FoundationaLLM:Test:TestSetting") == "Original") and \
                 (updated_config.get_value("FoundationaLLM:Test:TestSetting") == "Changed"))
-        
-        
-        
-        
-        
-        
-       
-    
\ No newline at end of file
+
+class OfflineConfigurationTests:
+    """
+    OfflineConfigurationTests is responsible for testing the configuration providers
+    that do not require Azure App Configuration.
+    """
+    def test_file_provider_flattens_and_filters_settings(self, settings_file):
+        config = Configuration(
+            key_prefixes=['FoundationaLLM:APIEndpoints:*'],
+            provider=FileConfigurationProvider(settings_file))
+        assert config.get_value('FoundationaLLM:APIEndpoints:LangChainAPI:Essentials:APIKey') == 'test-key'
+        assert config.get_feature_flag('TestFlag') is True
+        with pytest.raises(Exception):
+            config.get_value('FoundationaLLM:Test:TestSetting')
+
+    def test_file_provider_selected_by_environment(self, settings_file, monkeypatch):
+        monkeypatch.setenv('FOUNDATIONALLM_CONFIGURATION_PROVIDER', 'file')
+        monkeypatch.setenv('FOUNDATIONALLM_CONFIGURATION_FILE', settings_file)
+        config = Configuration()
+        assert config.get_value('FoundationaLLM:Test:TestSetting') == 'Original'
+
+    def test_integration_sdk_provider_name_is_accepted(self, settings_file, monkeypatch):
+        monkeypatch.setenv('FOUNDATIONALLM_CONFIGURATION_PROVIDER', 'local')
+        monkeypatch.setenv('FOUNDATIONALLM_CONFIGURATION_FILE', settings_file)
+        config = Configuration()
+        assert config.get_value('FoundationaLLM:Test:TestSetting') == 'Original'
+
+    def test_environment_variable_overrides_file(self, settings_file, monkeypatch):
+        monkeypatch.setenv('FOUNDATIONALLM_CONFIGURATION_PROVIDER', 'local')
+        monkeypatch.setenv('FOUNDATIONALLM_CONFIGURATION_FILE', settings_file)
+        monkeypatch.setenv('FoundationaLLM__Test__TestSetting', 'Changed')
+        config = Configuration()
+        assert config.get_value('FoundationaLLM:Test:TestSetting') == 'Changed'
+
+    def test_memory_provider_refresh(self):
+        provider = MemoryConfigurationProvider({'FoundationaLLM:Test:TestSetting': 'Original'})
+        config = Configuration(provider=provider)
+        provider.set_value('FoundationaLLM:Test:TestSetting', 'Changed')
+        assert config.get_value('FoundationaLLM:Test:TestSetting') == 'Original'
+        config.refresh(wait=True)
+        assert config.get_value('FoundationaLLM:Test:TestSetting') == 'Changed'
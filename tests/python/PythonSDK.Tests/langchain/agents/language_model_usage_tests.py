@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from langchain_community.callbacks import get_openai_callback
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from foundationallm.config import Configuration
+from foundationallm.config.memory_configuration_provider import MemoryConfigurationProvider
+from foundationallm.langchain.agents import LangChainKnowledgeManagementAgent
+from foundationallm.models.resource_providers.ai_models import AIModelBase
+from foundationallm.models.resource_providers.configuration import APIEndpointConfiguration
+
+class FakeChatCompletionStream:
+    """
+    Async stream of chat completion chunks, closed like the OpenAI stream.
+    """
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+class FakeChatCompletions:
+    """
+    Streams a completion and, like the OpenAI API, only sends the usage chunk
+    when it is requested with the stream options.
+    """
+    async def create(self, **payload):
+        chunks = [
+            {'model': 'gpt-4o', 'choices': [{'delta': {'role': 'assistant', 'content': 'Hello'}}]},
+            {'model': 'gpt-4o', 'choices': [{'delta': {'content': ' world'}, 'finish_reason': 'stop'}]}
+        ]
+        if payload.get('stream_options', {}).get('include_usage'):
+            chunks.append({
+                'model': 'gpt-4o',
+                'choices': [],
+                'usage': {'prompt_tokens': 12, 'completion_tokens': 2, 'total_tokens': 14}
+            })
+        return FakeChatCompletionStream(chunks)
+
+class FakeAsyncAzureOpenAI:
+    def __init__(self, **kwargs):
+        self.chat = self
+        self.completions = FakeChatCompletions()
+
+@pytest.fixture
+def test_agent():
+    agent = LangChainKnowledgeManagementAgent(
+        instance_id='11111111-1111-1111-1111-111111111111',
+        user_identity=None,
+        config=Configuration(provider=MemoryConfigurationProvider({'Test:APIKey': 'key'})))
+    agent.ai_model = AIModelBase(
+        name='usage-test-model',
+        type='completion',
+        endpoint_object_id='usage-test-endpoint',
+        version=None,
+        deployment_name='usage-test-deployment')
+    agent.api_endpoint = APIEndpointConfiguration(
+        name='usage-test-endpoint',
+        category='General',
+        authentication_type='APIKey',
+        url='https://usage-test.openai.azure.com/',
+        authentication_parameters={'api_key_configuration_name': 'Test:APIKey'},
+        retry_strategy_name='ExponentialBackoff',
+        provider='microsoft',
+        api_version='2024-06-01',
+        operation_type='chat')
+    return agent
+
+class LanguageModelUsageTests:
+    """
+    LanguageModelUsageTests is responsible for testing that the token usage
+    of streamed completions is reported.
+    """
+    def test_streamed_completion_reports_usage(self, test_agent):
+        async def test():
+            with patch('foundationallm.langchain.agents.langchain_agent_base.async_aoi', FakeAsyncAzureOpenAI):
+                language_model = test_agent._get_language_model(streaming=True)
+            chain = PromptTemplate.from_template('{question}') | language_model | StrOutputParser()
+            with get_openai_callback() as cb:
+                tokens = [token async for token in chain.astream({'question': 'Say hello.'})]
+            return ''.join(tokens), cb
+
+        completion, cb = asyncio.run(test())
+        assert completion == 'Hello world'
+        assert cb.prompt_tokens == 12
+        assert cb.completion_tokens == 2
+        assert cb.total_tokens == 14
+        assert cb.total_cost > 0
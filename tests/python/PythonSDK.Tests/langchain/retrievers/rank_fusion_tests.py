@@ -0,0 +1,54 @@
+import pytest
+from foundationallm.langchain.retrievers import MinMaxRankFusion, ReciprocalRankFusion
+from foundationallm.models.vectors import VectorDocument
+
+def documents(index_name, scores):
+    return [
+        VectorDocument(id=f'{index_name}{i}', page_content=f'{index_name}{i}', metadata={}, score=score)
+        for i, score in enumerate(scores)
+    ]
+
+@pytest.fixture
+def test_results():
+    # The semantic index returns small scores, the keyword index large ones.
+    return lambda: [
+        documents('semantic', [0.031, 0.030, 0.016]),
+        documents('keyword', [12.5, 9.0, 1.0])
+    ]
+
+class RankFusionTests:
+    """
+    RankFusionTests is responsible for testing that the results of several indexes
+    are fused into a single ranking that does not depend on their raw score scales.
+    """
+    def test_reciprocal_rank_fusion_interleaves_indexes(self, test_results):
+        results = test_results()
+        fused = ReciprocalRankFusion().fuse(results, 4)
+        # Documents with the same rank in each index tie, and are ordered by their first appearance.
+        assert [document.id for document in fused] == ['semantic0', 'keyword0', 'semantic1', 'keyword1']
+        fused = ReciprocalRankFusion().fuse(results[::-1], 3)
+        assert [document.id for document in fused] == ['keyword0', 'semantic0', 'keyword1']
+
+    def test_fused_scores_do_not_modify_the_results(self, test_results):
+        results = test_results()
+        fused = ReciprocalRankFusion(k=0).fuse(results, 1)
+        assert fused[0].score == pytest.approx(1.0)
+        assert results[0][0].score == 0.031
+
+    def test_min_max_fusion_normalizes_scores(self, test_results):
+        fused = MinMaxRankFusion().fuse(test_results(), 6)
+        assert fused[0].score == pytest.approx(1.0)
+        assert fused[-1].score == pytest.approx(0.0)
+        assert {document.id for document in fused[:2]} == {'semantic0', 'keyword0'}
+
+    def test_weights_and_duplicates(self, test_results):
+        results = test_results()
+        results[1].append(VectorDocument(id='semantic2', page_content='semantic2', metadata={}, score=0.5))
+        fused = ReciprocalRankFusion().fuse(results, 2, weights=[1, 0.1])
+        # semantic2 is found by both indexes, so its scores add up and it ranks first.
+        # The low weight of the keyword index keeps keyword0 out of the top 2.
+        assert [document.id for document in fused] == ['semantic2', 'semantic0']
+
+    def test_top_n_is_global(self, test_results):
+        assert len(ReciprocalRankFusion().fuse(test_results(), 2)) == 2
+        assert ReciprocalRankFusion().fuse([[], []], 2) == []
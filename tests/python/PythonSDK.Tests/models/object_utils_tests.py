@@ -0,0 +1,106 @@
+import os
+import re
+import timeit
+import pytest
+from foundationallm.models.resource_providers.ai_models import AIModelBase
+from foundationallm.models.resource_providers.configuration import APIEndpointConfiguration
+from foundationallm.models.resource_providers.vectorization import AzureAISearchIndexingProfile
+from foundationallm.models.utils import ObjectUtils
+
+def reference_translate_keys(obj):
+    """
+    The uncached, regex-per-key translation that ObjectUtils.translate_keys replaces.
+    """
+    if isinstance(obj, dict):
+        return {
+            re.sub('([a-z0-9])([A-Z])', r'\1_\2', re.sub('(.)([A-Z][a-z]+)', r'\1_\2', key)).lower():
+                reference_translate_keys(value)
+            for key, value in obj.items()
+        }
+    if isinstance(obj, list):
+        return [reference_translate_keys(item) for item in obj]
+    return obj
+
+# Wall-clock comparisons are not reliable on shared build agents, so they only run on demand:
+# FOUNDATIONALLM_RUN_BENCHMARKS=1 python -m pytest -m benchmark
+run_benchmarks = pytest.mark.skipif(
+    not os.environ.get('FOUNDATIONALLM_RUN_BENCHMARKS'),
+    reason='Set FOUNDATIONALLM_RUN_BENCHMARKS to run the benchmarks.')
+
+@pytest.fixture
+def test_objects():
+    return {
+        AIModelBase: {
+            'Type': 'completion',
+            'Name': 'GPT4oCompletionAIModel',
+            'ObjectId': '/instances/1/providers/FoundationaLLM.AIModel/aiModels/GPT4oCompletionAIModel',
+            'EndpointObjectId': '/instances/1/providers/FoundationaLLM.Configuration/apiEndpointConfigurations/AzureOpenAI',
+            'Version': '2024-05-13',
+            'DeploymentName': 'completions-gpt-4o',
+            'ModelParameters': {'Temperature': 0, 'MaxTokens': 1024, 'TopP': 1},
+            'CreatedOn': '2024-08-01T00:00:00Z'
+        },
+        APIEndpointConfiguration: {
+            'Type': 'api-endpoint',
+            'Name': 'AzureOpenAI',
+            'Category': 'General',
+            'AuthenticationType': 'AzureIdentity',
+            'Url': 'https://openai.openai.azure.com/',
+            'UrlExceptions': [{'UserPrincipalName': 'user@contoso.com', 'Url': 'https://other.openai.azure.com/', 'Enabled': True}],
+            'AuthenticationParameters': {'Scope': 'https://cognitiveservices.azure.com/.default'},
+            'TimeoutSeconds': 120,
+            'RetryStrategyName': 'ExponentialBackoff',
+            'Provider': 'microsoft',
+            'APIVersion': '2024-02-01',
+            'OperationType': 'chat'
+        },
+        AzureAISearchIndexingProfile: {
+            'Type': 'indexing-profile',
+            'Name': 'sotu-index',
+            'Indexer': 'AzureAISearchIndexer',
+            'Settings': {
+                'IndexName': 'sotu-index',
+                'TopN': '3',
+                'Filters': '',
+                'EmbeddingFieldName': 'Embedding',
+                'TextFieldName': 'Text',
+                'APIEndpointConfigurationObjectId': '/instances/1/providers/FoundationaLLM.Configuration/apiEndpointConfigurations/AzureAISearch'
+            },
+            'ConfigurationReferences': {'Endpoint': 'FoundationaLLM:APIEndpoints:AzureAISearchVectorStore:Endpoint'}
+        }
+    }
+
+class ObjectUtilsTests:
+    """
+    ObjectUtilsTests is responsible for testing that the memoized and compiled key
+    translators return the same keys as the regex-based translation.
+    """
+    def test_pascal_to_snake(self):
+        assert ObjectUtils.pascal_to_snake('EndpointObjectId') == 'endpoint_object_id'
+        assert ObjectUtils.pascal_to_snake('endpointObjectId') == 'endpoint_object_id'
+        assert ObjectUtils.pascal_to_snake('APIVersion') == 'api_version'
+
+    def test_compiled_translators_match_reference(self, test_objects):
+        for model_type, obj in test_objects.items():
+            expected = reference_translate_keys(obj)
+            assert ObjectUtils.translate_keys(obj) == expected
+            assert ObjectUtils.translate_keys(obj, model_type) == expected
+
+    @pytest.mark.benchmark
+    @run_benchmarks
+    def test_compiled_translators_are_faster(self, test_objects):
+        def translate_reference():
+            for obj in test_objects.values():
+                reference_translate_keys(obj)
+
+        def translate_compiled():
+            for model_type, obj in test_objects.items():
+                ObjectUtils.translate_keys(obj, model_type)
+
+        translate_compiled()
+        reference_seconds = min(timeit.repeat(translate_reference, number=200, repeat=5))
+        compiled_seconds = min(timeit.repeat(translate_compiled, number=200, repeat=5))
+        print(f'reference: {reference_seconds * 5000:.1f} us/request, '
+              f'compiled: {compiled_seconds * 5000:.1f} us/request, '
+              f'speedup: {reference_seconds / compiled_seconds:.1f}x')
+        assert compiled_seconds < reference_seconds
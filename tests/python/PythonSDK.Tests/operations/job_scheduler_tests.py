@@ -0,0 +1,28 @@
+import asyncio
+from foundationallm.operations import JobScheduler
+
+class JobSchedulerTests:
+    """
+    JobSchedulerTests is responsible for testing that the jobs cancelled
+    when the scheduler is closed have their cancellation recorded.
+    """
+    def test_close_records_cancelled_jobs(self):
+        async def test():
+            scheduler = JobScheduler(default_concurrency=1)
+            cancelled = []
+
+            async def record_cancellation(name: str):
+                cancelled.append(name)
+
+            for name in ['running', 'queued']:
+                scheduler.submit(
+                    'lane',
+                    lambda: asyncio.sleep(10),
+                    on_cancel=lambda name=name: record_cancellation(name))
+            await asyncio.sleep(0.01)
+            await scheduler.close(timeout_seconds=0.05)
+            return cancelled, scheduler.queue_depth
+
+        cancelled, queue_depth = asyncio.run(test())
+        assert cancelled == ['running', 'queued']
+        assert queue_depth == 0
@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from foundationallm.models.operations import OperationStatus
+from foundationallm.operations import OperationStateBuffer, OperationStateCache, OperationStateWriteError
+
+class FlakyOperationsManager:
+    """
+    Records the status writes, after failing the first ones.
+    """
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.statuses = []
+
+    async def update_operation(self, operation_id, instance_id, status, status_message):
+        if self.failures > 0:
+            self.failures -= 1
+            raise Exception('The State API is unavailable.')
+        self.statuses.append((operation_id, status))
+
+    async def set_operation_result(self, operation_id, instance_id, completion_response):
+        pass
+
+class OperationStateBufferTests:
+    """
+    OperationStateBufferTests is responsible for testing that the operation state
+    buffer retries the writes the State API failed to accept.
+    """
+    def test_failed_write_is_retried(self):
+        async def test():
+            operations_manager = FlakyOperationsManager(failures=2)
+            buffer = OperationStateBuffer(
+                operations_manager, flush_delay_seconds=0.01, retry_delay_seconds=0.01)
+            buffer.update_operation('op1', 'instance', OperationStatus.COMPLETED, 'Completed.')
+            await buffer.close()
+            return operations_manager.statuses
+
+        assert asyncio.run(test()) == [('op1', OperationStatus.COMPLETED)]
+
+    def test_failed_write_is_merged_with_newer_status(self):
+        async def test():
+            operations_manager = FlakyOperationsManager(failures=1)
+            buffer = OperationStateBuffer(
+                operations_manager, flush_delay_seconds=0.01, retry_delay_seconds=0.05)
+            buffer.update_operation('op1', 'instance', OperationStatus.INPROGRESS, 'In progress.')
+            await asyncio.sleep(0.03)
+            buffer.update_operation('op1', 'instance', OperationStatus.COMPLETED, 'Completed.')
+            await buffer.close()
+            return operations_manager.statuses
+
+        assert asyncio.run(test()) == [('op1', OperationStatus.COMPLETED)]
+
+    def test_close_raises_for_undelivered_writes(self):
+        async def test():
+            buffer = OperationStateBuffer(
+                FlakyOperationsManager(failures=10),
+                flush_delay_seconds=0.01,
+                retry_delay_seconds=0.01,
+                max_send_attempts=3)
+            buffer.update_operation('op1', 'instance', OperationStatus.COMPLETED, 'Completed.')
+            await buffer.close()
+
+        with pytest.raises(OperationStateWriteError) as error:
+            asyncio.run(test())
+        assert error.value.operation_ids == ['op1']
+
+    def test_undelivered_write_is_removed_from_cache(self):
+        async def test():
+            cache = OperationStateCache()
+            buffer = OperationStateBuffer(
+                FlakyOperationsManager(failures=10),
+                flush_delay_seconds=0.01,
+                cache=cache,
+                retry_delay_seconds=0.01,
+                max_send_attempts=2)
+            buffer.update_operation('op1', 'instance', OperationStatus.COMPLETED, 'Completed.')
+            assert cache.get_operation('op1', 'instance').status == OperationStatus.COMPLETED
+            await asyncio.sleep(0.1)
+            await buffer.close()
+            return cache.get_operation('op1', 'instance')
+
+        assert asyncio.run(test()) is None
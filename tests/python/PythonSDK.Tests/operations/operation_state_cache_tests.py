@@ -0,0 +1,36 @@
+import time
+import pytest
+from foundationallm.models.operations import OperationStatus
+from foundationallm.operations import OperationStateCache
+
+@pytest.fixture
+def test_cache():
+    return OperationStateCache(max_size=2, ttl_seconds=0.05)
+
+class OperationStateCacheTests:
+    """
+    OperationStateCacheTests is responsible for testing the expiry and eviction
+    rules of the in-process operation state cache.
+    """
+    def test_running_status_from_state_api_expires(self, test_cache):
+        test_cache.set_operation('op1', 'instance', {'status': 'InProgress'}, OperationStatus.INPROGRESS)
+        assert test_cache.get_operation('op1', 'instance') is not None
+        time.sleep(0.1)
+        assert test_cache.get_operation('op1', 'instance') is None
+
+    def test_final_and_authoritative_statuses_do_not_expire(self, test_cache):
+        test_cache.set_operation('op1', 'instance', {'status': 'Completed'}, OperationStatus.COMPLETED)
+        test_cache.set_operation('op2', 'instance', {'status': 'InProgress'}, OperationStatus.INPROGRESS,
+                                 authoritative=True)
+        time.sleep(0.1)
+        assert test_cache.get_operation('op1', 'instance')['status'] == 'Completed'
+        assert test_cache.get_operation('op2', 'instance')['status'] == 'InProgress'
+
+    def test_least_recently_used_entry_is_evicted(self, test_cache):
+        test_cache.set_result('op1', 'instance', 'result1')
+        test_cache.set_result('op2', 'instance', 'result2')
+        test_cache.get_result('op1', 'instance')
+        test_cache.set_result('op3', 'instance', 'result3')
+        assert test_cache.get_result('op1', 'instance') == 'result1'
+        assert test_cache.get_result('op2', 'instance') is None
+        assert test_cache.get_result('op3', 'instance') == 'result3'
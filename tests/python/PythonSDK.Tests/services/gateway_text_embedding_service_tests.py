@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from foundationallm.models.authentication import AuthenticationTypes
+from foundationallm.models.resource_providers.configuration import APIEndpointConfiguration
+from foundationallm.models.services import GatewayTextEmbeddingResponse
+from foundationallm.services import RetryStrategy
+from foundationallm.services.gateway_text_embedding import AdaptivePollingDelay, GatewayTextEmbeddingService, TextEmbeddingCache
+from foundationallm.services.gateway_text_embedding.text_chunk import TextChunk
+from foundationallm.services.gateway_text_embedding.text_embedding_response import TextEmbeddingResponse
+
+class ApiKeyConfiguration:
+    def get_value(self, key: str) -> str:
+        return 'test-api-key'
+
+@pytest.fixture
+def test_service():
+    endpoint = APIEndpointConfiguration(
+        name='gateway',
+        category='General',
+        authentication_type=AuthenticationTypes.API_KEY,
+        authentication_parameters={
+            'api_key_configuration_name': 'test',
+            'api_key_header_name': 'X-API-KEY'
+        },
+        url='http://localhost',
+        url_exceptions=[],
+        retry_strategy_name='None')
+    return GatewayTextEmbeddingService(
+        instance_id='instance',
+        user_identity=None,
+        gateway_api_endpoint_configuration=endpoint,
+        model_name='model',
+        config=ApiKeyConfiguration(),
+        cache=TextEmbeddingCache(max_size=16),
+        max_batch_tokens=10,
+        max_batch_size=2)
+
+class GatewayTextEmbeddingServiceTests:
+    """
+    GatewayTextEmbeddingServiceTests is responsible for testing the batching
+    of the texts embedded by the Gateway text embedding service.
+    """
+    def test_batches_are_within_the_limits(self, test_service):
+        class CharacterEncoding:
+            def encode(self, text, **kwargs):
+                return list(text)
+
+        texts = {'a' * 8: [0], 'b': [1], 'c': [2], 'd' * 40: [3]}
+        batches = test_service._create_batches(texts, CharacterEncoding())
+        assert [[chunk.content for chunk in batch] for batch in batches] == [['a' * 8, 'b'], ['c'], ['d' * 40]]
+        assert [[chunk.position for chunk in batch] for batch in batches] == [[1, 2], [1], [1]]
+
+    def test_estimated_batches_leave_headroom(self, test_service):
+        # Without a tokenizer, the token counts are estimated from the length of the texts
+        # and the batches are only filled up to half of the token limit.
+        texts = {'a' * 16: [0], 'b': [1], 'c': [2]}
+        batches = test_service._create_batches(texts, None)
+        assert [[chunk.content for chunk in batch] for batch in batches] == [['a' * 16], ['b', 'c']]
+
+    def test_long_texts_are_not_rejected(self, test_service):
+        class FailingEncoding:
+            def encode(self, text, **kwargs):
+                raise AssertionError('The text must not be tokenized.')
+
+        # The Gateway API rejects the texts that are too long, whether they are batched or not.
+        batches = test_service._create_batches({'a' * 100000: [0]}, FailingEncoding())
+        assert len(batches) == 1 and batches[0][0].tokens_count == 0
+        batches = test_service._create_batches({'a' * 100000: [0], 'b': [1]}, None)
+        assert [[chunk.content for chunk in batch] for batch in batches] == [['a' * 100000], ['b']]
+
+    def test_embeddings_are_set_in_the_order_of_the_texts(self, test_service):
+        embeddings, pending_texts = test_service._get_cached_embeddings(['b', 'a', 'b'])
+        assert pending_texts == {'b': [0, 2], 'a': [1]}
+        batch = test_service._create_batches(pending_texts, None)[0]
+        # The embeddings of an operation may be returned in any order.
+        response = TextEmbeddingResponse(in_progress=False, text_chunks=[
+            TextChunk(position=2, embedding=[2.0, 2.0], tokens_count=1),
+            TextChunk(position=1, embedding=[1.0, 1.0], tokens_count=1)
+        ])
+        test_service._set_embeddings(batch, response, pending_texts, embeddings)
+        assert [embedding.embedding_vector for embedding in embeddings] == [[1.0, 1.0], [2.0, 2.0], [1.0, 1.0]]
+        assert test_service.cache.get('model', 'a').embedding_vector == [2.0, 2.0]
+
+        vectors = test_service._to_array(embeddings)
+        assert vectors.dtype == np.float32 and vectors.flags['C_CONTIGUOUS']
+        assert vectors.tolist() == [[1.0, 1.0], [2.0, 2.0], [1.0, 1.0]]
+        assert test_service._to_array([]).shape == (0, 0)
+
+    def test_polling_delay_caps_retry_after(self):
+        polling_delay = AdaptivePollingDelay(initial_delay=0.05)
+        assert polling_delay.get_next_delay({'Retry-After': '2'}) == 2
+        assert polling_delay.get_next_delay({'Retry-After': '3600'}) == RetryStrategy.MAX_RETRY_AFTER_SECONDS
+        assert polling_delay.get_next_delay() == 0.2
@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+import requests
+from foundationallm.models.authentication import AuthenticationTypes
+from foundationallm.models.resource_providers.configuration import APIEndpointConfiguration
+from foundationallm.services import (
+    CircuitBreaker,
+    CircuitBreakerOpenError,
+    CircuitBreakerStates,
+    HttpClientService,
+    RetryStrategyNames,
+    get_retry_strategy
+)
+
+def get_http_error(status_code: int, headers: dict = None) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return requests.HTTPError(response=response)
+
+class ApiKeyConfiguration:
+    def get_value(self, key: str) -> str:
+        return 'test-api-key'
+
+class RetryStrategyTests:
+    """
+    RetryStrategyTests is responsible for testing the retry strategies
+    and circuit breakers of the API endpoints.
+    """
+    def test_only_rejected_requests_are_retried_when_not_idempotent(self):
+        strategy = get_retry_strategy(RetryStrategyNames.EXPONENTIAL_BACKOFF.value)
+        assert strategy.is_transient_error(get_http_error(503), idempotent=False)
+        assert not strategy.is_transient_error(get_http_error(502), idempotent=False)
+        assert strategy.is_transient_error(get_http_error(502), idempotent=True)
+        assert not strategy.is_transient_error(get_http_error(400), idempotent=True)
+
+    def test_retry_after_takes_precedence(self):
+        strategy = get_retry_strategy(RetryStrategyNames.FIXED_DELAY.value)
+        assert strategy.get_delay(1, get_http_error(429)) == 1
+        assert strategy.get_delay(1, get_http_error(429, {'Retry-After': '3'})) == 3
+
+    def test_circuit_opens_after_consecutive_failures(self):
+        circuit_breaker = CircuitBreaker(failure_threshold=2, recovery_seconds=0)
+        circuit_breaker.record_failure()
+        circuit_breaker.record_failure()
+        assert circuit_breaker.state == CircuitBreakerStates.OPEN
+        # The recovery time has elapsed, so a single trial request is let through.
+        circuit_breaker.before_request()
+        with pytest.raises(CircuitBreakerOpenError):
+            circuit_breaker.before_request()
+        circuit_breaker.record_success()
+        assert circuit_breaker.state == CircuitBreakerStates.CLOSED
+
+    def test_cancelled_trial_request_releases_the_trial(self):
+        async def test():
+            # The server accepts connections and never responds.
+            server = await asyncio.start_server(lambda reader, writer: None, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            endpoint = APIEndpointConfiguration(
+                name='test',
+                category='General',
+                authentication_type=AuthenticationTypes.API_KEY,
+                authentication_parameters={
+                    'api_key_configuration_name': 'test',
+                    'api_key_header_name': 'X-API-KEY'
+                },
+                url=f'http://127.0.0.1:{port}',
+                url_exceptions=[],
+                retry_strategy_name=RetryStrategyNames.NONE.value)
+            client = HttpClientService(endpoint, None, ApiKeyConfiguration())
+            client.circuit_breaker.recovery_seconds = 0
+            for _ in range(client.circuit_breaker.failure_threshold):
+                client.circuit_breaker.record_failure()
+            assert client.circuit_breaker.state == CircuitBreakerStates.OPEN
+
+            trial = asyncio.ensure_future(client.aget('/status'))
+            await asyncio.sleep(0.2)
+            assert client.circuit_breaker.state == CircuitBreakerStates.HALF_OPEN
+            trial.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await trial
+            server.close()
+            # The next request is let through as the new trial request.
+            assert client.circuit_breaker.before_request()
+            client.circuit_breaker.record_success()
+            assert client.circuit_breaker.state == CircuitBreakerStates.CLOSED
+
+        asyncio.run(test())
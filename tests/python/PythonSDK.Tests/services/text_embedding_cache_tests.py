@@ -0,0 +1,56 @@
+import pytest
+from foundationallm.models.services import GatewayTextEmbeddingResponse
+from foundationallm.services.gateway_text_embedding import TextEmbeddingCache
+
+def get_embedding(value: float) -> GatewayTextEmbeddingResponse:
+    return GatewayTextEmbeddingResponse(embedding_vector=[value, value + 0.5], tokens_count=int(value))
+
+@pytest.fixture
+def test_cache_path(tmp_path):
+    return str(tmp_path)
+
+class TextEmbeddingCacheTests:
+    """
+    TextEmbeddingCacheTests is responsible for testing the keys, eviction rules
+    and on-disk tier of the Gateway text embedding cache.
+    """
+    def test_normalized_text_is_a_hit(self):
+        cache = TextEmbeddingCache(max_size=2)
+        cache.set('model', 'What is  the\nweather?', get_embedding(1))
+        assert cache.get('model', ' What is the weather? ').embedding_vector == [1.0, 1.5]
+        assert cache.get('other-model', 'What is the weather?') is None
+        assert cache.get_metrics()['hit_rate'] == 0.5
+
+    def test_least_recently_used_embedding_is_evicted(self):
+        cache = TextEmbeddingCache(max_size=2)
+        cache.set('model', 'text1', get_embedding(1))
+        cache.set('model', 'text2', get_embedding(2))
+        cache.get('model', 'text1')
+        cache.set('model', 'text3', get_embedding(3))
+        assert cache.get('model', 'text1') is not None
+        assert cache.get('model', 'text2') is None
+
+    def test_disk_tier_is_reloaded(self, test_cache_path):
+        cache = TextEmbeddingCache(max_size=1, path=test_cache_path, disk_capacity=2)
+        for value in range(3):
+            cache.set('model', f'text{value}', get_embedding(value))
+        cache.close()
+
+        reloaded_cache = TextEmbeddingCache(max_size=1, path=test_cache_path, disk_capacity=2)
+        assert reloaded_cache.get('model', 'text0') is None
+        assert reloaded_cache.get('model', 'text2').embedding_vector == [2.0, 2.5]
+        assert reloaded_cache.get('model', 'text1').tokens_count == 1
+        assert reloaded_cache.get_metrics()['disk_hits'] == 2
+
+    def test_disk_tier_is_not_shared_by_open_caches(self, test_cache_path):
+        cache = TextEmbeddingCache(max_size=1, path=test_cache_path, disk_capacity=2)
+        cache.set('model', 'text1', get_embedding(1))
+        # The store of the first cache is locked, so the second cache writes to another store.
+        other_cache = TextEmbeddingCache(max_size=1, path=test_cache_path, disk_capacity=2)
+        other_cache.set('model', 'text2', get_embedding(2))
+        cache.close()
+        other_cache.close()
+
+        reloaded_cache = TextEmbeddingCache(max_size=1, path=test_cache_path, disk_capacity=2)
+        assert reloaded_cache.get('model', 'text1').embedding_vector == [1.0, 1.5]
+        assert reloaded_cache.get('model', 'text2') is None